@@ -2,7 +2,7 @@ import { NextRequest, NextResponse } from "next/server";
 import { authMiddleware } from "@/lib/middleware/auth";
 import { createAnalysis, updateAnalysis } from "@/lib/models/Analysis";
 import { Client } from "@gradio/client";
-import { transformMLResponse } from "@/lib/services/analysisService";
+import { ANALYSIS_API_URL, analyzeViaApi, transformMLResponse } from "@/lib/services/analysisService";
 export const runtime = "nodejs";
 
 
@@ -65,14 +65,17 @@ export async function POST(req: NextRequest) {
         const buffer = await downloadResponse.arrayBuffer();
         const fallbackMime = mimeType || downloadResponse.headers.get("content-type") || "video/mp4";
 
-        const client = await Client.connect(HF_SPACE);
-        const prediction = await client.predict("/analyze_session", {
-          video: new Blob([buffer], { type: fallbackMime }),
-        });
+        const video = new Blob([buffer], { type: fallbackMime });
+        let rawData: any;
+        if (ANALYSIS_API_URL) {
+          rawData = await analyzeViaApi(video, "General", "", "");
+        } else {
+          const client = await Client.connect(HF_SPACE);
+          const prediction = await client.predict("/analyze_session", { video });
+          [, , , rawData] = (prediction as any).data;
+        }
 
         await updateAnalysis(initialAnalysis.id, { progress: 80 });
-
-        const [summary, scores, feedback, rawData] = (prediction as any).data;
         
         const transformedData = transformMLResponse(
           { success: true, data: rawData },
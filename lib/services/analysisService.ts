@@ -120,4 +120,25 @@ export function transformMLResponse(
     // NEW: Return the fully completed granular status
     processingStatus: completedStatus,
   };
-}
\ No newline at end of file
+}
+
+// Multi-worker deployment (gunicorn serve:app) serves only the Flask API, not the
+// Gradio endpoints: set ANALYSIS_API_URL to its base URL to POST /analyze instead.
+// Resolves to the report (the Gradio endpoints' raw-data output); throws on error.
+export const ANALYSIS_API_URL = process.env.ANALYSIS_API_URL?.replace(/\/+$/, "");
+
+export async function analyzeViaApi(video: Blob, subject: string, language: string, institutionId: string) {
+  const form = new FormData();
+  const ext = video.type.split("/")[1]?.split(";")[0] || "mp4";
+  form.append("video", video, `session.${ext}`);
+  form.append("topic_name", subject);
+  if (language) form.append("language", language);
+  if (institutionId) form.append("institution_id", institutionId);
+
+  const response = await fetch(`${ANALYSIS_API_URL}/analyze`, { method: "POST", body: form });
+  const body = await response.json().catch(() => null);
+  if (!response.ok || !body) {
+    throw new Error(body?.details || body?.error || `Analysis service error (${response.status})`);
+  }
+  return body;
+}
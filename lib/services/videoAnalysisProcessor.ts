@@ -1,7 +1,7 @@
 import { createAnalysis } from "@/lib/models/Analysis";
 import { updateJob } from "@/lib/models/Job";
 import { updateMemoryFromAnalysis } from "@/lib/models/Memory";
-import { transformMLResponse } from "@/lib/services/analysisService";
+import { ANALYSIS_API_URL, analyzeViaApi, transformMLResponse } from "@/lib/services/analysisService";
 import { generateCoachFeedback, generateFallbackFeedback } from "@/lib/services/feedbackService";
 import type { JobStatus } from "@/lib/types/job";
 import { Client } from "@gradio/client";
@@ -31,7 +31,6 @@ function toUserFriendlyJobError(raw: unknown): string {
 }
 
 const HF_SPACE = "genathon00/sikshanetra-model";
-
 /**
  * Background processor for video analysis. Safe to call from routes.
  */
@@ -116,25 +115,42 @@ export async function processVideoAnalysis(
     // PHASE 2 — ANALYSIS
     await setStatus("analyzing", 35);
 
-    const client = await Client.connect(HF_SPACE);
     const videoBlob = new Blob([buffer], { type: mimeType });
 
-    const result = await client.predict(
-      "/analyze_session_with_status",
-      { video: videoBlob, topic_name: subject }
-    );
+    // The institution scopes transcript search (/search_transcripts) for this session
+    const owner = await import("@/lib/models/User").then(m => m.getUserById(userId));
 
-    if (!result || !result.data) {
-      await setStatus("failed", undefined, {
-        error: toUserFriendlyJobError("Analysis service returned no data"),
-      });
-      return;
+    let rawData: any;
+    if (ANALYSIS_API_URL) {
+      try {
+        rawData = await analyzeViaApi(videoBlob, subject, language, owner?.institutionId || "");
+      } catch (err: any) {
+        await setStatus("failed", undefined, { error: toUserFriendlyJobError(err) });
+        return;
+      }
+    } else {
+      const client = await Client.connect(HF_SPACE);
+      const result = await client.predict(
+        "/analyze_session_with_status",
+        {
+          video: videoBlob,
+          topic_name: subject,
+          language: language || "",
+          institution_id: owner?.institutionId || "",
+        }
+      );
+
+      if (!result || !result.data) {
+        await setStatus("failed", undefined, {
+          error: toUserFriendlyJobError("Analysis service returned no data"),
+        });
+        return;
+      }
+      [, , , rawData] = (result as any).data;
     }
 
     await setStatus("analysis_done", 70);
 
-    const [, , , rawData] = (result as any).data;
-
     const transformed = transformMLResponse(
       { success: true, data: rawData },
       userId,
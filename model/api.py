@@ -0,0 +1,296 @@
+"""
+Async ASGI API (FastAPI), started by main.py:
+
+    uvicorn api:app --port 10000
+
+- POST /analyze streams the multipart upload straight to disk, hashing it on
+  the way; the sha256 (+ analysis options) keys a report cache, and identical
+  concurrent uploads share one analysis
+- Blocking work (multipart parsing / hashing / disk writes of uploads,
+  analysis, GenAI calls) runs in executors, so the event loop keeps accepting
+  uploads and answering health checks
+- GET /health: the process is up; GET /ready: models are loaded
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.requests import ClientDisconnect
+
+from config.settings import (
+    API_UPLOAD_DIR, API_MAX_UPLOAD_MB, API_MAX_PENDING, API_REPORT_CACHE_DIR,
+    SERVE_PRELOAD, SERVE_WORKER_CONCURRENCY
+)
+from src.genai.coach import ShikshaCoach
+from src.pipeline import process_session
+from src.serving import preload_models, memory_footprint
+from src.uploads import StreamingUpload, UploadError, UploadTooLarge
+
+MAX_UPLOAD_BYTES = API_MAX_UPLOAD_MB * 1024 * 1024
+UPLOAD_FLUSH_BYTES = 1024 * 1024     # network chunks are batched up to this before one executor hop
+
+coach = ShikshaCoach()
+
+# Analyses run here, at most SERVE_WORKER_CONCURRENCY at once; the rest queue
+analysis_pool = ThreadPoolExecutor(max_workers=max(1, SERVE_WORKER_CONCURRENCY), thread_name_prefix="analysis")
+# Upload parsing / sha256 / disk writes: one thread per admitted request
+upload_pool = ThreadPoolExecutor(max_workers=max(1, API_MAX_PENDING), thread_name_prefix="upload")
+
+state = {
+    "started": time.time(),
+    "models_ready": not SERVE_PRELOAD,
+    "preload_error": None,
+    "pending": 0,        # admitted /analyze requests: uploading, queued or running
+    "completed": 0,
+    "cache_hits": 0,
+    "rejected": 0,
+}
+inflight = {}            # cache key → asyncio future of the running analysis
+
+
+# --------------------------------------------------
+# Lifecycle
+# --------------------------------------------------
+async def _preload():
+    try:
+        await asyncio.get_running_loop().run_in_executor(analysis_pool, preload_models)
+        state["models_ready"] = True
+    except Exception as e:
+        state["preload_error"] = str(e)
+        print(f"[API] Model preload failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    os.makedirs(API_UPLOAD_DIR, exist_ok=True)
+    # Health answers immediately; readiness flips once the models are loaded
+    task = asyncio.create_task(_preload()) if SERVE_PRELOAD else None
+    yield
+    if task:
+        task.cancel()
+    analysis_pool.shutdown(wait=False, cancel_futures=True)
+    upload_pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Shiksha Netra API", lifespan=lifespan)
+
+
+def _error(status, error, details=None, headers=None):
+    body = {"error": error}
+    if details:
+        body["details"] = details
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+# --------------------------------------------------
+# Health
+# --------------------------------------------------
+@app.get("/health")
+async def health():
+    return {"status": "ok", "uptime_sec": round(time.time() - state["started"], 1)}
+
+
+@app.get("/ready")
+async def ready():
+    """200 once the models are loaded (503 before / on preload failure) + queue state"""
+    body = {
+        "ready": state["models_ready"],
+        "pending": state["pending"],
+        "max_pending": API_MAX_PENDING,
+        "completed": state["completed"],
+        "cache_hits": state["cache_hits"],
+        "rejected": state["rejected"],
+        "memory_mb": memory_footprint(),
+    }
+    if state["preload_error"]:
+        body["error"] = state["preload_error"]
+    return JSONResponse(body, status_code=200 if state["models_ready"] else 503)
+
+
+# --------------------------------------------------
+# Analysis
+# --------------------------------------------------
+def _cache_path(key):
+    return os.path.join(API_REPORT_CACHE_DIR, f"{key}.json") if API_REPORT_CACHE_DIR else None
+
+
+def _load_cached(key):
+    path = _cache_path(key)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _analyze_job(video_path, key, options):
+    """Executor side: run the pipeline, cache the report, always drop the upload."""
+    try:
+        report = process_session(video_path, **options)
+        path = _cache_path(key)
+        if report and path:
+            os.makedirs(API_REPORT_CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(report, f)
+            os.replace(tmp, path)
+        return report
+    finally:
+        if os.path.exists(video_path):
+            os.remove(video_path)
+
+
+async def _receive(request):
+    upload = StreamingUpload(request.headers.get("content-type"), "video", API_UPLOAD_DIR, MAX_UPLOAD_BYTES)
+    buffer = bytearray()
+    pending = None
+
+    def step(fn, *args):
+        nonlocal pending
+        pending = upload_pool.submit(fn, *args)
+        return asyncio.wrap_future(pending)
+
+    try:
+        # The loop only collects network chunks; parse + hash + write run in
+        # upload_pool, one batch at a time (awaited, so order is preserved)
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= UPLOAD_FLUSH_BYTES:
+                await step(upload.write, bytes(buffer))
+                buffer.clear()
+        await step(upload.write, bytes(buffer))
+        await step(upload.finish)
+        return upload
+    except BaseException:
+        if pending is None:
+            upload.discard()
+        else:
+            # Cancelled mid-step (client gone, shutdown): a write already running
+            # in upload_pool can't be stopped and may still create the temp file,
+            # so discard once it has returned (immediately if it never started)
+            pending.cancel()
+            pending.add_done_callback(lambda _: upload.discard())
+        raise
+
+
+@app.post("/analyze")
+async def analyze_video(request: Request):
+    """
+    Run the analysis pipeline on an uploaded video
+    Expects: multipart form with "video" file; optional "topic_name", "language",
+             "institution_id", "preview" ("true"/"false")
+    Returns: report JSON (headers X-Upload-SHA256, X-Cache: hit/miss);
+             503 when API_MAX_PENDING requests are already admitted
+    """
+    # Reject before reading the body: no point receiving 2 GB to answer 413/503
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_UPLOAD_BYTES + 1024 * 1024:   # + form overhead
+        return _error(413, "Upload too large", f"Limit is {API_MAX_UPLOAD_MB} MB")
+    if state["pending"] >= API_MAX_PENDING:
+        state["rejected"] += 1
+        return _error(503, "Server busy", f"{state['pending']} analyses pending", {"Retry-After": "30"})
+
+    state["pending"] += 1
+    try:
+        try:
+            upload = await _receive(request)
+        except UploadTooLarge as e:
+            return _error(413, "Upload too large", str(e))
+        except UploadError as e:
+            return _error(400, str(e))
+        except ClientDisconnect:
+            return _error(400, "Client disconnected during upload")
+
+        options = {
+            "topic_name": upload.fields.get("topic_name") or "General",
+            "language": upload.fields.get("language") or None,
+            "institution_id": upload.fields.get("institution_id") or None,
+            "preview": upload.fields.get("preview", "false").lower() in ("1", "true"),
+        }
+        key = hashlib.sha256(
+            (upload.sha256 + json.dumps(options, sort_keys=True)).encode("utf-8")
+        ).hexdigest()
+        headers = {"X-Upload-SHA256": upload.sha256}
+        print(f"[API] Received {upload.filename} ({upload.size / (1024 * 1024):.1f} MB, sha256 {upload.sha256[:12]})")
+
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, _load_cached, key)
+        if cached is not None:
+            await loop.run_in_executor(upload_pool, upload.discard)   # unlinking GBs can block
+            state["cache_hits"] += 1
+            return JSONResponse(cached, headers={**headers, "X-Cache": "hit"})
+
+        future = inflight.get(key)
+        if future:
+            # Same video + options already running: wait for that result
+            await loop.run_in_executor(upload_pool, upload.discard)
+        else:
+            video_path = os.path.join(API_UPLOAD_DIR, f"{key}{os.path.splitext(upload.path)[1]}")
+            os.replace(upload.path, video_path)
+            future = loop.run_in_executor(analysis_pool, _analyze_job, video_path, key, options)
+            inflight[key] = future
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+
+        # shield: a disconnecting client must not cancel a shared analysis
+        report = await asyncio.shield(future)
+        if not report:
+            return _error(500, "Analysis failed", headers=headers)
+        state["completed"] += 1
+        return JSONResponse(report, headers={**headers, "X-Cache": "miss"})
+
+    except Exception as e:
+        return _error(500, "Failed to analyze video", str(e))
+    finally:
+        state["pending"] -= 1
+
+
+# --------------------------------------------------
+# GenAI
+# --------------------------------------------------
+@app.post("/generate_genai_feedback")
+async def generate_genai_feedback(request: Request):
+    """
+    Generate GenAI feedback from a user prompt
+    Expects: { "user_prompt": "..." }
+    Returns: JSON feedback object
+    """
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        data = None
+    if not isinstance(data, dict) or "user_prompt" not in data:
+        return _error(400, "Missing 'user_prompt' in request body")
+    if not coach.model:
+        return _error(500, "GenAI model not initialized. Check GEMINI_API_KEY.")
+
+    response_text = None
+    try:
+        # Blocking network call → default thread pool, off the event loop
+        response = await asyncio.get_running_loop().run_in_executor(
+            None, coach.model.generate_content, data["user_prompt"]
+        )
+        response_text = response.text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        return JSONResponse(json.loads(response_text.strip()))
+
+    except json.JSONDecodeError as e:
+        return JSONResponse({
+            "error": "Failed to parse GenAI response as JSON",
+            "details": str(e),
+            "raw_response": response_text
+        }, status_code=500)
+    except Exception as e:
+        return _error(500, "Failed to generate feedback", str(e))
@@ -1,68 +1,82 @@
 import gradio as gr
 import os
-import json
-from flask import Flask, request, jsonify
-from src.pipeline import process_session
-from src.genai.coach import ShikshaCoach
+from flask_api import flask_app
+from src.pipeline import iter_session
 
-# Initialize Flask app for API endpoints
-flask_app = Flask(__name__)
+STAGE_LABELS = {
+    "extract_audio": "Extracting audio",
+    "audio": "Analysing audio",
+    "video": "Analysing video",
+    "transcribe": "Transcribing",
+    "text": "Analysing transcript"
+}
 
-# Initialize the coach
-coach = ShikshaCoach()
+def _render_progress(event, partial):
+    status_md = f"## ⏳ {STAGE_LABELS.get(event['stage'], 'Analysing')}... {event['percent']:.0f}%"
 
-@flask_app.route("/generate_genai_feedback", methods=["POST"])
-def generate_genai_feedback():
-    """
-    API endpoint to generate GenAI feedback from a user prompt
-    Expects: { "user_prompt": "..." }
-    Returns: JSON feedback object
-    """
-    try:
-        data = request.get_json()
-        
-        if not data or "user_prompt" not in data:
-            return jsonify({"error": "Missing 'user_prompt' in request body"}), 400
-        
-        user_prompt = data["user_prompt"]
-        
-        if not coach.model:
-            return jsonify({"error": "GenAI model not initialized. Check GEMINI_API_KEY."}), 500
-        
-        # Generate response using the coach model
-        response = coach.model.generate_content(user_prompt)
-        
-        # Extract text and parse JSON
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
+    scores_md = "## Per-Minute Scores (so far)\n"
+    for m in partial["audio"]:
+        scores_md += f"- Minute {m['minute'] + 1} — Clarity: {m['clarity_score']}, Confidence: {m['confidence_score']}\n"
+    for m in partial["video"]:
+        scores_md += f"- Minute {m['minute'] + 1} — Engagement: {m['engagement_score']}, Gesture: {m['gesture_index']}\n"
+
+    return status_md, scores_md
+
+def _render_report(report):
+    # 1. Summary
+    summary_md = "## Performance Summary\n"
+    if "coach_feedback" in report and "performance_summary" in report["coach_feedback"]:
+        summary_md += report["coach_feedback"]["performance_summary"] + "\n\n"
         
-        # Parse JSON
-        feedback = json.loads(response_text)
+        style = report["coach_feedback"].get("teaching_style", {})
+        if isinstance(style, dict):
+            summary_md += f"### Teaching Style: {style.get('style', 'Unknown')}\n{style.get('explanation', '')}"
+        else:
+            summary_md += f"### Teaching Style\n{str(style)}"
+    else:
+         summary_md += "Coach feedback not available (Check API Key)."
+         
+    # 2. Detailed Scores
+    scores = report.get("scores") or {}
+    audio, video, text = (scores.get(k) or {} for k in ("audio", "video", "text"))
+    scores_md = "## Detailed Scores\n"
+    scores_md += f"- **Audio Clarity**: {audio.get('clarity_score', 0)}\n"
+    scores_md += f"- **Audio Confidence**: {audio.get('confidence_score', 0)}\n"
+    scores_md += f"- **Video Engagement**: {video.get('engagement_score', 0)}\n"
+    scores_md += f"- **Gesture Index**: {video.get('gesture_index', 0)}\n"
+    scores_md += f"- **Technical Depth**: {text.get('technical_depth', 0)}\n"
+    scores_md += f"- **Interaction Index**: {text.get('interaction_index', 0)}\n"
+
+    # 3. Coach Feedback
+    feedback_md = "## Coach Feedback\n"
+    if "coach_feedback" in report:
+        fb = report["coach_feedback"]
         
-        return jsonify(feedback), 200
+        feedback_md += "### ✅ Strengths\n"
+        for s in fb.get("strengths", []):
+            feedback_md += f"- {s}\n"
         
-    except json.JSONDecodeError as e:
-        return jsonify({
-            "error": "Failed to parse GenAI response as JSON",
-            "details": str(e),
-            "raw_response": response_text if 'response_text' in locals() else None
-        }), 500
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to generate feedback",
-            "details": str(e)
-        }), 500
+        feedback_md += "\n### ⚠️ Areas for Improvement\n"
+        for w in fb.get("weaknesses", []):
+            feedback_md += f"- {w}\n"
+            
+        feedback_md += "\n### Titles & Hashtags\n"
+        meta = fb.get("content_metadata", {})
+        feedback_md += "**Titles:**\n"
+        for t in meta.get("titles", []):
+            feedback_md += f"- {t}\n"
+        feedback_md += "\n**Hashtags:** " + " ".join(meta.get("hashtags", []))
 
-def analyze_session(video):
+    return summary_md, scores_md, feedback_md
+
+def analyze_session_with_status(video, topic_name="General", language=None, institution_id=None):
+    """
+    Streams progress while the pipeline runs: stage + percent in the summary tab,
+    per-minute audio/video scores in the scores tab, partial JSON in raw data.
+    The last yield is the full report (same shape as analyze_session).
+    `language` (blank = auto-detect) is the Whisper hint; with `institution_id`
+    the transcript is indexed for /search_transcripts.
+    """
     if not video:
         yield "Please upload a video.", "", "", None, gr.update(value="Analyze Session", interactive=True)
         return
@@ -78,62 +92,47 @@ def analyze_session(video):
         except:
             video_path = video
         
-        report = process_session(video_path, topic_name="General")
+        report = None
+        error = None
+        partial = {"audio": [], "video": []}
+
+        for event in iter_session(
+            video_path,
+            topic_name=topic_name or "General",
+            language=(language or "").strip() or None,
+            institution_id=(institution_id or "").strip() or None
+        ):
+            if event["event"] == "complete":
+                report = event["report"]
+                continue
+            if event["event"] == "error":
+                error = event.get("message")
+                continue
+            if event["event"] == "partial":
+                partial[event["stage"]].append(event["minute"])
+
+            status_md, scores_md = _render_progress(event, partial)
+            yield (
+                status_md, scores_md, "",
+                {"stage": event["stage"], "percent": event["percent"], "partial": partial},
+                gr.update(value=f"Analysing... {event['percent']:.0f}%", interactive=False)
+            )
         
         if not report:
-            yield "Analysis failed. Please check logs.", "", "", None, gr.update(value="Analyze Session", interactive=True)
+            message = f"Analysis failed: {error}" if error else "Analysis failed. Please check logs."
+            yield message, "", "", None, gr.update(value="Analyze Session", interactive=True)
             return
 
-        # Prepare outputs
-        # 1. Summary
-        summary_md = "## Performance Summary\n"
-        if "coach_feedback" in report and "performance_summary" in report["coach_feedback"]:
-            summary_md += report["coach_feedback"]["performance_summary"] + "\n\n"
-            
-            style = report["coach_feedback"].get("teaching_style", {})
-            if isinstance(style, dict):
-                summary_md += f"### Teaching Style: {style.get('style', 'Unknown')}\n{style.get('explanation', '')}"
-            else:
-                summary_md += f"### Teaching Style\n{str(style)}"
-        else:
-             summary_md += "Coach feedback not available (Check API Key)."
-             
-        # 2. Detailed Scores
-        scores = report.get("scores", {})
-        scores_md = "## Detailed Scores\n"
-        scores_md += f"- **Audio Clarity**: {scores.get('audio', {}).get('clarity_score', 0)}\n"
-        scores_md += f"- **Audio Confidence**: {scores.get('audio', {}).get('confidence_score', 0)}\n"
-        scores_md += f"- **Video Engagement**: {scores.get('video', {}).get('engagement_score', 0)}\n"
-        scores_md += f"- **Gesture Index**: {scores.get('video', {}).get('gesture_index', 0)}\n"
-        scores_md += f"- **Technical Depth**: {scores.get('text', {}).get('technical_depth', 0)}\n"
-        scores_md += f"- **Interaction Index**: {scores.get('text', {}).get('interaction_index', 0)}\n"
-
-        # 3. Coach Feedback
-        feedback_md = "## Coach Feedback\n"
-        if "coach_feedback" in report:
-            fb = report["coach_feedback"]
-            
-            feedback_md += "### ✅ Strengths\n"
-            for s in fb.get("strengths", []):
-                feedback_md += f"- {s}\n"
-            
-            feedback_md += "\n### ⚠️ Areas for Improvement\n"
-            for w in fb.get("weaknesses", []):
-                feedback_md += f"- {w}\n"
-                
-            feedback_md += "\n### Titles & Hashtags\n"
-            meta = fb.get("content_metadata", {})
-            feedback_md += "**Titles:**\n"
-            for t in meta.get("titles", []):
-                feedback_md += f"- {t}\n"
-            feedback_md += "\n**Hashtags:** " + " ".join(meta.get("hashtags", []))
-
-        # 4. Raw JSON - Yield final results and reset button
+        # Raw JSON - Yield final results and reset button
+        summary_md, scores_md, feedback_md = _render_report(report)
         yield summary_md, scores_md, feedback_md, report, gr.update(value="Analyze Session", interactive=True)
 
     except Exception as e:
         yield f"An error occurred: {str(e)}", "", "", None, gr.update(value="Analyze Session", interactive=True)
 
+def analyze_session(video):
+    yield from analyze_session_with_status(video, topic_name="General")
+
 # Define Interface
 with gr.Blocks(title="Shiksha Netra - AI Pedagogical Coach") as demo:
     gr.Markdown("# 🎓 Shiksha Netra - AI Pedagogical Coach")
@@ -142,7 +141,12 @@ with gr.Blocks(title="Shiksha Netra - AI Pedagogical Coach") as demo:
     with gr.Row():
         with gr.Column():
             video_input = gr.Video(label="Upload Teaching Session", sources=["upload"])
+            topic_input = gr.Textbox(label="Topic", value="General")
+            language_input = gr.Textbox(label="Language", placeholder="Auto-detect (e.g. English, Hindi)")
+            institution_input = gr.Textbox(label="Institution ID", placeholder="Optional: enables transcript search")
             analyze_btn = gr.Button("Analyze Session", variant="primary")
+            # API-only: video-only endpoint (topic "General") kept for existing clients
+            legacy_btn = gr.Button(visible=False)
         
     with gr.Tabs():
         with gr.TabItem("Summary"):
@@ -155,9 +159,17 @@ with gr.Blocks(title="Shiksha Netra - AI Pedagogical Coach") as demo:
             json_output = gr.JSON()
 
     analyze_btn.click(
+        analyze_session_with_status,
+        inputs=[video_input, topic_input, language_input, institution_input],
+        outputs=[summary_output, scores_output, feedback_output, json_output, analyze_btn],
+        api_name="analyze_session_with_status"
+    )
+
+    legacy_btn.click(
         analyze_session,
         inputs=[video_input],
-        outputs=[summary_output, scores_output, feedback_output, json_output, analyze_btn]
+        outputs=[summary_output, scores_output, feedback_output, json_output, analyze_btn],
+        api_name="analyze_session"
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Speed benchmark for bulk report aggregation (institution dashboards).
+
+Generates synthetic reports (default 10k sessions of ~45 minutes over 200
+teachers and 5 subjects), checks the vectorized statistics against plain
+NumPy on a sample, then reports:
+- load time (reports → columnar arrays)
+- full aggregate_sessions time (percentiles, teachers, trends, cohorts)
+
+Usage (from the model/ directory):
+    python -m benchmarks.aggregation --sessions 10000
+"""
+import argparse
+import time
+import numpy as np
+
+from src.analytics import aggregate_sessions, load_sessions
+
+SUBJECTS = ("Mathematics", "Physics", "Chemistry", "Biology", "Computer Science")
+
+
+def synthetic_sessions(n, teachers, minutes=45, seed=0):
+    rng = np.random.default_rng(seed)
+    start = 1_700_000_000
+    sessions = []
+    for i in range(n):
+        length = int(rng.integers(minutes // 2, minutes * 2))
+        drift = rng.normal(0, 0.3)
+        audio = [
+            {
+                "minute": m, "start_sec": m * 60, "end_sec": (m + 1) * 60,
+                "clarity_score": round(float(np.clip(60 + rng.normal(0, 10), 0, 100)), 2),
+                "confidence_score": round(float(np.clip(55 + rng.normal(0, 12), 0, 100)), 2)
+            }
+            for m in range(length)
+        ]
+        video = [
+            {
+                "minute": m,
+                "engagement_score": round(float(np.clip(70 - drift * m + rng.normal(0, 8), 0, 100)), 2),
+                "gesture_index": round(float(np.clip(rng.gamma(2, 2), 0, 100)), 2),
+                "dominant_emotion": "neutral",
+                "confidence_score": round(float(np.clip(50 + rng.normal(0, 15), 0, 100)), 2)
+            }
+            for m in range(length)
+        ]
+        sessions.append({
+            "teacher_id": f"teacher-{rng.integers(teachers)}",
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "created_at": int(start + rng.integers(0, 180 * 86400)),
+            "scores": {
+                "audio": {"per_minute": audio, "overall": {
+                    "clarity_score": float(np.mean([m["clarity_score"] for m in audio])),
+                    "confidence_score": float(np.mean([m["confidence_score"] for m in audio]))
+                }},
+                "video": {"per_minute": video, "overall": {
+                    "engagement_score": float(np.mean([m["engagement_score"] for m in video])),
+                    "gesture_index": float(np.mean([m["gesture_index"] for m in video])),
+                    "confidence_score": float(np.mean([m["confidence_score"] for m in video]))
+                }},
+                "text": {
+                    "technical_depth": float(rng.uniform(0, 1)),
+                    "interaction_index": float(rng.uniform(0, 1))
+                }
+            }
+        })
+    return sessions
+
+
+def check(sessions, result):
+    # Spot-check against plain NumPy reductions
+    clarity = np.array([s["scores"]["audio"]["overall"]["clarity_score"] for s in sessions])
+    expected = round(float(np.percentile(clarity, 90)), 2)
+    assert result["summary"]["clarity_score"]["p90"] == expected, "p90 mismatch"
+
+    teacher = sessions[0]["teacher_id"]
+    own = np.array([
+        s["scores"]["audio"]["overall"]["clarity_score"]
+        for s in sessions if s["teacher_id"] == teacher
+    ])
+    got = result["teachers"][teacher]["metrics"]["clarity_score"]
+    assert got["median"] == round(float(np.median(own)), 2), "teacher median mismatch"
+    assert got["mean"] == round(float(np.mean(own)), 2), "teacher mean mismatch"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--teachers", type=int, default=200)
+    parser.add_argument("--minutes", type=int, default=45)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sessions = synthetic_sessions(args.sessions, args.teachers, args.minutes)
+    minute_rows = sum(len(s["scores"]["audio"]["per_minute"]) for s in sessions)
+    print(f"Synthetic: {args.sessions:,} sessions, {minute_rows:,} minutes")
+
+    load_ms, total_ms = [], []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        load_sessions(sessions, cohort_key="subject")
+        load_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        result = aggregate_sessions(sessions, cohort_key="subject")
+        total_ms.append((time.perf_counter() - start) * 1000)
+
+    check(sessions, result)
+    print(f"Load: {np.median(load_ms):.0f} ms | aggregate (incl. load): {np.median(total_ms):.0f} ms "
+          f"(median of {args.repeat}); checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Accuracy report: int8 / ONNX inference backends vs the fp32 reference.
+
+For every input (audio or video) it reports, per backend:
+- transcript WER against the fp32 transcript
+- technical_depth delta on the fp32 transcript (isolates the MiniLM change)
+- transcription wall time
+
+Usage (from the model/ directory):
+    python -m benchmarks.backend_accuracy session1.mp4 lecture.wav --topic "Machine Learning"
+    python -m benchmarks.backend_accuracy *.wav --backends int8 onnx --json report.json
+"""
+import argparse
+import json
+import os
+import time
+
+from config.settings import INFERENCE_BACKENDS
+from src.evaluation.metrics import word_error_rate
+from src.pipeline import extract_audio, transcribe_audio
+from src.processors.text_analyzer import TextAnalyzer
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".m4a", ".ogg")
+
+
+def _timed_transcript(audio_path, backend):
+    start = time.perf_counter()
+    text = transcribe_audio(audio_path, backend=backend)
+    return text, round(time.perf_counter() - start, 2)
+
+
+def evaluate_file(path, topic, backends):
+    is_audio = path.lower().endswith(AUDIO_EXTENSIONS)
+    audio_path = path if is_audio else extract_audio(path)
+
+    try:
+        ref_text, ref_time = _timed_transcript(audio_path, "fp32")
+        ref_depth = TextAnalyzer(ref_text, backend="fp32").analyze_technical_depth(topic)
+
+        rows = [{
+            "file": os.path.basename(path),
+            "backend": "fp32",
+            "wer": 0.0,
+            "technical_depth": ref_depth,
+            "technical_depth_delta": 0.0,
+            "transcribe_sec": ref_time,
+            "speedup": 1.0,
+        }]
+
+        for backend in backends:
+            text, elapsed = _timed_transcript(audio_path, backend)
+            depth = TextAnalyzer(ref_text, backend=backend).analyze_technical_depth(topic)
+            rows.append({
+                "file": os.path.basename(path),
+                "backend": backend,
+                "wer": word_error_rate(ref_text, text),
+                "technical_depth": depth,
+                "technical_depth_delta": round(depth - ref_depth, 2),
+                "transcribe_sec": elapsed,
+                "speedup": round(ref_time / elapsed, 2) if elapsed else 0.0,
+            })
+        return rows
+
+    finally:
+        if not is_audio and os.path.exists(audio_path):
+            os.remove(audio_path)
+
+
+def print_table(rows):
+    header = f"{'file':<28} {'backend':<8} {'WER':>7} {'depth':>7} {'Δdepth':>7} {'sec':>7} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['file'][:28]:<28} {r['backend']:<8} {r['wer']:>7.4f} "
+            f"{r['technical_depth']:>7.2f} {r['technical_depth_delta']:>7.2f} "
+            f"{r['transcribe_sec']:>7.2f} {r['speedup']:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Audio or video files")
+    parser.add_argument("--topic", default="General")
+    parser.add_argument(
+        "--backends", nargs="+",
+        default=[b for b in INFERENCE_BACKENDS if b != "fp32"],
+        choices=[b for b in INFERENCE_BACKENDS if b != "fp32"]
+    )
+    parser.add_argument("--json", help="Write the rows to this JSON file")
+    args = parser.parse_args()
+
+    rows = []
+    for path in args.inputs:
+        if not os.path.exists(path):
+            print(f"Skipping missing file: {path}")
+            continue
+        rows.extend(evaluate_file(path, args.topic, args.backends))
+
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
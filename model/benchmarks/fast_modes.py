@@ -0,0 +1,102 @@
+"""
+Accuracy vs speed of fast modes against the reference process_session.
+
+Runs the reference and every configured mode (src/evaluation/harness.py) on
+local sample videos and/or a generated synthetic corpus, then reports per
+video and mode:
+- |delta| of clarity_score, engagement_score, gesture_index, technical_depth
+- transcript WER against the reference transcript
+- speedup and peak memory of both runs
+
+Exits with status 1 when any mode exceeds a declared tolerance or a run
+fails (non-zero exit / timeout: listed with the tail of its stderr).
+
+Usage (from the model/ directory):
+    python -m benchmarks.fast_modes samples/*.mp4 --synthetic 2
+    python -m benchmarks.fast_modes --synthetic 3 --modes modes.json --only int8 preview --json fast.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from src.evaluation.harness import RUN_TIMEOUT_SEC, evaluate, load_modes, synthetic_corpus
+
+COLUMNS = ("clarity_score", "engagement_score", "gesture_index", "technical_depth", "wer")
+
+
+def _fmt(value, width, digits=2):
+    return f"{value:>{width}.{digits}f}" if isinstance(value, (int, float)) else f"{'-':>{width}}"
+
+
+def print_table(rows):
+    header = (
+        f"{'video':<22} {'mode':<18} {'Δclar':>7} {'Δeng':>7} {'Δgest':>7} {'Δdepth':>7} "
+        f"{'WER':>6} {'speedup':>8} {'MB ref':>7} {'MB mode':>8}  status"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        deltas = r.get("deltas", {})
+        if r.get("status") == "failed":
+            # violations holds the failed run: "reference" or "run"
+            status = f"FAILED {next(iter(r['violations']))}: {r['error']}"
+        else:
+            status = "FAIL " + ", ".join(
+                m if v["delta"] is not None else f"{m} (missing)" for m, v in r["violations"].items()
+            ) if r["violations"] else "ok"
+        print(
+            f"{r['video'][:22]:<22} {r['mode'][:18]:<18} "
+            + " ".join(_fmt(deltas.get(c), 7 if c != "wer" else 6, 2 if c != "wer" else 3) for c in COLUMNS)
+            + f" {_fmt(r.get('speedup'), 8)} {_fmt(r.get('reference_peak_mb'), 7, 0)} "
+            f"{_fmt(r.get('mode_peak_mb'), 8, 0)}  {status}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help="Local sample videos")
+    parser.add_argument("--synthetic", type=int, default=0, help="Number of generated videos to add")
+    parser.add_argument("--synthetic-minutes", type=float, default=2)
+    parser.add_argument("--synthetic-dir", default=os.path.join(tempfile.gettempdir(), "shiksha_synthetic"))
+    parser.add_argument("--modes", help="JSON file of modes (default: built-in FAST_MODES)")
+    parser.add_argument("--only", nargs="+", help="Run only these modes")
+    parser.add_argument("--topic", default="General")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT_SEC, help="Seconds per isolated run")
+    parser.add_argument("--json", help="Write the rows to this JSON file")
+    args = parser.parse_args()
+
+    modes = load_modes(args.modes)
+    if args.only:
+        missing = set(args.only) - set(modes)
+        if missing:
+            parser.error(f"Unknown modes: {sorted(missing)}")
+        modes = {name: modes[name] for name in args.only}
+
+    videos = [p for p in args.inputs if os.path.exists(p)]
+    for path in set(args.inputs) - set(videos):
+        print(f"Skipping missing file: {path}")
+    if args.synthetic:
+        videos += synthetic_corpus(args.synthetic_dir, args.synthetic, args.synthetic_minutes)
+    if not videos:
+        parser.error("No videos: pass sample files and/or --synthetic N")
+
+    rows = evaluate(videos, modes, args.topic, args.timeout)
+    print_table(rows)
+    for r in rows:
+        if r.get("status") == "failed" and r.get("stderr"):
+            print(f"\n--- {r['video']} / {r['mode']}: {r['error']} ---\n{r['stderr']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    failed = [r for r in rows if r["violations"]]
+    if failed:
+        print(f"\n{len(failed)} run(s) exceeded their tolerance")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Latency benchmark for the memory-mapped transcript index.
+
+Builds a synthetic index of random normalized vectors (default 1M chunks,
+384-d MiniLM size) spread over several institutions, then reports:
+- build throughput and on-disk size
+- open time (memory-mapping, no load)
+- filtered top-k query latency (p50 / p95 / max)
+
+Usage (from the model/ directory):
+    python -m benchmarks.index_latency --rows 1000000 --dtype float16
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+
+from src.transcript_index import TranscriptIndex
+
+DIM = 384
+
+
+def build(index_dir, rows, dtype, institutions, batch=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    index = TranscriptIndex(index_dir, dim=DIM, dtype=dtype, model_key="synthetic")
+
+    start = time.perf_counter()
+    written = 0
+    while written < rows:
+        n = min(batch, rows - written)
+        vecs = rng.standard_normal((n, DIM), dtype=np.float32)
+        vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+        inst = f"inst-{(written // batch) % institutions}"
+        meta = [{"session_id": f"s{(written + i) // 40}", "chunk": (written + i) % 40} for i in range(n)]
+        index.add(vecs, meta, institution_id=inst)
+        written += n
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dtype", default="float16", choices=["float16", "float32"])
+    parser.add_argument("--institutions", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dir", help="Keep the index here instead of a temp dir")
+    args = parser.parse_args()
+
+    index_dir = args.dir or tempfile.mkdtemp(prefix="transcript_index_bench_")
+    try:
+        build_sec = build(index_dir, args.rows, args.dtype, args.institutions)
+        size_mb = sum(
+            os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir)
+        ) / 1e6
+        print(f"Built {args.rows:,} rows in {build_sec:.1f}s ({args.rows / build_sec:,.0f} rows/s), {size_mb:,.0f} MB")
+
+        start = time.perf_counter()
+        index = TranscriptIndex(index_dir)
+        n = len(index)
+        print(f"Open: {(time.perf_counter() - start) * 1000:.2f} ms ({n:,} rows mapped)")
+
+        rng = np.random.default_rng(1)
+        latencies = []
+        for i in range(args.queries):
+            q = rng.standard_normal(DIM, dtype=np.float32)
+            inst = f"inst-{i % args.institutions}"
+            start = time.perf_counter()
+            index.search(q, inst, k=args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        lat = np.array(latencies)
+        print(
+            f"Query top-{args.k} (filtered by institution, {args.queries} queries): "
+            f"p50 {np.percentile(lat, 50):.1f} ms | p95 {np.percentile(lat, 95):.1f} ms | "
+            f"max {lat.max():.1f} ms | first {lat[0]:.1f} ms"
+        )
+
+    finally:
+        if not args.dir:
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
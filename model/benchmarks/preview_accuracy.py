@@ -0,0 +1,172 @@
+"""
+Estimation error of preview mode against full runs.
+
+For every video it runs the full pipeline once and preview mode with a few
+sampling seeds, then reports per metric:
+- absolute error of the preview estimate vs the full overall score
+- whether the full score falls inside the preview confidence interval
+- wall time of both runs (speedup)
+
+Usage (from the model/ directory):
+    python -m benchmarks.preview_accuracy corpus/*.mp4 --seeds 5
+    python -m benchmarks.preview_accuracy corpus/*.mp4 --asr tiny --json preview.json
+    python -m benchmarks.preview_accuracy --synthetic 4 --synthetic-minutes 30 --seeds 5
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+from src.evaluation.harness import synthetic_corpus
+from src.pipeline import process_session, iter_preview
+
+METRICS = (
+    ("audio", "clarity_score"),
+    ("audio", "confidence_score"),
+    ("video", "engagement_score"),
+    ("video", "gesture_index"),
+    ("video", "confidence_score"),
+)
+
+
+def _run_preview(path, topic, asr, seed):
+    for event in iter_preview(path, topic, asr=asr, seed=seed):
+        if event["event"] == "error":
+            raise RuntimeError(event["message"])
+        if event["event"] == "complete":
+            return event["report"]
+
+
+def evaluate_file(path, topic, seeds, asr):
+    start = time.perf_counter()
+    full = process_session(path, topic)
+    full_sec = time.perf_counter() - start
+    if not full:
+        raise RuntimeError(f"Full run failed for {path}")
+
+    rows = []
+    for seed in range(seeds):
+        start = time.perf_counter()
+        preview = _run_preview(path, topic, asr, seed)
+        preview_sec = time.perf_counter() - start
+
+        for stream, metric in METRICS:
+            truth = full["scores"][stream]["overall"][metric]
+            est = preview["scores"][stream]["estimates"][metric]
+            if est["estimate"] is None:
+                continue
+            covered = None
+            if est["ci_low"] is not None:
+                covered = est["ci_low"] <= truth <= est["ci_high"]
+            rows.append({
+                "file": os.path.basename(path),
+                "seed": seed,
+                "metric": f"{stream}.{metric}",
+                "full": truth,
+                "estimate": est["estimate"],
+                "abs_error": round(abs(est["estimate"] - truth), 2),
+                "ci_low": est["ci_low"],
+                "ci_high": est["ci_high"],
+                "covered": covered,
+                "sampled": est["sampled"],
+                "population": est["population"],
+                "full_sec": round(full_sec, 2),
+                "preview_sec": round(preview_sec, 2),
+            })
+
+        text = preview["scores"].get("text") or {}
+        if text.get("technical_depth") is not None:   # ASR skipped: keys present, values None
+            truth = full["scores"]["text"]["technical_depth"]
+            rows.append({
+                "file": os.path.basename(path),
+                "seed": seed,
+                "metric": "text.technical_depth",
+                "full": truth,
+                "estimate": text["technical_depth"],
+                "abs_error": round(abs(text["technical_depth"] - truth), 2),
+                "ci_low": None,
+                "ci_high": None,
+                "covered": None,
+                "sampled": len(preview["metadata"]["sampled_minutes"]["video"]),
+                "population": preview["metadata"]["total_minutes"]["video"],
+                "full_sec": round(full_sec, 2),
+                "preview_sec": round(preview_sec, 2),
+            })
+    return rows
+
+
+def summarize(rows):
+    summary = {}
+    for metric in dict.fromkeys(r["metric"] for r in rows):
+        own = [r for r in rows if r["metric"] == metric]
+        errors = np.array([r["abs_error"] for r in own])
+        covered = [r["covered"] for r in own if r["covered"] is not None]
+        summary[metric] = {
+            "runs": len(own),
+            "mae": round(float(errors.mean()), 2),
+            "p90_error": round(float(np.percentile(errors, 90)), 2),
+            "max_error": round(float(errors.max()), 2),
+            "ci_coverage": round(float(np.mean(covered)), 2) if covered else None,
+        }
+    if rows:
+        speedups = [r["full_sec"] / r["preview_sec"] for r in rows if r["preview_sec"]]
+        summary["_timing"] = {
+            "median_preview_sec": round(float(np.median([r["preview_sec"] for r in rows])), 2),
+            "median_speedup": round(float(np.median(speedups)), 2) if speedups else None,
+        }
+    return summary
+
+
+def print_summary(summary):
+    header = f"{'metric':<26} {'runs':>5} {'MAE':>7} {'p90':>7} {'max':>7} {'CI cov.':>8}"
+    print(header)
+    print("-" * len(header))
+    for metric, s in summary.items():
+        if metric.startswith("_"):
+            continue
+        coverage = f"{s['ci_coverage']:.2f}" if s["ci_coverage"] is not None else "-"
+        print(
+            f"{metric:<26} {s['runs']:>5} {s['mae']:>7.2f} {s['p90_error']:>7.2f} "
+            f"{s['max_error']:>7.2f} {coverage:>8}"
+        )
+    timing = summary.get("_timing")
+    if timing:
+        print(f"\nPreview: median {timing['median_preview_sec']}s, {timing['median_speedup']}x faster than full runs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help="Video files (benchmark corpus)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Number of generated videos to add")
+    parser.add_argument("--synthetic-minutes", type=float, default=30)
+    parser.add_argument("--synthetic-dir", default=os.path.join(tempfile.gettempdir(), "shiksha_synthetic_preview"))
+    parser.add_argument("--topic", default="General")
+    parser.add_argument("--seeds", type=int, default=3, help="Preview runs per video (different window samples)")
+    parser.add_argument("--asr", default="skip", choices=["skip", "tiny"])
+    parser.add_argument("--json", help="Write rows + summary to this JSON file")
+    args = parser.parse_args()
+
+    videos = [p for p in args.inputs if os.path.exists(p)]
+    for path in set(args.inputs) - set(videos):
+        print(f"Skipping missing file: {path}")
+    if args.synthetic:
+        videos += synthetic_corpus(args.synthetic_dir, args.synthetic, args.synthetic_minutes)
+    if not videos:
+        parser.error("No videos: pass corpus files and/or --synthetic N")
+
+    rows = []
+    for path in videos:
+        rows.extend(evaluate_file(path, args.topic, args.seeds, args.asr))
+
+    summary = summarize(rows)
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rows": rows, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
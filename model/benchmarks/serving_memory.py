@@ -0,0 +1,199 @@
+"""
+Per-worker memory of multi-worker serving, at startup and under load.
+
+Starts `gunicorn -c gunicorn.conf.py serve:app` with N workers and reads every
+worker's RSS / PSS / private memory (/proc/<pid>/smaps_rollup):
+- startup: all workers up, no request served yet
+- warm: after a warm-up analysis on every worker. Models load lazily on first
+  use, so without preloading this is the first point where a worker holds them
+- peak: while concurrent /analyze requests with the sample video run
+With --compare the same run is repeated without preloading, to show what
+copy-on-write sharing saves.
+
+PSS is the per-worker figure to budget with: shared model pages are split
+between the processes mapping them, so the PSS column sums to real usage.
+
+Usage (from the model/ directory, Linux):
+    python -m benchmarks.serving_memory --video sample.mp4 --workers 2 --requests 4
+    python -m benchmarks.serving_memory --video sample.mp4 --workers 4 --compare
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.serving import memory_footprint
+
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # "pid (comm) state ppid ..." — comm may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return sorted(kids)
+
+
+def start_server(workers, port, preload, ready_timeout):
+    env = {
+        **os.environ,
+        "ANALYSIS_WORKERS": str(workers),
+        "SERVE_PORT": str(port),
+        "SERVE_PRELOAD": "true" if preload else "false",
+        "TRANSCRIPT_INDEX_ENABLED": "false",
+        "FEATURE_STORE_ENABLED": "false",
+    }
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "serve:app"],
+        cwd=MODEL_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + ready_timeout
+    while time.time() < deadline:
+        if master.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        pids = _children(master.pid)
+        if len(pids) >= workers:
+            try:
+                requests.get(f"http://127.0.0.1:{port}/worker_stats", timeout=2)
+                return master, pids
+            except requests.RequestException:
+                pass
+        time.sleep(1)
+
+    master.terminate()
+    raise RuntimeError(f"Server not ready after {ready_timeout}s")
+
+
+def stop_server(master):
+    master.send_signal(signal.SIGTERM)
+    try:
+        master.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        master.kill()
+
+
+def _post(port, video):
+    with open(video, "rb") as f:
+        return requests.post(
+            f"http://127.0.0.1:{port}/analyze",
+            files={"video": (os.path.basename(video), f)},
+            data={"topic_name": "General"},
+            timeout=3600
+        )
+
+
+def warm_up(port, video, pids, timeout):
+    """Post the sample until every worker has completed one analysis (X-Worker-Pid)."""
+    cold = set(pids)
+    deadline = time.time() + timeout
+    with ThreadPoolExecutor(max_workers=len(pids)) as pool:
+        while cold and time.time() < deadline:
+            for r in pool.map(lambda _: _post(port, video), range(len(cold))):
+                if r.status_code == 200:
+                    cold.discard(int(r.headers.get("X-Worker-Pid", 0)))
+    if cold:
+        raise RuntimeError(f"Workers {sorted(cold)} not warmed up after {timeout}s")
+
+
+def measure(video, workers, n_requests, port, preload, ready_timeout):
+    master, pids = start_server(workers, port, preload, ready_timeout)
+    try:
+        startup = {pid: memory_footprint(pid) for pid in pids}
+        warm_up(port, video, pids, ready_timeout)
+        warm = {pid: memory_footprint(pid) for pid in pids}
+        peak = {pid: dict(warm[pid]) for pid in pids}
+
+        stop = threading.Event()
+
+        def sample():
+            while not stop.is_set():
+                for pid in pids:
+                    now = memory_footprint(pid)
+                    for key, value in now.items():
+                        peak[pid][key] = max(peak[pid].get(key, 0.0), value)
+                time.sleep(0.5)
+
+        def post(_):
+            return _post(port, video).status_code
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=n_requests) as pool:
+            statuses = list(pool.map(post, range(n_requests)))
+        elapsed = time.time() - start
+        stop.set()
+        sampler.join()
+
+        return {
+            "preload": preload,
+            "startup": startup,
+            "warm": warm,
+            "peak": peak,
+            "master": memory_footprint(master.pid),
+            "statuses": statuses,
+            "elapsed_sec": round(elapsed, 1),
+        }
+    finally:
+        stop_server(master)
+
+
+def print_result(result):
+    label = "preloaded (copy-on-write)" if result["preload"] else "no preload"
+    print(f"\n== {label} | master: {result['master']}")
+    phases = ("startup", "warm", "peak")
+    header = f"{'worker':>8} " + " ".join(f"{f'{k} {p}':>13}" for p in phases for k in ("PSS", "priv"))
+    print(header + "   (MB)")
+    print("-" * len(header))
+    for pid in result["startup"]:
+        print(f"{pid:>8} " + " ".join(
+            f"{result[p][pid].get(k, 0):>13.0f}" for p in phases for k in ("pss", "private")
+        ))
+    master_pss = result["master"].get("pss", 0)
+    totals = {p: sum(f.get("pss", 0) for f in result[p].values()) + master_pss for p in phases}
+    ok = sum(1 for s in result["statuses"] if s == 200)
+    busy = sum(1 for s in result["statuses"] if s == 503)
+    print("Total PSS (MB, incl. master): " + " | ".join(f"{p} {v:.0f}" for p, v in totals.items()))
+    print(f"Requests: {ok} ok, {busy} rejected (busy), {len(result['statuses']) - ok - busy} failed "
+          f"in {result['elapsed_sec']}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", required=True, help="Sample video posted to /analyze")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--requests", type=int, help="Concurrent requests (default: one per worker)")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--compare", action="store_true", help="Also run without preloading")
+    parser.add_argument("--ready-timeout", type=int, default=600)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        parser.error("Needs Linux /proc/<pid>/smaps_rollup")
+
+    for preload in ([True, False] if args.compare else [True]):
+        result = measure(
+            os.path.abspath(args.video), args.workers, args.requests or args.workers,
+            args.port, preload, args.ready_timeout
+        )
+        print_result(result)
+
+
+if __name__ == "__main__":
+    main()
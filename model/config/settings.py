@@ -1,13 +1,113 @@
 # Configuration settings for Shiksha Netra
+import os
 
 # Audio Analysis Constants
 SAMPLE_RATE = 22050
 SPEECH_THRESHOLD_DB = 20
+N_FFT = 2048
+HOP_LENGTH = 512
 
 # Video Analysis Constants
 FRAME_EXTRACTION_RATE = 30
 
+# Adaptive frame sampling (opt-in): back off during static stretches,
+# sample densely during gestures / scene activity
+ADAPTIVE_SAMPLING = os.getenv("ADAPTIVE_SAMPLING", "false").lower() in ("1", "true")
+SAMPLING_BUDGET_PER_MIN = 120       # max analysed frames per minute of video
+SAMPLING_MAX_GAP_SEC = 5.0          # longest gap between samples when static
+ACTIVITY_THUMB_SIZE = (64, 36)      # downscaled frame used for the activity signal
+ACTIVITY_LOW = 0.01                 # mean abs diff below this → static, widen stride
+ACTIVITY_HIGH = 0.04                # mean abs diff above this → active, tighten stride
+
+# Scoring weights applied to the raw per-window features.
+# Partial overrides (e.g. {"clarity": {"pause": 0.5}}) can be passed to rescore.
+SCORING_WEIGHTS = {
+    "clarity": {"pause": 0.4, "noise": 0.4, "energy": 0.2, "energy_std_ref": 0.05},
+    "audio_confidence": {"loudness": 0.6, "stability": 0.4, "loudness_ref": 0.08,
+                         "stability_std_ref": 0.05, "min_frames": 10},
+    # Base score for having a face; gain 10 → ~7% screen coverage gives 100%
+    "engagement": {"base": 0.3, "area_gain": 10.0},
+    "video_confidence": {"face": 0.6, "motion": 0.4, "motion_threshold": 0.001},
+}
+
+# Raw feature store (.npz per report) for re-scoring without re-decoding
+FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE_ENABLED", "true").lower() in ("1", "true")
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "feature_store")
+
+# Model / Inference Constants
+WHISPER_MODEL_SIZE = "base"
+SENTENCE_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# CPU inference backend for Whisper + MiniLM:
+# "fp32" (stock), "int8" (dynamic quantization), "onnx" (ONNX Runtime for MiniLM, int8 Whisper)
+INFERENCE_BACKENDS = ("fp32", "int8", "onnx")
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "fp32").lower()
+
+# Topic embeddings: persistent cache + optional curriculum catalogue
+# (JSON list of topic names or {"name": ..., "description": ...} objects)
+TOPIC_CACHE_DIR = os.getenv("TOPIC_CACHE_DIR", "topic_cache")
+CURRICULUM_TOPICS_PATH = os.getenv("CURRICULUM_TOPICS_PATH")
+TOPIC_DETECTION_TOP_K = 3
+# Bounds: topic vectors kept in memory per model (LRU), topic .npy files kept
+# on disk per model (least recently used removed first; catalogue matrices exempt)
+TOPIC_CACHE_MEMORY_ENTRIES = 256
+TOPIC_CACHE_MAX_FILES = int(os.getenv("TOPIC_CACHE_MAX_FILES", "10000"))
+
+# Transcript embedding index (memory-mapped, append-only) for semantic search
+TRANSCRIPT_INDEX_ENABLED = os.getenv("TRANSCRIPT_INDEX_ENABLED", "true").lower() in ("1", "true")
+TRANSCRIPT_INDEX_DIR = os.getenv("TRANSCRIPT_INDEX_DIR", "transcript_index")
+TRANSCRIPT_INDEX_DTYPE = os.getenv("TRANSCRIPT_INDEX_DTYPE", "float16")   # or float32
+TRANSCRIPT_CHUNK_WORDS = 120
+TRANSCRIPT_CHUNK_OVERLAP = 20
+
+# ASR policy: Whisper size from audio duration vs latency target
+WHISPER_MODEL_LADDER = ("tiny", "base", "small", "medium")   # smallest → largest
+WHISPER_PREVIEW_MODEL = "tiny"
+ASR_MAX_MODEL = os.getenv("ASR_MAX_MODEL", WHISPER_MODEL_SIZE)
+# Opt-in: downgrade the model when its estimated runtime exceeds this (0 = always ASR_MAX_MODEL)
+ASR_LATENCY_TARGET_SEC = float(os.getenv("ASR_LATENCY_TARGET_SEC", 0))
+# Approx. CPU seconds of transcription per second of audio (fp32, 4 threads)
+ASR_REALTIME_FACTORS = {"tiny": 0.05, "base": 0.12, "small": 0.4, "medium": 1.1}
+ASR_REFERENCE_THREADS = 4
+
+# Preview mode: stratified sample of minute windows, estimated overall scores
+PREVIEW_WINDOWS = 6                   # minute windows per stream
+PREVIEW_CONFIDENCE = 0.95             # confidence level of the reported intervals
+PREVIEW_ASR = os.getenv("PREVIEW_ASR", "skip").lower()   # "skip" or "tiny" (WHISPER_PREVIEW_MODEL)
+
+# Live sessions (src/live.py, /live/* routes): recordings fed chunk by chunk
+LIVE_ASR_MIN_SEC = 30                 # Whisper gets at least this much audio per batch (planned per batch)
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", 8))      # open sessions per worker
+LIVE_SESSION_IDLE_SEC = 1800          # drop a session with no chunk for this long
+
+# Worker / threading: torch intra-op threads per analysis job
+# (0 = cores / (workers x SERVE_WORKER_CONCURRENCY))
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 1))
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", 0))
+
+# Multi-worker serving (gunicorn, see gunicorn.conf.py): models load once in the
+# master before forking and are shared copy-on-write by ANALYSIS_WORKERS workers
+SERVE_PORT = int(os.getenv("SERVE_PORT", 5000))
+SERVE_THREADS = int(os.getenv("SERVE_THREADS", 4))                        # request threads per worker
+SERVE_WORKER_CONCURRENCY = int(os.getenv("SERVE_WORKER_CONCURRENCY", 1))  # analyses per worker at once
+SERVE_PRELOAD = os.getenv("SERVE_PRELOAD", "true").lower() in ("1", "true")
+SERVE_PRELOAD_WHISPER = tuple(
+    s.strip() for s in os.getenv("SERVE_PRELOAD_WHISPER", ASR_MAX_MODEL).split(",") if s.strip()
+)
+
+# Async API (api.py, uvicorn): multipart uploads are streamed to disk in chunks
+API_UPLOAD_DIR = os.getenv("API_UPLOAD_DIR", "uploads")
+API_MAX_UPLOAD_MB = int(os.getenv("API_MAX_UPLOAD_MB", 4096))
+API_MAX_PENDING = int(os.getenv("API_MAX_PENDING", 4))            # uploads + queued/running analyses
+API_REPORT_CACHE_DIR = os.getenv("API_REPORT_CACHE_DIR", "report_cache")   # keyed by upload sha256 ("" = off)
+
 # GenAI Constants
 LLM_MODEL_NAME = "gemini-2.5-flash"
 
+# Coach chat: retrieval-scoped context per session
+COACH_CONTEXT_TOKEN_BUDGET = 1500     # approx. tokens of retrieved context per turn
+COACH_CONTEXT_CHUNK_WORDS = 80
+COACH_CONTEXT_IDLE_SEC = 1800         # evict a session's store after this idle time
+COACH_CONTEXT_MAX_SESSIONS = 64
+
 # Future configurations can be added here
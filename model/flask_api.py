@@ -0,0 +1,347 @@
+"""
+Flask API: analysis (/analyze), live sessions (/live/*), GenAI feedback,
+transcript search, rescoring, report aggregation and per-worker stats.
+
+Kept apart from the Gradio UI (app.py) so the gunicorn entry point (serve.py)
+loads neither gradio nor the UI into the pre-fork master.
+"""
+import os
+import json
+import tempfile
+import threading
+import time
+import uuid
+from flask import Flask, request, jsonify
+from config.settings import LIVE_MAX_SESSIONS, LIVE_SESSION_IDLE_SEC
+from src.pipeline import process_session, AUDIO_CACHE_DIR
+from src.live import LiveSession
+from src.genai.coach import ShikshaCoach
+from src.inference import get_sentence_model, sentence_model_key
+from src.transcript_index import get_transcript_index
+from src.feature_store import rescore
+from src.analytics import aggregate_sessions, DEFAULT_PERCENTILES
+from src.serving import JobLimiter, WorkerBusy, memory_footprint
+
+# Initialize Flask app for API endpoints
+flask_app = Flask(__name__)
+
+# Initialize the coach
+coach = ShikshaCoach()
+
+# Per-process cap on concurrent analyses (one per gunicorn worker)
+job_limiter = JobLimiter()
+
+# Live sessions held by this process: session_id → (LiveSession, lock).
+# A session's chunks must reach the worker that started it (X-Worker-Pid of
+# /live/start: single worker or sticky routing); other workers answer 404.
+live_sessions = {}
+live_lock = threading.Lock()
+
+@flask_app.after_request
+def tag_worker(response):
+    # Which (gunicorn) worker served the request: used by benchmarks.serving_memory
+    response.headers["X-Worker-Pid"] = str(os.getpid())
+    return response
+
+@flask_app.route("/generate_genai_feedback", methods=["POST"])
+def generate_genai_feedback():
+    """
+    API endpoint to generate GenAI feedback from a user prompt
+    Expects: { "user_prompt": "..." }
+    Returns: JSON feedback object
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or "user_prompt" not in data:
+            return jsonify({"error": "Missing 'user_prompt' in request body"}), 400
+        
+        user_prompt = data["user_prompt"]
+        
+        if not coach.model:
+            return jsonify({"error": "GenAI model not initialized. Check GEMINI_API_KEY."}), 500
+        
+        # Generate response using the coach model
+        response = coach.model.generate_content(user_prompt)
+        
+        # Extract text and parse JSON
+        response_text = response.text.strip()
+        
+        # Remove markdown code blocks if present
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        response_text = response_text.strip()
+        
+        # Parse JSON
+        feedback = json.loads(response_text)
+        
+        return jsonify(feedback), 200
+        
+    except json.JSONDecodeError as e:
+        return jsonify({
+            "error": "Failed to parse GenAI response as JSON",
+            "details": str(e),
+            "raw_response": response_text if 'response_text' in locals() else None
+        }), 500
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to generate feedback",
+            "details": str(e)
+        }), 500
+
+@flask_app.route("/search_transcripts", methods=["POST"])
+def search_transcripts():
+    """
+    Semantic search over indexed transcript chunks of one institution
+    Expects: { "query": "...", "institution_id": "...", "k": 10 }
+    Returns: { "results": [{ "score", "session_id", "chunk", "start_word", "text" }] }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or not data.get("query"):
+            return jsonify({"error": "Missing 'query' in request body"}), 400
+        institution_id = data.get("institution_id")
+        if institution_id is None or not str(institution_id).strip():
+            return jsonify({"error": "Missing 'institution_id' in request body"}), 400
+
+        k = data.get("k", 10)
+        if isinstance(k, str) and k.strip().isdigit():
+            k = int(k)
+        if isinstance(k, bool) or not isinstance(k, int):
+            return jsonify({"error": "'k' must be an integer"}), 400
+        k = max(1, min(k, 100))
+
+        model = get_sentence_model()
+        query_embedding = model.encode(data["query"])
+
+        index = get_transcript_index(
+            dim=len(query_embedding), model_key=sentence_model_key()
+        )
+        results = index.search(query_embedding, institution_id, k=k)
+
+        return jsonify({"results": results}), 200
+
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to search transcripts",
+            "details": str(e)
+        }), 500
+
+@flask_app.route("/rescore", methods=["POST"])
+def rescore_sessions():
+    """
+    Recompute audio/video scores from stored raw features with new weights
+    Expects: { "feature_ids": ["..."], "weights": { "clarity": { "pause": 0.5 }, ... } }
+    Returns: { "results": { feature_id: { "audio", "video" } }, "errors": { feature_id: "..." } }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("feature_ids"), list):
+            return jsonify({"error": "Missing 'feature_ids' list in request body"}), 400
+
+        return jsonify(rescore(data["feature_ids"], data.get("weights"))), 200
+
+    except ValueError as e:
+        return jsonify({"error": "Invalid weights", "details": str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to rescore sessions",
+            "details": str(e)
+        }), 500
+
+@flask_app.route("/aggregate_reports", methods=["POST"])
+def aggregate_reports():
+    """
+    Bulk statistics over many session reports (institution dashboards)
+    Expects: { "sessions": [report or stored analysis, ...], "cohort_key": "subject",
+               "percentiles": [10, 50, 90], "trend_period_days": 7 }
+    Each session needs "teacher_id" (or "userId") and optionally "created_at" / "createdAt".
+    Returns: { "summary", "teachers", "trend", "minute_profile", "within_session", "cohorts" }
+    """
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("sessions"), list):
+            return jsonify({"error": "Missing 'sessions' list in request body"}), 400
+
+        percentiles = data.get("percentiles") or DEFAULT_PERCENTILES
+        if not isinstance(percentiles, (list, tuple)) or not all(
+            isinstance(q, (int, float)) and not isinstance(q, bool) and 0 <= q <= 100 for q in percentiles
+        ):
+            return jsonify({"error": "'percentiles' must be a list of numbers between 0 and 100"}), 400
+
+        period = data.get("trend_period_days", 7)
+        if isinstance(period, str) and period.strip().isdigit():
+            period = int(period)
+        if isinstance(period, bool) or not isinstance(period, int) or period < 1:
+            return jsonify({"error": "'trend_period_days' must be a positive integer"}), 400
+
+        result = aggregate_sessions(
+            data["sessions"],
+            cohort_key=data.get("cohort_key"),
+            percentiles=percentiles,
+            trend_period_days=period
+        )
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to aggregate reports",
+            "details": str(e)
+        }), 500
+
+@flask_app.route("/analyze", methods=["POST"])
+def analyze_video():
+    """
+    Run the analysis pipeline on an uploaded video (multi-worker serving)
+    Expects: multipart form with "video" file; optional "topic_name", "language",
+             "institution_id", "preview" ("true"/"false")
+    Returns: report JSON; 503 when this worker is already at its job limit
+    """
+    video_path = None
+    try:
+        with job_limiter.slot():
+            upload = request.files.get("video")
+            if not upload or not upload.filename:
+                return jsonify({"error": "Missing 'video' file in form data"}), 400
+
+            suffix = os.path.splitext(upload.filename)[1] or ".mp4"
+            fd, video_path = tempfile.mkstemp(suffix=suffix, dir=AUDIO_CACHE_DIR)
+            os.close(fd)
+            upload.save(video_path)
+
+            report = process_session(
+                video_path,
+                topic_name=request.form.get("topic_name", "General"),
+                language=request.form.get("language") or None,
+                institution_id=request.form.get("institution_id") or None,
+                preview=request.form.get("preview", "false").lower() in ("1", "true")
+            )
+            if not report:
+                return jsonify({"error": "Analysis failed"}), 500
+            return jsonify(report), 200
+
+    except WorkerBusy as e:
+        return jsonify({"error": "Worker busy", "details": str(e)}), 503, {"Retry-After": "30"}
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to analyze video",
+            "details": str(e)
+        }), 500
+    finally:
+        if video_path and os.path.exists(video_path):
+            os.remove(video_path)
+
+def _live_session(session_id):
+    with live_lock:
+        return live_sessions.get(session_id, (None, None))
+
+@flask_app.route("/live/start", methods=["POST"])
+def live_start():
+    """
+    Open a live session on this worker
+    Expects: { "topic_name": "...", "language": "..." } (both optional)
+    Returns: { "session_id", "worker_pid" }; 503 when LIVE_MAX_SESSIONS are open
+    """
+    data = request.get_json(silent=True) or {}
+    now = time.time()
+    with live_lock:
+        for session_id in [k for k, (live, _) in live_sessions.items() if now - live.last_fed > LIVE_SESSION_IDLE_SEC]:
+            print(f"[LIVE] Dropping idle session {session_id}")
+            del live_sessions[session_id]
+        if len(live_sessions) >= LIVE_MAX_SESSIONS:
+            return jsonify({"error": "Too many live sessions", "details": f"{len(live_sessions)} open on this worker"}), 503, {"Retry-After": "30"}
+
+        session_id = uuid.uuid4().hex
+        live_sessions[session_id] = (
+            LiveSession(session_id, data.get("topic_name") or "General", language=data.get("language") or None),
+            threading.Lock()
+        )
+    return jsonify({"session_id": session_id, "worker_pid": os.getpid()}), 201
+
+@flask_app.route("/live/<session_id>/chunk", methods=["POST"])
+def live_chunk(session_id):
+    """
+    Analyse the next chunk of a live recording (chunks in recording order, one at a time)
+    Expects: multipart form with "chunk" file (e.g. a recorder segment)
+    Returns: { "events": [partial events of completed minutes], "snapshot": scores so far };
+             404 unknown session, 409 while another chunk of it is processed
+    """
+    live, lock = _live_session(session_id)
+    if live is None:
+        return jsonify({"error": "Unknown live session", "details": f"Not open on worker {os.getpid()}"}), 404
+    upload = request.files.get("chunk")
+    if not upload or not upload.filename:
+        return jsonify({"error": "Missing 'chunk' file in form data"}), 400
+    if not lock.acquire(blocking=False):
+        return jsonify({"error": "Previous chunk still processing"}), 409
+
+    chunk_path = None
+    try:
+        with job_limiter.slot():
+            suffix = os.path.splitext(upload.filename)[1] or ".mp4"
+            fd, chunk_path = tempfile.mkstemp(suffix=suffix, dir=AUDIO_CACHE_DIR)
+            os.close(fd)
+            upload.save(chunk_path)
+
+            events = live.feed(chunk_path)
+            return jsonify({"events": events, "snapshot": live.snapshot()}), 200
+
+    except WorkerBusy as e:
+        return jsonify({"error": "Worker busy", "details": str(e)}), 503, {"Retry-After": "30"}
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to analyze chunk",
+            "details": str(e)
+        }), 500
+    finally:
+        lock.release()
+        if chunk_path and os.path.exists(chunk_path):
+            os.remove(chunk_path)
+
+@flask_app.route("/live/<session_id>/finalize", methods=["POST"])
+def live_finalize(session_id):
+    """
+    Score the trailing partial minutes and close the session
+    Returns: report JSON (same shape as /analyze, metadata.mode "live")
+    """
+    live, lock = _live_session(session_id)
+    if live is None:
+        return jsonify({"error": "Unknown live session", "details": f"Not open on worker {os.getpid()}"}), 404
+    if not live.chunks:
+        return jsonify({"error": "No chunks received for this live session"}), 400
+    if not lock.acquire(blocking=False):
+        return jsonify({"error": "Previous chunk still processing"}), 409
+
+    try:
+        with job_limiter.slot():
+            report = live.finalize()
+        with live_lock:
+            live_sessions.pop(session_id, None)
+        return jsonify(report), 200
+
+    except WorkerBusy as e:
+        return jsonify({"error": "Worker busy", "details": str(e)}), 503, {"Retry-After": "30"}
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to finalize live session",
+            "details": str(e)
+        }), 500
+    finally:
+        lock.release()
+
+@flask_app.route("/worker_stats", methods=["GET"])
+def worker_stats():
+    """Memory footprint (MB: rss / pss / shared / private / peak_rss) and job counters of this worker"""
+    return jsonify({
+        "pid": os.getpid(),
+        "memory_mb": memory_footprint(),
+        "jobs": job_limiter.stats()
+    }), 200
@@ -0,0 +1,21 @@
+# Gunicorn settings for multi-worker serving: gunicorn -c gunicorn.conf.py serve:app
+import os
+from config.settings import ANALYSIS_WORKERS, SERVE_THREADS, SERVE_PORT, SERVE_PRELOAD
+from src.serving import memory_footprint, format_footprint
+
+bind = f"0.0.0.0:{SERVE_PORT}"
+workers = ANALYSIS_WORKERS
+worker_class = "gthread"
+threads = SERVE_THREADS          # light endpoints keep answering while analyses run
+preload_app = SERVE_PRELOAD      # import serve.py (and load models) before forking
+timeout = 120                    # heartbeat timeout; gthread workers beat while requests run
+graceful_timeout = 600           # let running analyses finish on reload / shutdown
+
+
+def when_ready(server):
+    server.log.info(f"[SERVE] Master ready | {format_footprint(memory_footprint())}")
+
+
+def post_fork(server, worker):
+    # Right after fork every page is still shared with the master
+    server.log.info(f"[SERVE] Worker {os.getpid()} started | {format_footprint(memory_footprint())}")
@@ -0,0 +1,23 @@
+"""
+WSGI entry point for multi-worker serving of the Flask API:
+
+    gunicorn -c gunicorn.conf.py serve:app
+
+With SERVE_PRELOAD (default) gunicorn imports this module once in the master,
+so the models below are loaded before the workers are forked and shared
+copy-on-write between them.
+
+Serves the Flask API only (flask_api.py). The Gradio UI and its
+/analyze_session* endpoints are not available in this mode: Gradio's
+queue/event stream keeps per-session state in one process, so it cannot be
+spread across forked workers. Run `python app.py` for the UI, and point
+clients of the pre-fork deployment at POST /analyze.
+"""
+from flask_api import flask_app
+from config.settings import SERVE_PRELOAD
+from src.serving import preload_models
+
+if SERVE_PRELOAD:
+    preload_models()
+
+app = flask_app
@@ -0,0 +1,364 @@
+"""
+Vectorized bulk aggregation of many session reports (institution dashboards).
+
+Reports are loaded once into columnar NumPy arrays:
+- session level: one row per session, one column per overall metric
+- minute level: per-minute scores of all sessions concatenated, with the
+  owning session index alongside (ragged data without Python lists)
+
+Every statistic is then computed per column with grouped reductions
+(np.bincount / sorted offsets) instead of per-session loops.
+"""
+from datetime import datetime, timezone
+from operator import itemgetter
+import numpy as np
+
+# metric → (path in a model report, field of a stored analysis document)
+SESSION_METRICS = {
+    "clarity_score": (("audio", "overall", "clarity_score"), "clarityScore"),
+    "confidence_score": (("audio", "overall", "confidence_score"), "confidenceScore"),
+    "engagement_score": (("video", "overall", "engagement_score"), "engagementScore"),
+    "gesture_index": (("video", "overall", "gesture_index"), "gestureIndex"),
+    "video_confidence_score": (("video", "overall", "confidence_score"), "videoConfidenceScore"),
+    "technical_depth": (("text", "technical_depth"), "technicalDepth"),
+    "interaction_index": (("text", "interaction_index"), "interactionIndex"),
+}
+
+# per-minute metric → (stream, key in the per-minute dict)
+MINUTE_METRICS = {
+    "clarity_score": ("audio", "clarity_score"),
+    "confidence_score": ("audio", "confidence_score"),
+    "engagement_score": ("video", "engagement_score"),
+    "gesture_index": ("video", "gesture_index"),
+}
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+MAX_PROFILE_MINUTES = 180
+SECONDS_PER_DAY = 86400.0
+
+
+# --------------------------------------------------
+# Loading (the only per-session Python loop)
+# --------------------------------------------------
+def _number(value):
+    """The one coercion rule (also what the fast column path applies): float() or NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _timestamp(value):
+    """Epoch seconds from epoch s/ms or an ISO-8601 string (NaN if missing)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return np.nan
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    if isinstance(value, dict) and "$date" in value:   # Mongo extended JSON
+        return _timestamp(value["$date"])
+    return np.nan
+
+
+def _per_minute(session, stream):
+    scores = session.get("scores")
+    if isinstance(scores, dict):
+        node = scores.get(stream)
+        minutes = node.get("per_minute") if isinstance(node, dict) else None
+    else:
+        minutes = session.get(f"{stream}PerMinute")
+    return minutes if isinstance(minutes, list) else []
+
+
+def _column(rows, key):
+    """
+    Float array of rows[i][key], coerced like _number. Malformed rows (None,
+    numbers, ...) become NaN, which every statistic skips.
+    """
+    try:
+        # itemgetter runs the per-row lookup in C (most of the load time)
+        return np.fromiter(map(itemgetter(key), rows), dtype=np.float64, count=len(rows))
+    except (KeyError, IndexError, TypeError, ValueError):
+        # Missing keys, malformed rows or values: slow, forgiving path
+        return np.array([
+            _number(r.get(key)) if isinstance(r, dict) else np.nan for r in rows
+        ], dtype=np.float64)
+
+
+def load_sessions(sessions, cohort_key=None):
+    """Columnar arrays for a list of reports / stored analyses."""
+    n = len(sessions)
+    values = np.full((n, len(SESSION_METRICS)), np.nan)
+    times = np.full(n, np.nan)
+    teachers = []
+    cohorts = []
+
+    rows = {"audio": [], "video": []}
+    lengths = {"audio": np.zeros(n, dtype=np.int64), "video": np.zeros(n, dtype=np.int64)}
+
+    for i, s in enumerate(sessions):
+        if not isinstance(s, dict):
+            s = {}
+        scores = s.get("scores")
+        for j, (path, field) in enumerate(SESSION_METRICS.values()):
+            if isinstance(scores, dict):
+                node = scores
+                for key in path:
+                    node = node.get(key) if isinstance(node, dict) else None
+                values[i, j] = _number(node)
+            else:
+                values[i, j] = _number(s.get(field))
+
+        times[i] = _timestamp(s.get("created_at", s.get("createdAt")))
+        teachers.append(str(s.get("teacher_id", s.get("userId", "unknown"))))
+        if cohort_key:
+            cohorts.append(str(s.get(cohort_key, "unknown")))
+
+        for stream in ("audio", "video"):
+            minutes = _per_minute(s, stream)
+            rows[stream].extend(minutes)
+            lengths[stream][i] = len(minutes)
+
+    teacher_ids, teacher_codes = np.unique(np.array(teachers, dtype=str), return_inverse=True)
+    data = {
+        "values": values,
+        "times": times,
+        "teacher_ids": teacher_ids,
+        "teacher_codes": teacher_codes.reshape(-1),
+        "minutes": {}
+    }
+    if cohort_key:
+        cohort_ids, cohort_codes = np.unique(np.array(cohorts, dtype=str), return_inverse=True)
+        data["cohort_ids"] = cohort_ids
+        data["cohort_codes"] = cohort_codes.reshape(-1)
+
+    # Ragged per-minute data: one flat column per metric + owning session index
+    owner = {stream: np.repeat(np.arange(n), lengths[stream]) for stream in rows}
+    minute = {stream: _column(rows[stream], "minute") for stream in rows}
+    for metric, (stream, key) in MINUTE_METRICS.items():
+        data["minutes"][metric] = (owner[stream], minute[stream], _column(rows[stream], key))
+    return data
+
+
+# --------------------------------------------------
+# Grouped reductions
+# --------------------------------------------------
+def _group_moments(codes, values, n_groups):
+    """count, mean, std per group, ignoring NaN."""
+    valid = ~np.isnan(values)
+    c, v = codes[valid], values[valid]
+    count = np.bincount(c, minlength=n_groups)
+    total = np.bincount(c, weights=v, minlength=n_groups)
+    squares = np.bincount(c, weights=v * v, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        std = np.sqrt(np.maximum(squares / count - mean ** 2, 0.0))
+    return count, mean, std
+
+
+def _group_percentiles(codes, values, n_groups, percentiles):
+    """(len(percentiles), n_groups) linear-interpolated percentiles, ignoring NaN."""
+    out = np.full((len(percentiles), n_groups), np.nan)
+    valid = ~np.isnan(values)
+    c, v = codes[valid], values[valid]
+    if len(v) == 0:
+        return out
+
+    order = np.lexsort((v, c))
+    v = v[order]
+    count = np.bincount(c, minlength=n_groups)
+    start = np.concatenate([[0], np.cumsum(count)[:-1]])
+    has = count > 0
+
+    for row, q in enumerate(percentiles):
+        pos = start + (count - 1) * (q / 100.0)
+        lo = np.clip(np.floor(pos).astype(np.int64), 0, len(v) - 1)
+        hi = np.clip(np.ceil(pos).astype(np.int64), 0, len(v) - 1)
+        frac = pos - np.floor(pos)
+        out[row, has] = (v[lo] * (1 - frac) + v[hi] * frac)[has]
+    return out
+
+
+def _group_slopes(codes, x, y, n_groups):
+    """Least-squares slope of y over x per group (NaN with < 2 distinct x)."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    c, x, y = codes[valid], x[valid], y[valid]
+    n = np.bincount(c, minlength=n_groups)
+    sx = np.bincount(c, weights=x, minlength=n_groups)
+    sy = np.bincount(c, weights=y, minlength=n_groups)
+    sxx = np.bincount(c, weights=x * x, minlength=n_groups)
+    sxy = np.bincount(c, weights=x * y, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = sxx - sx * sx / n
+        slope = (sxy - sx * sy / n) / var
+    return np.where((n >= 2) & (var > 1e-9), slope, np.nan)
+
+
+def _r(value):
+    value = float(value)
+    return None if np.isnan(value) else round(value, 2)
+
+
+# --------------------------------------------------
+# Aggregation
+# --------------------------------------------------
+def aggregate_sessions(sessions, cohort_key=None, percentiles=DEFAULT_PERCENTILES,
+                       trend_period_days=7):
+    """
+    Institution-level summary of many sessions:
+    - summary: count / mean / std / percentiles per metric
+    - teachers: per-teacher distribution + trend (change per 30 days)
+    - trend: mean per metric per period (trend_period_days)
+    - minute_profile / within_session: how scores evolve inside a class
+    - cohorts: per-cohort means, delta vs all sessions, effect size vs the rest
+    """
+    data = load_sessions(sessions, cohort_key)
+    values, times = data["values"], data["times"]
+    n_sessions = len(values)
+    metrics = list(SESSION_METRICS)
+    percentiles = [float(q) for q in percentiles]
+
+    result = {
+        "sessions": n_sessions,
+        "metrics": metrics,
+        "percentiles": percentiles,
+        "summary": {},
+        "teachers": {},
+        "trend": {"period_days": trend_period_days, "periods": []},
+        "minute_profile": {},
+        "within_session": {}
+    }
+    if n_sessions == 0:
+        return result
+
+    # ---------------- Institution-wide distribution ----------------
+    all_codes = np.zeros(n_sessions, dtype=np.int64)
+    for j, metric in enumerate(metrics):
+        count, mean, std = _group_moments(all_codes, values[:, j], 1)
+        pct = _group_percentiles(all_codes, values[:, j], 1, percentiles)[:, 0]
+        result["summary"][metric] = {
+            "count": int(count[0]),
+            "mean": _r(mean[0]),
+            "std": _r(std[0]),
+            **{f"p{q:g}": _r(v) for q, v in zip(percentiles, pct)}
+        }
+
+    # ---------------- Per teacher ----------------
+    codes, teacher_ids = data["teacher_codes"], data["teacher_ids"]
+    n_teachers = len(teacher_ids)
+    days = (times - np.nanmin(times)) / SECONDS_PER_DAY if np.isfinite(times).any() else times
+    sessions_per_teacher = np.bincount(codes, minlength=n_teachers)
+
+    teacher_stats = {}
+    for j, metric in enumerate(metrics):
+        count, mean, std = _group_moments(codes, values[:, j], n_teachers)
+        p25, p50, p75 = _group_percentiles(codes, values[:, j], n_teachers, (25, 50, 75))
+        slope = _group_slopes(codes, days, values[:, j], n_teachers) * 30
+        teacher_stats[metric] = np.stack([mean, std, p25, p50, p75, slope])
+
+    for t, teacher_id in enumerate(teacher_ids):
+        result["teachers"][str(teacher_id)] = {
+            "sessions": int(sessions_per_teacher[t]),
+            "metrics": {
+                metric: dict(zip(
+                    ("mean", "std", "p25", "median", "p75", "trend_per_30d"),
+                    (_r(v) for v in stats[:, t])
+                ))
+                for metric, stats in teacher_stats.items()
+            }
+        }
+
+    # ---------------- Trend over time ----------------
+    dated = np.isfinite(days)
+    if dated.any() and trend_period_days:
+        period = np.floor(days[dated] / trend_period_days).astype(np.int64)
+        n_periods = int(period.max()) + 1
+        origin = np.nanmin(times)
+        counts = np.bincount(period, minlength=n_periods)
+        means = [
+            _group_moments(period, values[dated, j], n_periods)[1]
+            for j in range(len(metrics))
+        ]
+        for p in np.flatnonzero(counts):
+            start = datetime.fromtimestamp(origin + p * trend_period_days * SECONDS_PER_DAY, timezone.utc)
+            result["trend"]["periods"].append({
+                "start": start.isoformat(),
+                "sessions": int(counts[p]),
+                **{metric: _r(means[j][p]) for j, metric in enumerate(metrics)}
+            })
+
+    # ---------------- Inside the class ----------------
+    for metric, (session_idx, minute, vals) in data["minutes"].items():
+        in_range = np.nan_to_num(minute, nan=-1) >= 0
+        capped = np.minimum(np.nan_to_num(minute, nan=0), MAX_PROFILE_MINUTES - 1).astype(np.int64)
+        profile = _group_moments(capped[in_range], vals[in_range], MAX_PROFILE_MINUTES)[1]
+        last = np.flatnonzero(~np.isnan(profile))
+        result["minute_profile"][metric] = [
+            _r(v) for v in profile[:last[-1] + 1]
+        ] if len(last) else []
+
+        slopes = _group_slopes(session_idx, minute, vals, n_sessions)
+        slopes = slopes[~np.isnan(slopes)]
+        result["within_session"][metric] = {
+            "sessions": int(len(slopes)),
+            "median_slope_per_min": _r(np.median(slopes)) if len(slopes) else None,
+            "declining_share": _r(np.mean(slopes < 0)) if len(slopes) else None
+        }
+
+    # ---------------- Cohorts ----------------
+    if cohort_key:
+        result["cohorts"] = _compare_cohorts(data, metrics, cohort_key)
+
+    return result
+
+
+def _compare_cohorts(data, metrics, cohort_key):
+    values = data["values"]
+    codes, cohort_ids = data["cohort_codes"], data["cohort_ids"]
+    n_cohorts = len(cohort_ids)
+    sessions_per_cohort = np.bincount(codes, minlength=n_cohorts)
+
+    stats = {}
+    for j, metric in enumerate(metrics):
+        col = values[:, j]
+        count, mean, std = _group_moments(codes, col, n_cohorts)
+        median = _group_percentiles(codes, col, n_cohorts, (50,))[0]
+
+        # Everyone else, from the totals minus the cohort (no extra pass)
+        valid = ~np.isnan(col)
+        n_all, sum_all, sq_all = valid.sum(), col[valid].sum(), (col[valid] ** 2).sum()
+        n_rest = n_all - count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_rest = (sum_all - mean * count) / n_rest
+            sq_rest = sq_all - (std ** 2 + mean ** 2) * count
+            var_rest = np.maximum(sq_rest / n_rest - mean_rest ** 2, 0.0)
+            # Pooled sample std (Cohen's d): n * population variance = (n - 1) * sample variance
+            pooled = np.sqrt((count * std ** 2 + n_rest * var_rest) / (count + n_rest - 2))
+            effect = (mean - mean_rest) / pooled
+        overall_mean = sum_all / n_all if n_all else np.nan
+
+        stats[metric] = (mean, median, mean - overall_mean, np.where(pooled > 1e-9, effect, np.nan))
+
+    return {
+        "key": cohort_key,
+        "groups": {
+            str(cohort_id): {
+                "sessions": int(sessions_per_cohort[c]),
+                "metrics": {
+                    metric: {
+                        "mean": _r(mean[c]),
+                        "median": _r(median[c]),
+                        "delta_vs_all": _r(delta[c]),
+                        "effect_size": _r(effect[c])
+                    }
+                    for metric, (mean, median, delta, effect) in stats.items()
+                }
+            }
+            for c, cohort_id in enumerate(cohort_ids)
+        }
+    }
@@ -0,0 +1,131 @@
+"""
+ASR policy layer for Whisper.
+
+- model size: ASR_MAX_MODEL; with ASR_LATENCY_TARGET_SEC set (opt-in), the
+  largest size whose estimated runtime fits the target for the audio duration
+  (downgrades are logged and recorded in the plan); "tiny" for previews
+- threads: torch intra-op threads pinned per worker (and per concurrent job
+  within a worker) so jobs sharing a box don't oversubscribe cores
+- language: a known institution language is passed to Whisper, which skips
+  its language-detection pass
+"""
+import os
+import threading
+import torch
+from whisper.audio import load_audio, SAMPLE_RATE
+from whisper.tokenizer import LANGUAGES, TO_LANGUAGE_CODE
+from config.settings import (
+    WHISPER_MODEL_LADDER,
+    WHISPER_PREVIEW_MODEL,
+    ASR_MAX_MODEL,
+    ASR_LATENCY_TARGET_SEC,
+    ASR_REALTIME_FACTORS,
+    ASR_REFERENCE_THREADS,
+    ANALYSIS_WORKERS,
+    TORCH_THREADS,
+    SERVE_WORKER_CONCURRENCY,
+)
+
+_THREADS_CONFIGURED = None
+_THREAD_LOCK = threading.Lock()
+
+
+# --------------------------------------------------
+# Threads
+# --------------------------------------------------
+def configure_torch_threads(threads=None):
+    """Pin torch intra-op threads once per process; returns the thread count."""
+    global _THREADS_CONFIGURED
+
+    with _THREAD_LOCK:
+        if _THREADS_CONFIGURED is not None:
+            return _THREADS_CONFIGURED
+
+        # Each concurrent job runs its own intra-op thread team
+        jobs = max(1, ANALYSIS_WORKERS) * max(1, SERVE_WORKER_CONCURRENCY)
+        n = threads or TORCH_THREADS or max(1, (os.cpu_count() or 1) // jobs)
+        torch.set_num_threads(n)
+        try:
+            # Only allowed before any inter-op work has started
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+        print(f"[ASR] torch threads pinned to {n} ({ANALYSIS_WORKERS} worker(s) x "
+              f"{SERVE_WORKER_CONCURRENCY} job(s))")
+        _THREADS_CONFIGURED = n
+        return n
+
+
+# --------------------------------------------------
+# Model size
+# --------------------------------------------------
+def estimate_transcribe_sec(model_size, duration_sec, threads):
+    rtf = ASR_REALTIME_FACTORS.get(model_size, ASR_REALTIME_FACTORS["medium"])
+    return duration_sec * rtf * ASR_REFERENCE_THREADS / max(1, threads)
+
+
+def select_model_size(duration_sec, threads, latency_target_sec=ASR_LATENCY_TARGET_SEC, preview=False):
+    if preview:
+        return WHISPER_PREVIEW_MODEL
+
+    ladder = list(WHISPER_MODEL_LADDER)
+    if ASR_MAX_MODEL not in ladder:
+        return ASR_MAX_MODEL
+    ladder = ladder[:ladder.index(ASR_MAX_MODEL) + 1]
+    if not latency_target_sec:
+        return ASR_MAX_MODEL
+
+    for size in reversed(ladder):
+        if estimate_transcribe_sec(size, duration_sec, threads) <= latency_target_sec:
+            return size
+
+    return ladder[0]
+
+
+# --------------------------------------------------
+# Language hint
+# --------------------------------------------------
+def resolve_language(language):
+    """Map "English" / "en" / "hindi" to a Whisper language code; None = auto-detect."""
+    if not language:
+        return None
+
+    lang = str(language).strip().lower()
+    if lang in LANGUAGES:
+        return lang
+    return TO_LANGUAGE_CODE.get(lang)
+
+
+# --------------------------------------------------
+# Plan
+# --------------------------------------------------
+def load_asr_audio(audio):
+    """Path → 16 kHz mono float32 samples, decoded the way Whisper decodes (ffmpeg: wav, mp3, m4a, ...)."""
+    return load_audio(audio) if isinstance(audio, str) else audio
+
+
+def plan_asr(audio, language=None, preview=False, latency_target_sec=ASR_LATENCY_TARGET_SEC):
+    """`audio`: decoded samples from load_asr_audio (or a path, decoded here)."""
+    threads = configure_torch_threads()
+    duration = len(load_asr_audio(audio)) / SAMPLE_RATE
+    model_size = select_model_size(duration, threads, latency_target_sec, preview)
+    downgraded = not preview and model_size != ASR_MAX_MODEL
+    if downgraded:
+        print(f"[ASR] Downgrading Whisper {ASR_MAX_MODEL} → {model_size}: {duration / 60:.0f} min of audio "
+              f"would exceed the {latency_target_sec:.0f}s latency target on {threads} thread(s)")
+
+    plan = {
+        "model_size": model_size,
+        "max_model": ASR_MAX_MODEL,
+        "downgraded": downgraded,
+        "language": resolve_language(language),
+        "language_hint": language,
+        "threads": threads,
+        "duration_sec": round(duration, 2),
+        "latency_target_sec": latency_target_sec,
+        "estimated_sec": round(estimate_transcribe_sec(model_size, duration, threads), 2),
+        "preview": preview
+    }
+    print(f"[ASR] Plan: {plan}")
+    return plan
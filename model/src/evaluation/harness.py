@@ -0,0 +1,306 @@
+"""
+Accuracy-versus-speed harness for fast modes.
+
+Each mode is a set of environment overrides (read by config/settings.py) and
+process_session keyword arguments, plus per-metric tolerances. The reference
+and every mode run in a fresh subprocess, so settings, model caches and peak
+memory (ru_maxrss) are isolated per run.
+
+Mode file (JSON), e.g.:
+    {
+      "int8": {"env": {"INFERENCE_BACKEND": "int8"},
+               "tolerance": {"technical_depth": 3.0, "wer": 0.15}},
+      "preview": {"kwargs": {"preview": true},
+                  "tolerance": {"clarity_score": 8.0, "engagement_score": 8.0}}
+    }
+Tolerances are maximum absolute deltas vs the reference (WER: maximum WER
+against the reference transcript). A declared metric that cannot be compared
+(missing from either report) counts as a violation. A run that exits
+non-zero or exceeds RUN_TIMEOUT_SEC is recorded as failed (with the tail of
+its stderr) and the remaining modes still run.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from src.evaluation.metrics import word_error_rate
+
+try:
+    import resource
+except ImportError:  # Windows: no peak-RSS measurement
+    resource = None
+
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# metric → (report stream, key)
+METRICS = {
+    "clarity_score": ("audio", "clarity_score"),
+    "engagement_score": ("video", "engagement_score"),
+    "gesture_index": ("video", "gesture_index"),
+    "technical_depth": ("text", "technical_depth"),
+}
+
+# Every run: no side effects on the search index / feature store
+RUN_ENV = {"TRANSCRIPT_INDEX_ENABLED": "false", "FEATURE_STORE_ENABLED": "false"}
+# Reference run: stock settings regardless of the caller's environment
+REFERENCE_ENV = {"ADAPTIVE_SAMPLING": "false", "INFERENCE_BACKEND": "fp32"}
+# Per isolated run; a hung model download or decode must not stall the sweep
+RUN_TIMEOUT_SEC = 3600
+STDERR_TAIL_LINES = 20
+
+FAST_MODES = {
+    "adaptive_sampling": {
+        "env": {"ADAPTIVE_SAMPLING": "true"},
+        "tolerance": {"engagement_score": 5.0, "gesture_index": 5.0}
+    },
+    "int8": {
+        "env": {"INFERENCE_BACKEND": "int8"},
+        "tolerance": {"technical_depth": 3.0, "wer": 0.15}
+    },
+    "onnx": {
+        "env": {"INFERENCE_BACKEND": "onnx"},
+        "tolerance": {"technical_depth": 3.0, "wer": 0.15}
+    },
+    "preview": {
+        "kwargs": {"preview": True},
+        "tolerance": {"clarity_score": 8.0, "engagement_score": 8.0, "gesture_index": 5.0}
+    }
+}
+
+
+def load_modes(path=None):
+    if not path:
+        return FAST_MODES
+    with open(path, "r", encoding="utf-8") as f:
+        modes = json.load(f)
+    for name, mode in modes.items():
+        unknown = set(mode.get("tolerance", {})) - set(METRICS) - {"wer"}
+        if unknown:
+            raise ValueError(f"Mode '{name}': unknown tolerance metrics {sorted(unknown)}")
+    return modes
+
+
+# --------------------------------------------------
+# Synthetic corpus
+# --------------------------------------------------
+def make_synthetic_video(path, minutes=2, fps=15, size=(320, 240), seed=0):
+    """
+    Moving shapes over a static background (alternating still / active
+    stretches) with a speech-like audio track: tone bursts separated by pauses.
+    The active share, speaking share and loudness drift from minute to minute
+    (random walks), so per-minute scores vary over the session like a lecture.
+    Needs ffmpeg (moviepy's binary) to mux audio and video.
+    """
+    import cv2
+    import soundfile as sf
+    from moviepy.config import get_setting
+
+    rng = np.random.default_rng(seed)
+    tmp_dir = tempfile.mkdtemp(prefix="synthetic_")
+    video_tmp = os.path.join(tmp_dir, "video.avi")
+    audio_tmp = os.path.join(tmp_dir, "audio.wav")
+
+    n_minutes = int(np.ceil(minutes))
+    active_share = np.clip(0.5 + np.cumsum(rng.normal(0, 0.15, n_minutes)), 0.05, 0.95)
+    speaking_share = np.clip(0.7 + np.cumsum(rng.normal(0, 0.08, n_minutes)), 0.2, 0.95)
+    loudness = np.clip(0.3 + np.cumsum(rng.normal(0, 0.04, n_minutes)), 0.08, 0.6)
+
+    w, h = size
+    writer = cv2.VideoWriter(video_tmp, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    background = rng.integers(0, 80, (h, w, 3), dtype=np.uint8)
+    x, y, vx, vy = w // 2, h // 2, 3, 2
+    for i in range(int(minutes * 60 * fps)):
+        frame = background.copy()
+        # Active for the first active_share of every 20 s cycle
+        active = (i % (fps * 20)) < active_share[i // (fps * 60)] * fps * 20
+        if active:
+            x, y = (x + vx) % w, (y + vy) % h
+        cv2.circle(frame, (int(x), int(y)), 30, (200, 180, 160), -1)
+        writer.write(frame)
+    writer.release()
+
+    sr = 16000
+    t = np.arange(int(minutes * 60 * sr)) / sr
+    minute = (t // 60).astype(int)
+    voice = np.sin(2 * np.pi * 180 * t) * 0.3 + np.sin(2 * np.pi * 360 * t) * 0.1
+    # sin > cos(pi * p) for a share p of the time
+    speaking = (np.sin(2 * np.pi * t / rng.uniform(3, 6)) > np.cos(np.pi * speaking_share[minute])).astype(np.float32)
+    noise = rng.normal(0, 0.01, len(t))
+    sf.write(audio_tmp, (voice * speaking * loudness[minute] / 0.3 + noise).astype(np.float32), sr)
+
+    subprocess.run(
+        [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+         "-i", video_tmp, "-i", audio_tmp, "-c:v", "copy", "-c:a", "pcm_s16le", path],
+        check=True
+    )
+    os.remove(video_tmp)
+    os.remove(audio_tmp)
+    os.rmdir(tmp_dir)
+    return path
+
+
+def synthetic_corpus(out_dir, count=2, minutes=2):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(out_dir, f"synthetic_{i}.mkv")
+        if not os.path.exists(path):
+            make_synthetic_video(path, minutes=minutes, seed=i)
+        paths.append(path)
+    return paths
+
+
+# --------------------------------------------------
+# Isolated runs
+# --------------------------------------------------
+def _tail(output):
+    if isinstance(output, bytes):
+        output = output.decode("utf-8", "replace")
+    return "\n".join((output or "").strip().splitlines()[-STDERR_TAIL_LINES:])
+
+
+def run_isolated(video_path, topic, env=None, kwargs=None, timeout=RUN_TIMEOUT_SEC):
+    """
+    process_session in a fresh interpreter →
+    {"status": "ok", "report", "wall_sec", "peak_rss_mb"}, or
+    {"status": "failed", "report": None, "error", "stderr"} when the run exits
+    non-zero or times out.
+    """
+    fd, out_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "src.evaluation.harness", video_path, topic,
+                 json.dumps(kwargs or {}), out_path],
+                cwd=MODEL_DIR,
+                env={**os.environ, **RUN_ENV, **(env or {})},
+                check=True,
+                timeout=timeout,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except subprocess.CalledProcessError as e:
+            return {"status": "failed", "report": None, "error": f"exit status {e.returncode}", "stderr": _tail(e.stderr)}
+        except subprocess.TimeoutExpired as e:
+            return {"status": "failed", "report": None, "error": f"timed out after {timeout} s", "stderr": _tail(e.stderr)}
+
+        with open(out_path, "r", encoding="utf-8") as f:
+            return {"status": "ok", **json.load(f)}
+    finally:
+        os.remove(out_path)
+
+
+def _worker(video_path, topic, kwargs_json, out_path):
+    from src.pipeline import process_session
+
+    start = time.perf_counter()
+    report = process_session(video_path, topic, **json.loads(kwargs_json))
+    wall_sec = time.perf_counter() - start
+
+    peak_mb = None
+    if resource:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"report": report, "wall_sec": round(wall_sec, 2), "peak_rss_mb": peak_mb}, f)
+
+
+# --------------------------------------------------
+# Comparison
+# --------------------------------------------------
+def _score(report, stream, key):
+    # audio / video: the overall score; text has no per-minute part
+    node = ((report or {}).get("scores") or {}).get(stream) or {}
+    return node.get("overall", node).get(key)
+
+
+def compare(reference, candidate):
+    """
+    Per-metric absolute deltas (None when either report lacks the metric) +
+    WER, always computed: an empty candidate transcript is WER 1.0.
+    """
+    deltas = {}
+    for metric, (stream, key) in METRICS.items():
+        ref = _score(reference["report"], stream, key)
+        got = _score(candidate["report"], stream, key)
+        deltas[metric] = round(abs(got - ref), 2) if ref is not None and got is not None else None
+
+    ref_text = (reference["report"] or {}).get("transcript") or ""
+    got_text = (candidate["report"] or {}).get("transcript") or ""
+    deltas["wer"] = word_error_rate(ref_text, got_text)
+    return deltas
+
+
+def violations(deltas, tolerance):
+    """Declared metrics over their tolerance, or missing (delta None: not comparable)."""
+    return {
+        metric: {"delta": deltas.get(metric), "tolerance": limit}
+        for metric, limit in tolerance.items()
+        if deltas.get(metric) is None or deltas[metric] > limit
+    }
+
+
+def _failed_row(video, name, run, reason):
+    print(f"[EVAL] {os.path.basename(video)}: {name} failed ({run['error']})")
+    return {
+        "video": os.path.basename(video),
+        "mode": name,
+        "status": "failed",
+        "error": run["error"],
+        "stderr": run.get("stderr", ""),
+        "violations": {reason: {"delta": None, "tolerance": None}},
+    }
+
+
+def evaluate(videos, modes, topic="General", timeout=RUN_TIMEOUT_SEC):
+    """
+    One row per (video, mode) with deltas, speedup, memory and violations.
+    Failed runs (crash, timeout, no report) become rows with status "failed";
+    when the reference fails, every mode of that video is marked failed.
+    """
+    rows = []
+    for video in videos:
+        print(f"[EVAL] {os.path.basename(video)}: reference")
+        reference = run_isolated(video, topic, REFERENCE_ENV, timeout=timeout)
+        if reference["status"] == "ok" and not reference["report"]:
+            reference = {**reference, "status": "failed", "error": "no report"}
+        if reference["status"] != "ok":
+            rows.extend(_failed_row(video, name, reference, "reference") for name in modes)
+            continue
+
+        for name, mode in modes.items():
+            print(f"[EVAL] {os.path.basename(video)}: {name}")
+            candidate = run_isolated(
+                video, topic, {**REFERENCE_ENV, **mode.get("env", {})}, mode.get("kwargs"), timeout=timeout
+            )
+            if candidate["status"] == "ok" and not candidate["report"]:
+                candidate = {**candidate, "status": "failed", "error": "no report"}
+            if candidate["status"] != "ok":
+                rows.append(_failed_row(video, name, candidate, "run"))
+                continue
+
+            deltas = compare(reference, candidate)
+            rows.append({
+                "video": os.path.basename(video),
+                "mode": name,
+                "status": "ok",
+                "deltas": deltas,
+                "reference_sec": reference["wall_sec"],
+                "mode_sec": candidate["wall_sec"],
+                "speedup": round(reference["wall_sec"] / candidate["wall_sec"], 2) if candidate["wall_sec"] else None,
+                "reference_peak_mb": reference["peak_rss_mb"],
+                "mode_peak_mb": candidate["peak_rss_mb"],
+                "violations": violations(deltas, mode.get("tolerance", {}))
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    _worker(*sys.argv[1:5])
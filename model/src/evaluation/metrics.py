@@ -0,0 +1,37 @@
+import re
+
+# --------------------------------------------------
+# Transcript accuracy
+# --------------------------------------------------
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def normalize_words(text):
+    """Lowercase word list with punctuation stripped (Whisper-style casing varies)."""
+    return _WORD_RE.findall((text or "").lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    WER = (substitutions + deletions + insertions) / reference words.
+    Returns 0.0 for two empty transcripts and 1.0 when only the reference is empty.
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Single-row Levenshtein over words
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        curr = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, start=1):
+            curr[j] = min(
+                prev[j] + 1,            # deletion
+                curr[j - 1] + 1,        # insertion
+                prev[j - 1] + (r != h)  # substitution
+            )
+        prev = curr
+
+    return round(prev[-1] / len(ref), 4)
@@ -0,0 +1,180 @@
+"""
+Raw per-window features of analysed sessions, one compressed .npz per report.
+
+Audio columns are per scored minute, video columns per sampled frame (with
+the number of frames each sample stands for), so per_minute / overall scores
+can be recomputed with new SCORING_WEIGHTS without decoding the media again.
+"""
+import json
+import os
+import re
+import time
+import numpy as np
+from config.settings import FEATURE_STORE_DIR
+from src.scoring import (
+    resolve_weights,
+    clarity_score,
+    audio_confidence_score,
+    engagement,
+    normalized_motion,
+    video_confidence_score,
+    aggregate_audio,
+    aggregate_video,
+)
+
+FEATURE_STORE_VERSION = 1
+FEATURE_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+AUDIO_COLUMNS = ("non_silent_ratio", "flatness_mean", "rms_mean", "rms_std")
+
+
+def _path(feature_id, store_dir):
+    if not FEATURE_ID_RE.fullmatch(str(feature_id)):
+        raise ValueError(f"Invalid feature id: {feature_id!r}")
+    return os.path.join(os.path.abspath(store_dir), f"{feature_id}.npz")
+
+
+# --------------------------------------------------
+# Save / load
+# --------------------------------------------------
+def save_features(feature_id, audio_features, video_features, session_id=None,
+                  store_dir=FEATURE_STORE_DIR):
+    """
+    audio_features: AudioAnalyzer.features (list of per-minute dicts)
+    video_features: VideoAnalyzer.features (dict of per-sample lists)
+    """
+    path = _path(feature_id, store_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    video_features = video_features or {}
+    emotions = video_features.get("emotions", {})
+
+    columns = {
+        "audio_minute": np.array([f["minute"] for f in audio_features], dtype=np.int32),
+        "audio_start_sec": np.array([f["start_sec"] for f in audio_features], dtype=np.float64),
+        "audio_end_sec": np.array([f["end_sec"] for f in audio_features], dtype=np.float64),
+        "audio_rms_frames": np.array([f["rms_frames"] for f in audio_features], dtype=np.int32),
+        "video_minute": np.asarray(video_features.get("minute", []), dtype=np.int32),
+        "video_weight": np.asarray(video_features.get("weight", []), dtype=np.int32),
+        "video_face_area": np.asarray(video_features.get("face_area", []), dtype=np.float64),
+        "video_face_found": np.asarray(video_features.get("face_found", []), dtype=bool),
+        "video_motion_raw": np.asarray(video_features.get("motion_raw", []), dtype=np.float64),
+        "video_emotion_minute": np.array(sorted(emotions), dtype=np.int32),
+        "video_emotion": np.array([emotions[m] for m in sorted(emotions)], dtype=np.str_),
+        "meta": np.array(json.dumps({
+            "version": FEATURE_STORE_VERSION,
+            "session_id": session_id,
+            "created_at": time.time()
+        }))
+    }
+    for name in AUDIO_COLUMNS:
+        columns[f"audio_{name}"] = np.array([f[name] for f in audio_features], dtype=np.float64)
+
+    # Write-then-rename so readers never see a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **columns)
+    os.replace(tmp, path)
+
+    print(f"[FEATURES] Saved {feature_id} ({len(audio_features)} audio minutes, "
+          f"{len(columns['video_minute'])} video samples)")
+    return path
+
+
+def load_features(feature_id, store_dir=FEATURE_STORE_DIR):
+    path = _path(feature_id, store_dir)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No stored features for {feature_id}")
+
+    with np.load(path) as data:
+        features = {name: data[name] for name in data.files}
+    features["meta"] = json.loads(str(features["meta"]))
+    return features
+
+
+# --------------------------------------------------
+# Re-scoring
+# --------------------------------------------------
+def _rescore_audio(f, w):
+    clarity = clarity_score(
+        f["audio_non_silent_ratio"], f["audio_flatness_mean"], f["audio_rms_std"], w["clarity"]
+    )
+    confidence = audio_confidence_score(
+        f["audio_rms_mean"], f["audio_rms_std"], f["audio_rms_frames"], w["audio_confidence"]
+    )
+
+    per_minute = [
+        {
+            "minute": int(f["audio_minute"][i]),
+            "start_sec": float(f["audio_start_sec"][i]),
+            "end_sec": float(f["audio_end_sec"][i]),
+            "clarity_score": round(float(clarity[i]), 2),
+            "confidence_score": round(float(confidence[i]), 2)
+        }
+        for i in range(len(f["audio_minute"]))
+    ]
+    return {"per_minute": per_minute, "overall": aggregate_audio(per_minute)}
+
+
+def _rescore_video(f, w):
+    if len(f["video_minute"]) == 0:
+        return {"per_minute": [], "overall": aggregate_video([])}
+
+    minutes, inv = np.unique(f["video_minute"], return_inverse=True)
+    weight = f["video_weight"].astype(np.float64)
+    found = f["video_face_found"]
+
+    total = np.bincount(inv, weights=weight)
+    engagement_sum = np.bincount(
+        inv, weights=engagement(f["video_face_area"], found, w["engagement"]) * weight
+    )
+
+    motion = normalized_motion(f["video_motion_raw"], weight)
+    has_motion = ~np.isnan(motion)
+    gesture_energy = np.bincount(inv, weights=np.where(has_motion, motion, 0.0) * weight)
+    moving = has_motion & (np.nan_to_num(motion) > w["video_confidence"]["motion_threshold"])
+    motion_detected = np.bincount(inv, weights=np.where(moving, weight, 0.0))
+    face_detected = np.bincount(inv, weights=np.where(found, weight, 0.0))
+
+    confidence = video_confidence_score(
+        face_detected / total, motion_detected / total, w["video_confidence"]
+    )
+    emotions = dict(zip(f["video_emotion_minute"].tolist(), f["video_emotion"].tolist()))
+
+    per_minute = [
+        {
+            "minute": int(minute),
+            "engagement_score": round(float(engagement_sum[i] / total[i] * 100), 2),
+            "gesture_index": round(float(gesture_energy[i] / total[i] * 100), 2),
+            "dominant_emotion": emotions.get(int(minute), "neutral"),
+            "confidence_score": round(float(confidence[i]), 2)
+        }
+        for i, minute in enumerate(minutes)
+    ]
+    return {"per_minute": per_minute, "overall": aggregate_video(per_minute)}
+
+
+def rescore_features(features, weights=None):
+    """Audio + video scores (report shape) from loaded features."""
+    w = resolve_weights(weights)
+    return {
+        "audio": _rescore_audio(features, w),
+        "video": _rescore_video(features, w)
+    }
+
+
+def rescore(feature_ids, weights=None, store_dir=FEATURE_STORE_DIR):
+    """
+    Batch re-scoring of stored sessions with a (partial) weight override.
+    Returns {"results": {feature_id: scores}, "errors": {feature_id: message}}.
+    """
+    resolve_weights(weights)  # bad weight configs fail before any file is read
+    results, errors = {}, {}
+
+    for feature_id in feature_ids:
+        try:
+            results[feature_id] = rescore_features(load_features(feature_id, store_dir), weights)
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            errors[feature_id] = str(e)
+
+    return {"results": results, "errors": errors}
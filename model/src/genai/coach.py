@@ -21,6 +21,17 @@ class ShikshaCoach:
                 print(f"WARNING: Failed to initialize GenerativeModel: {e}")
                 self.model = None
 
+        # Embedded report chunks per session, reused across chat turns; built on
+        # first chat, as it pulls in the embedding model stack (torch)
+        self._context_store = None
+
+    @property
+    def context_store(self):
+        if self._context_store is None:
+            from src.genai.context_store import ContextStore
+            self._context_store = ContextStore()
+        return self._context_store
+
     def _get_system_instruction(self):
         return (
             "You are an expert Pedagogical Coach and Technical Auditor for Shiksha Netra. "
@@ -92,16 +103,29 @@ class ShikshaCoach:
         except Exception as e:
             return f"ERROR: GenAI generation failed: {e}"
 
-    def chat_with_coach(self, query, context_history):
-
+    def chat_with_coach(self, query, context_history, session_id=None):
+        """
+        context_history: the session report (dict) or pre-built context (str).
+        For reports, only a score summary plus the transcript / per-minute
+        chunks most relevant to `query` are sent, within a token budget.
+        """
         if not self.model:
             return "I'm sorry, I cannot answer that right now because my brain (LLM) is not connected."
 
+        if isinstance(context_history, dict):
+            try:
+                context = self.context_store.get(context_history, session_id).build_context(query)
+            except Exception as e:
+                print(f"WARNING: Context retrieval failed, sending full report: {e}")
+                context = json.dumps(context_history)
+        else:
+            context = context_history
+
         prompt = f"""
         You are the Shiksha Netra Pedagogical Coach. Use the following context to answer the user's question.
         
-        **Context (Previous Analysis & Transcript):**
-        {json.dumps(context_history) if isinstance(context_history, dict) else context_history}
+        **Context (Previous Analysis & Relevant Transcript Excerpts):**
+        {context}
         
         **User Question:**
         "{query}"
@@ -0,0 +1,165 @@
+"""
+Per-session retrieval context for coach chat.
+
+A report is chunked and embedded once (transcript windows + one line per
+scored minute); each chat turn then sends only a compact score summary and
+the chunks most similar to the question, within a token budget. Stores are
+cached between turns of a session (LRU, COACH_CONTEXT_MAX_SESSIONS) and
+evicted after COACH_CONTEXT_IDLE_SEC idle, by a background sweep while any
+are cached.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from config.settings import (
+    COACH_CONTEXT_TOKEN_BUDGET,
+    COACH_CONTEXT_CHUNK_WORDS,
+    COACH_CONTEXT_IDLE_SEC,
+    COACH_CONTEXT_MAX_SESSIONS,
+)
+from src.inference import get_sentence_model
+from src.transcript_index import chunk_transcript
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English prose
+    return max(1, len(text) // 4)
+
+
+def _minute_lines(scores):
+    audio = {m["minute"]: m for m in (scores.get("audio") or {}).get("per_minute", [])}
+    video = {m["minute"]: m for m in (scores.get("video") or {}).get("per_minute", []) if m}
+
+    lines = []
+    for minute in sorted(set(audio) | set(video)):
+        parts = []
+        if minute in audio:
+            a = audio[minute]
+            parts.append(f"clarity {a['clarity_score']}, voice confidence {a['confidence_score']}")
+        if minute in video:
+            v = video[minute]
+            parts.append(
+                f"engagement {v['engagement_score']}, gestures {v['gesture_index']}, "
+                f"emotion {v['dominant_emotion']}"
+            )
+        lines.append(f"Minute {minute + 1} scores: " + "; ".join(parts))
+    return lines
+
+
+def summarize_report(report):
+    """Always-included context: topic and overall scores (no transcript)."""
+    scores = report.get("scores") or {}
+    text = {
+        k: v for k, v in (scores.get("text") or {}).items()
+        if k in ("technical_depth", "interaction_index", "filler_words", "detected_topics")
+    }
+    summary = {
+        "topic": report.get("topic"),
+        "audio_overall": (scores.get("audio") or {}).get("overall"),
+        "video_overall": (scores.get("video") or {}).get("overall"),
+        "text": text
+    }
+    if "coach_feedback" in report:
+        summary["performance_summary"] = report["coach_feedback"].get("performance_summary")
+    return json.dumps(summary)
+
+
+class SessionContext:
+    def __init__(self, report, model):
+        self.model = model
+        self.summary = summarize_report(report)
+
+        self.chunks = [
+            f"Transcript (from word {start}): {text}"
+            for start, text in chunk_transcript(report.get("transcript", ""), words=COACH_CONTEXT_CHUNK_WORDS, overlap=10)
+        ]
+        self.chunks += _minute_lines(report.get("scores", {}))
+
+        if self.chunks:
+            emb = np.asarray(model.encode(self.chunks, batch_size=32), dtype=np.float32)
+            self.embeddings = emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+        else:
+            self.embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        self.last_used = time.time()
+
+    def retrieve(self, query, token_budget=COACH_CONTEXT_TOKEN_BUDGET):
+        """Most relevant chunks for `query`, best first, until the budget is spent."""
+        self.last_used = time.time()
+        if not self.chunks:
+            return []
+
+        q = np.asarray(self.model.encode(query), dtype=np.float32)
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+
+        selected = []
+        used = estimate_tokens(self.summary)
+        for i in np.argsort(-(self.embeddings @ q)):
+            cost = estimate_tokens(self.chunks[i])
+            if used + cost > token_budget:
+                continue
+            selected.append(self.chunks[i])
+            used += cost
+        return selected
+
+    def build_context(self, query, token_budget=COACH_CONTEXT_TOKEN_BUDGET):
+        parts = [f"Session summary: {self.summary}"]
+        parts += self.retrieve(query, token_budget)
+        return "\n".join(parts)
+
+
+class ContextStore:
+    def __init__(self, idle_sec=COACH_CONTEXT_IDLE_SEC, max_sessions=COACH_CONTEXT_MAX_SESSIONS):
+        self.idle_sec = idle_sec
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, ctx in self._sessions.items() if now - ctx.last_used > self.idle_sec]:
+            del self._sessions[key]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _schedule_sweep(self):
+        # Called with the lock held: while stores are cached, one daemon timer
+        # keeps evicting idle ones, so memory drains even if get() is never called again
+        if self._sweeper is None and self._sessions:
+            self._sweeper = threading.Timer(self.idle_sec, self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+
+    def _sweep(self):
+        with self._lock:
+            self._sweeper = None
+            self._evict()
+            self._schedule_sweep()
+
+    def get(self, report, session_id=None):
+        """SessionContext for a report, built on first use and reused afterwards."""
+        transcript = report.get("transcript", "") or ""
+        fingerprint = hashlib.sha1(transcript.encode("utf-8")).hexdigest()[:16]
+        key = (session_id or report.get("session_id"), fingerprint)
+
+        with self._lock:
+            self._evict()
+            ctx = self._sessions.get(key)
+            if ctx is not None:
+                self._sessions.move_to_end(key)
+                return ctx
+
+        # Embedding happens outside the lock; a concurrent duplicate build is harmless
+        ctx = SessionContext(report, get_sentence_model())
+        with self._lock:
+            self._sessions[key] = ctx
+            self._evict()
+            self._schedule_sweep()
+        return ctx
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,97 @@
+"""
+Shared model loading for CPU inference.
+
+Backends (INFERENCE_BACKEND):
+- fp32: stock weights
+- int8: dynamic int8 quantization of all Linear layers
+- onnx: ONNX Runtime graph for MiniLM (sentence-transformers >= 3.2 with
+        optimum installed); Whisper has no ONNX path here and uses int8
+
+Models are loaded once per (name, backend) and reused by every session.
+"""
+import threading
+import torch
+import whisper
+from sentence_transformers import SentenceTransformer
+from config.settings import (
+    INFERENCE_BACKEND,
+    INFERENCE_BACKENDS,
+    SENTENCE_MODEL_NAME,
+    WHISPER_MODEL_SIZE,
+)
+
+_WHISPER_MODELS = {}
+_SENTENCE_MODELS = {}
+_LOCK = threading.Lock()
+
+
+def _resolve_backend(backend):
+    backend = (backend or INFERENCE_BACKEND).lower()
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend '{backend}'. Expected one of {INFERENCE_BACKENDS}"
+        )
+    return backend
+
+
+def _quantize_int8(model):
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+# --------------------------------------------------
+# Whisper
+# --------------------------------------------------
+def get_whisper_model(size=WHISPER_MODEL_SIZE, backend=None):
+    backend = _resolve_backend(backend)
+    key = (size, backend)
+
+    with _LOCK:
+        if key not in _WHISPER_MODELS:
+            print(f"[WHISPER] Loading '{size}' model ({backend}, one-time)...")
+            if backend == "fp32":
+                model = whisper.load_model(size)
+            else:
+                model = whisper.load_model(size, device="cpu")
+                # whisper.model.Linear only adds a dtype cast in forward();
+                # quantize_dynamic matches exact types, so expose plain nn.Linear
+                for module in model.modules():
+                    if isinstance(module, whisper.model.Linear):
+                        module.__class__ = torch.nn.Linear
+                model = _quantize_int8(model)
+            _WHISPER_MODELS[key] = model
+
+        return _WHISPER_MODELS[key]
+
+
+# --------------------------------------------------
+# Sentence embeddings (MiniLM)
+# --------------------------------------------------
+def sentence_model_key(name=SENTENCE_MODEL_NAME, backend=None):
+    """Identity of an embedding space, for caches of precomputed vectors."""
+    return f"{name}:{_resolve_backend(backend)}"
+
+
+def get_sentence_model(name=SENTENCE_MODEL_NAME, backend=None):
+    backend = _resolve_backend(backend)
+    key = (name, backend)
+
+    with _LOCK:
+        if key not in _SENTENCE_MODELS:
+            print(f"[EMBED] Loading '{name}' ({backend}, one-time)...")
+            model = None
+            if backend == "onnx":
+                try:
+                    model = SentenceTransformer(name, device="cpu", backend="onnx")
+                except Exception as e:
+                    print(f"[EMBED] ONNX backend unavailable ({e}); using int8")
+
+            if model is None:
+                if backend == "fp32":
+                    model = SentenceTransformer(name)
+                else:
+                    model = _quantize_int8(SentenceTransformer(name, device="cpu"))
+            _SENTENCE_MODELS[key] = model
+
+        return _SENTENCE_MODELS[key]
@@ -0,0 +1,212 @@
+import os
+import uuid
+import time
+import numpy as np
+from whisper.audio import SAMPLE_RATE
+from src.processors.audio_analyzer import AudioAnalyzer, MAX_DURATION_SEC
+from src.processors.video_analyzer import VideoAnalyzer
+from src.processors.text_analyzer import TextAnalyzer
+from src.pipeline import extract_audio, transcribe_audio
+from src.asr import plan_asr, load_asr_audio
+from src.feature_store import save_features
+from config.settings import INFERENCE_BACKEND, FEATURE_STORE_ENABLED, LIVE_ASR_MIN_SEC
+
+
+class LiveSession:
+    """
+    Incremental analysis of a recording that is still in progress.
+
+    Input (per feed() call):
+    - a new chunk file (e.g. ffmpeg segment output), or
+    - the same growing file with growing=True (needs an append-friendly
+      container: mkv / ts / fragmented mp4)
+
+    Only new media is decoded. AudioAnalyzer / VideoAnalyzer keep their state
+    (prev_gray, emotion window, minute accumulators) between calls, so the
+    per-minute scores match a one-shot run over the same recording (video
+    exactly; audio to within ~0.01 points, as each chunk's audio is resampled
+    separately). Audio scores are capped at max_audio_sec, like
+    process_session; the transcript covers the whole recording.
+
+    ASR runs on batches of at least asr_min_sec of audio, each planned from
+    its own duration (model size vs ASR_LATENCY_TARGET_SEC), rather than on
+    every chunk with the plan of the first one. Words split across batch
+    boundaries may still differ slightly from a single Whisper pass.
+    """
+
+    def __init__(self, session_id, topic_name="General", language=None,
+                 growing=False, max_audio_sec=MAX_DURATION_SEC, asr_min_sec=LIVE_ASR_MIN_SEC):
+        self.session_id = session_id
+        self.topic_name = topic_name
+        self.language = language
+        self.growing = growing
+        self.max_audio_sec = max_audio_sec
+        self.asr_min_sec = asr_min_sec
+
+        self.audio = None
+        self.video = None
+        self.asr_plan = None        # plan of the latest ASR batch
+        self.asr_batches = 0
+        self.transcribed_sec = 0.0
+        self._asr_pending = []      # 16 kHz samples not transcribed yet
+        self.decoded_sec = 0.0      # audio decoded so far (the analysed audio stops at the cap)
+
+        self.audio_minutes = []
+        self.video_minutes = []
+        self.transcript_parts = []
+        self.chunks = 0
+        self.finalized = None
+        self.start_time = time.time()
+        self.last_fed = self.start_time
+
+    # --------------------------------------------------
+    # Incremental input
+    # --------------------------------------------------
+    def feed(self, path):
+        """
+        Process the new part of the recording. Returns partial events
+        (same shape as iter_session) for every minute completed by it.
+        """
+        if self.finalized:
+            raise RuntimeError(f"Live session {self.session_id} is already finalized")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Recording not found: {path}")
+
+        self.chunks += 1
+        self.last_fed = time.time()
+        print(f"[LIVE] {self.session_id}: chunk {self.chunks} ({path})")
+
+        events = []
+        for minute in self._feed_audio(path):
+            self.audio_minutes.append(minute)
+            events.append(self._partial("audio", minute))
+
+        if self.video is None:
+            self.video = VideoAnalyzer(path)
+        for minute in self.video.feed(path, growing=self.growing):
+            self.video_minutes.append(minute)
+            events.append(self._partial("video", minute))
+
+        return events
+
+    def _feed_audio(self, path):
+        # Growing file: only decode audio past what has already been decoded
+        offset = self.decoded_sec if self.growing else 0
+        audio_path = extract_audio(path, start_sec=offset)
+        if audio_path is None:
+            return []       # no new audio since the last feed()
+
+        try:
+            y, sr = AudioAnalyzer.load_samples(audio_path)
+            self.decoded_sec += len(y) / sr
+            if self.audio is None:
+                self.audio = AudioAnalyzer(max_duration_sec=self.max_audio_sec, sr=sr)
+
+            if len(y):
+                self._asr_pending.append(load_asr_audio(audio_path))
+                self._transcribe_pending()
+
+            return self.audio.feed(y)
+
+        finally:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    def _transcribe_pending(self, final=False):
+        """Transcribe the buffered audio once asr_min_sec is reached (any amount if final)."""
+        pending_sec = sum(len(a) for a in self._asr_pending) / SAMPLE_RATE
+        if not self._asr_pending or (pending_sec < self.asr_min_sec and not final):
+            return
+
+        audio = np.concatenate(self._asr_pending)
+        self._asr_pending = []
+        self.asr_plan = plan_asr(audio, language=self.language)
+        self.transcript_parts.append(transcribe_audio(audio, plan=self.asr_plan))
+        self.asr_batches += 1
+        self.transcribed_sec += pending_sec
+
+    def _partial(self, stage, minute):
+        return {"event": "partial", "stage": stage, "percent": None, "minute": minute}
+
+    # --------------------------------------------------
+    # Current state
+    # --------------------------------------------------
+    @property
+    def transcript(self):
+        return " ".join(p for p in self.transcript_parts if p).strip()
+
+    def snapshot(self):
+        """Scores of the minutes completed so far (no text analysis)."""
+        return {
+            "session_id": self.session_id,
+            "chunks": self.chunks,
+            "audio": {
+                "per_minute": self.audio_minutes,
+                "overall": self.audio._aggregate_overall(self.audio_minutes) if self.audio else None
+            },
+            "video": {
+                "per_minute": self.video_minutes,
+                "overall": self.video._aggregate_overall(self.video_minutes) if self.video else None
+            }
+        }
+
+    # --------------------------------------------------
+    # Final report
+    # --------------------------------------------------
+    def finalize(self):
+        """Score the trailing partial minutes and build the full report."""
+        if self.finalized:
+            return self.finalized
+        if self.audio is None or self.video is None:
+            raise RuntimeError(f"Live session {self.session_id} received no media")
+
+        self.audio_minutes.extend(self.audio.feed(final=True))
+        last_video = self.video.flush()
+        if last_video:
+            self.video_minutes.append(last_video)
+        self._transcribe_pending(final=True)
+
+        feature_id = None
+        if FEATURE_STORE_ENABLED:
+            try:
+                feature_id = uuid.uuid4().hex
+                save_features(
+                    feature_id, self.audio.features, self.video.features,
+                    session_id=self.session_id
+                )
+            except Exception as e:
+                print(f"[FEATURES] Failed to store features: {e}")
+                feature_id = None
+
+        transcript = self.transcript
+        text_results = TextAnalyzer(transcript).analyze(topic=self.topic_name)
+
+        self.finalized = {
+            "session_id": self.session_id,
+            "topic": self.topic_name,
+            "transcript": transcript,
+            "scores": {
+                "audio": {
+                    "per_minute": self.audio_minutes,
+                    "overall": self.audio._aggregate_overall(self.audio_minutes)
+                },
+                "video": {
+                    "per_minute": self.video_minutes,
+                    "overall": self.video._aggregate_overall(self.video_minutes)
+                },
+                "text": text_results
+            },
+            "metadata": {
+                "processing_time_sec": round(time.time() - self.start_time, 2),
+                "inference_backend": INFERENCE_BACKEND,
+                "asr": {
+                    **self.asr_plan,
+                    "duration_sec": round(self.transcribed_sec, 2),
+                    "batches": self.asr_batches
+                } if self.asr_plan else None,
+                "mode": "live",
+                "chunks": self.chunks,
+                "feature_id": feature_id
+            }
+        }
+        return self.finalized
@@ -4,23 +4,42 @@ import json
 import time
 from moviepy.video.io.VideoFileClip import VideoFileClip
 from moviepy.audio.io.AudioFileClip import AudioFileClip
-from src.processors.audio_analyzer import AudioAnalyzer
+from src.processors.audio_analyzer import AudioAnalyzer, MAX_DURATION_SEC as AUDIO_MAX_DURATION_SEC
 from src.processors.video_analyzer import VideoAnalyzer
 from src.processors.text_analyzer import TextAnalyzer
-import whisper
+from src.inference import get_whisper_model
+from src.asr import plan_asr, load_asr_audio
+from src.feature_store import save_features
+from src.preview import choose_windows, estimate_mean
+from src.scoring import aggregate_audio, aggregate_video
+from config.settings import (
+    INFERENCE_BACKEND,
+    TRANSCRIPT_INDEX_ENABLED,
+    FEATURE_STORE_ENABLED,
+    PREVIEW_ASR,
+    PREVIEW_CONFIDENCE,
+)
 
-WHISPER_MODEL = None
 AUDIO_CACHE_DIR = os.path.abspath("audio_cache")
 os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
 
-def extract_audio(video_path):
+def extract_audio(video_path, start_sec=0, end_sec=None):
+    """Audio of [start_sec, end_sec] as a wav path; None when start_sec is at/after the end."""
     audio_filename = f"{uuid.uuid4().hex}.wav"
     audio_path = os.path.join(AUDIO_CACHE_DIR, audio_filename)
 
     print(f"[AUDIO] Extracting to {audio_path}")
 
     video = VideoFileClip(video_path)
-    video.audio.write_audiofile(
+    if start_sec and start_sec >= video.duration:
+        video.close()
+        return None
+
+    audio = video.audio
+    if start_sec or end_sec:
+        end_sec = min(end_sec, video.duration) if end_sec else None
+        audio = audio.subclip(start_sec, end_sec)
+    audio.write_audiofile(
         audio_path,
         verbose=False,
         logger=None
@@ -33,51 +52,151 @@ def extract_audio(video_path):
 
     return audio_path
 
-def transcribe_audio(audio_path):
-    global WHISPER_MODEL
+def transcribe_audio(audio, backend=None, plan=None):
+    """`audio`: file path or samples already decoded with load_asr_audio."""
+    audio = load_asr_audio(audio)
+    plan = plan or plan_asr(audio)
+    model = get_whisper_model(size=plan["model_size"], backend=backend)
+    result = model.transcribe(audio, fp16=False, language=plan["language"])
+    return result["text"].strip()
 
-    if WHISPER_MODEL is None:
-        print("[WHISPER] Loading model (one-time)...")
-        WHISPER_MODEL = whisper.load_model("base")
 
-    result = WHISPER_MODEL.transcribe(audio_path, fp16=False)
-    return result["text"].strip()
+# -----------------------------
+# PROGRESS EVENTS
+# -----------------------------
+# Share of overall progress per stage (sums to 100)
+STAGE_WEIGHTS = {
+    "extract_audio": 5,
+    "audio": 15,
+    "video": 40,
+    "transcribe": 30,
+    "text": 10
+}
+
+
+def _percent(stage, fraction=0.0):
+    done = 0
+    for name, weight in STAGE_WEIGHTS.items():
+        if name == stage:
+            return round(done + weight * min(1.0, max(0.0, fraction)), 1)
+        done += weight
+    return 100.0
+
+
+def _event(event, stage, fraction=0.0, **payload):
+    return {"event": event, "stage": stage, "percent": _percent(stage, fraction), **payload}
 
 
 # -----------------------------
 # MAIN PIPELINE
 # -----------------------------
-def process_session(video_path, topic_name="Machine Learning"):
+def iter_session(video_path, topic_name="Machine Learning", language=None, institution_id=None,
+                 preview=False):
+    """
+    Generator form of process_session. Yields event dicts:
+    - stage_start / stage_finish (with the stage "result")
+    - progress (percent from frame / sample counters)
+    - partial (one per-minute audio or video result as soon as it is ready)
+    - complete (final "report") or error ("message")
+    With preview=True only a sample of minute windows is analysed (iter_preview).
+    """
     print("🚨 process_session CALLED")
     if not os.path.exists(video_path):
         print(f"Video not found: {video_path}")
-        return None
+        yield _event("error", "extract_audio", message=f"Video not found: {video_path}")
+        return
+
+    if preview:
+        yield from iter_preview(video_path, topic_name, language)
+        return
 
     start_time = time.time()
+    yield _event("stage_start", "extract_audio")
     audio_path = extract_audio(video_path)
     if not audio_path:
-        return None
+        yield _event("error", "extract_audio", message="Audio extraction failed")
+        return
+    yield _event("stage_finish", "extract_audio", 1.0)
 
     try:
         print("[PIPELINE] Step 1: Audio analysis")
-        audio_results = AudioAnalyzer(audio_path).analyze()
+        yield _event("stage_start", "audio")
+        audio_analyzer = AudioAnalyzer(audio_path)
+        audio_minutes = []
+        for minute in audio_analyzer.iter_minutes():
+            audio_minutes.append(minute)
+            fraction = minute["end_sec"] / audio_analyzer.duration if audio_analyzer.duration else 1.0
+            yield _event("partial", "audio", fraction, minute=minute)
+        audio_results = {
+            "per_minute": audio_minutes,
+            "overall": audio_analyzer._aggregate_overall(audio_minutes)
+        }
+        yield _event("stage_finish", "audio", 1.0, result=audio_results)
         print("[PIPELINE] Step 1 DONE")
 
         print("[PIPELINE] Step 2: Video analysis")
+        yield _event("stage_start", "video")
         video_analyzer = VideoAnalyzer(video_path)
-        video_results = video_analyzer.process_video()
+        video_minutes = []
+        fraction = 0.0
+        for item in video_analyzer.iter_video():
+            if item["type"] == "progress":
+                if item["total_frames"]:
+                    fraction = item["frame"] / item["total_frames"]
+                yield _event("progress", "video", fraction)
+            else:
+                video_minutes.append(item["data"])
+                yield _event("partial", "video", fraction, minute=item["data"])
+        video_results = {
+            "per_minute": video_minutes,
+            "overall": video_analyzer._aggregate_overall(video_minutes)
+        }
+        yield _event("stage_finish", "video", 1.0, result=video_results)
         print("[PIPELINE] Step 2 DONE")
 
+        feature_id = None
+        if FEATURE_STORE_ENABLED:
+            try:
+                feature_id = uuid.uuid4().hex
+                save_features(
+                    feature_id, audio_analyzer.features, video_analyzer.features,
+                    session_id=os.path.basename(video_path)
+                )
+            except Exception as e:
+                # Re-scoring support must never fail the analysis
+                print(f"[FEATURES] Failed to store features: {e}")
+                feature_id = None
+
         print("[PIPELINE] Step 3: Whisper load")
-        transcript = transcribe_audio(audio_path)
+        yield _event("stage_start", "transcribe")
+        asr_audio = load_asr_audio(audio_path)
+        asr_plan = plan_asr(asr_audio, language=language)
+        transcript = transcribe_audio(asr_audio, plan=asr_plan)
+        del asr_audio
+        yield _event("stage_finish", "transcribe", 1.0, result={"asr": asr_plan})
         print("[PIPELINE] Step 3 DONE")
 
         print("[PIPELINE] Step 4: Text analysis")
-        text_results = TextAnalyzer(transcript).analyze(topic=topic_name)
-        print("[PIPELINE] Step 4 DONE")
+        yield _event("stage_start", "text")
+        text_analyzer = TextAnalyzer(transcript)
+        text_results = text_analyzer.analyze(topic=topic_name)
 
+        indexed_chunks = 0
+        if TRANSCRIPT_INDEX_ENABLED and institution_id is None:
+            # Search is always scoped to one institution: untagged chunks could never be found
+            print("[INDEX] No institution_id, transcript not indexed")
+        elif TRANSCRIPT_INDEX_ENABLED:
+            try:
+                indexed_chunks = text_analyzer.index_transcript(
+                    os.path.basename(video_path), institution_id=institution_id
+                )
+            except Exception as e:
+                # Search indexing must never fail the analysis
+                print(f"[INDEX] Failed to index transcript: {e}")
+        yield _event("stage_finish", "text", 1.0, result=text_results)
+        print("[PIPELINE] Step 4 DONE")
 
-        return {
+        report = {
             "session_id": os.path.basename(video_path),
             "topic": topic_name,
             "transcript": transcript,
@@ -87,13 +206,18 @@ def process_session(video_path, topic_name="Machine Learning"):
                 "text": text_results
             },
             "metadata": {
-                "processing_time_sec": round(time.time() - start_time, 2)
+                "processing_time_sec": round(time.time() - start_time, 2),
+                "inference_backend": INFERENCE_BACKEND,
+                "asr": asr_plan,
+                "indexed_chunks": indexed_chunks,
+                "feature_id": feature_id
             }
         }
+        yield {"event": "complete", "stage": "done", "percent": 100.0, "report": report}
 
     except Exception as e:
         print(f"Pipeline error: {e}")
-        return None
+        yield {"event": "error", "stage": "pipeline", "percent": None, "message": str(e)}
     
     finally:
         # 🔥 GUARANTEED cleanup
@@ -104,6 +228,135 @@ def process_session(video_path, topic_name="Machine Learning"):
             except Exception as e:
                 print(f"[CLEANUP] Failed to delete audio file: {e}")
 
+
+# -----------------------------
+# PREVIEW PIPELINE
+# -----------------------------
+def iter_preview(video_path, topic_name="Machine Learning", language=None, asr=PREVIEW_ASR, seed=0):
+    """
+    Estimated scores from a stratified sample of minute windows (see src/preview.py).
+    Only video is sampled: the full audio analysis is capped at
+    AUDIO_MAX_DURATION_SEC (fewer minutes than PREVIEW_WINDOWS), so preview
+    decodes just that span, in one pass, and scores it exactly. ASR ("tiny")
+    runs only on the sampled video windows, or is skipped.
+    Same events as iter_session; overall scores come with "estimates" holding
+    confidence intervals (zero width for audio).
+    """
+    start_time = time.time()
+    window_paths = []
+
+    try:
+        video_analyzer = VideoAnalyzer(video_path)
+        video_total = video_analyzer.duration_minutes()
+
+        # ---------------- Audio: the capped span, exact ----------------
+        yield _event("stage_start", "audio")
+        audio_minutes = []
+        audio_path = extract_audio(video_path, end_sec=AUDIO_MAX_DURATION_SEC)
+        if audio_path:
+            window_paths.append(audio_path)
+            audio_analyzer = AudioAnalyzer(audio_path)
+            for minute in audio_analyzer.iter_minutes():
+                audio_minutes.append(minute)
+                fraction = minute["end_sec"] / audio_analyzer.duration if audio_analyzer.duration else 1.0
+                yield _event("partial", "audio", fraction, minute=minute)
+        audio_windows = [m["minute"] for m in audio_minutes]
+        audio_total = len(audio_minutes)
+        audio_results = {
+            "per_minute": audio_minutes,
+            "overall": aggregate_audio(audio_minutes),
+            "estimates": {
+                key: estimate_mean([m[key] for m in audio_minutes], audio_total)
+                for key in ("clarity_score", "confidence_score")
+            }
+        }
+        yield _event("stage_finish", "audio", 1.0, result=audio_results)
+
+        # ---------------- Video windows ----------------
+        yield _event("stage_start", "video")
+        video_windows = choose_windows(video_total, seed=seed + 1)
+        video_minutes = []
+        for i, minute in enumerate(video_windows):
+            result = video_analyzer.analyze_window(minute)
+            if result:
+                video_minutes.append(result)
+                yield _event("partial", "video", (i + 1) / len(video_windows), minute=result)
+        video_results = {
+            "per_minute": video_minutes,
+            "overall": aggregate_video(video_minutes),
+            "estimates": {
+                key: estimate_mean([m[key] for m in video_minutes], video_total)
+                for key in ("engagement_score", "gesture_index", "confidence_score")
+            }
+        }
+        yield _event("stage_finish", "video", 1.0, result=video_results)
+
+        # ---------------- Optional tiny ASR on the video windows ----------------
+        transcript, asr_plan, text_results = "", None, TextAnalyzer.empty_scores()
+        if asr == "tiny" and video_windows:
+            yield _event("stage_start", "transcribe")
+            parts = []
+            for minute in video_windows:
+                path = extract_audio(video_path, start_sec=minute * 60, end_sec=(minute + 1) * 60)
+                if not path:
+                    continue
+                window_paths.append(path)
+                window_audio = load_asr_audio(path)
+                asr_plan = asr_plan or plan_asr(window_audio, language=language, preview=True)
+                parts.append(transcribe_audio(window_audio, plan=asr_plan))
+            transcript = " ".join(p for p in parts if p).strip()
+            yield _event("stage_finish", "transcribe", 1.0, result={"asr": asr_plan})
+
+            yield _event("stage_start", "text")
+            text_results = TextAnalyzer(transcript).analyze(topic=topic_name)
+            yield _event("stage_finish", "text", 1.0, result=text_results)
+
+        report = {
+            "session_id": os.path.basename(video_path),
+            "topic": topic_name,
+            "transcript": transcript,
+            "scores": {
+                "audio": audio_results,
+                "video": video_results,
+                "text": text_results
+            },
+            "metadata": {
+                "processing_time_sec": round(time.time() - start_time, 2),
+                "inference_backend": INFERENCE_BACKEND,
+                "asr": asr_plan,
+                "mode": "preview",
+                "confidence_level": PREVIEW_CONFIDENCE,
+                "sampled_minutes": {"audio": audio_windows, "video": video_windows},
+                "total_minutes": {"audio": audio_total, "video": video_total}
+            }
+        }
+        yield {"event": "complete", "stage": "done", "percent": 100.0, "report": report}
+
+    except Exception as e:
+        print(f"Preview error: {e}")
+        yield {"event": "error", "stage": "preview", "percent": None, "message": str(e)}
+
+    finally:
+        for path in window_paths:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+def process_session(video_path, topic_name="Machine Learning", language=None, on_event=None,
+                    institution_id=None, preview=False):
+    """
+    Run the full pipeline and return the report (None on failure).
+    `on_event` receives every iter_session event for callback-style progress.
+    preview=True returns estimated scores from a sample of minute windows.
+    """
+    report = None
+    for event in iter_session(video_path, topic_name, language, institution_id, preview):
+        if on_event:
+            on_event(event)
+        if event["event"] == "complete":
+            report = event["report"]
+    return report
+
 if __name__ == "__main__":
     # Create a dummy video for testing if it doesn't exist
     import cv2
@@ -0,0 +1,57 @@
+"""
+Sampling and estimation for preview mode.
+
+Overall audio/video scores are means of per-minute scores, so a preview scores
+a stratified random sample of minute windows (one per equal-length stratum,
+covering the whole session) and reports the sample mean with a t-interval
+(finite-population corrected). One draw per stratum has no within-stratum
+variance estimate, so the simple-random-sample variance is used, which is
+conservative when scores drift over the session.
+"""
+import numpy as np
+from scipy import stats
+from config.settings import PREVIEW_WINDOWS, PREVIEW_CONFIDENCE
+
+
+def choose_windows(total_minutes, n_windows=PREVIEW_WINDOWS, seed=0):
+    """Sorted minute indices to analyse (all of them for short sessions)."""
+    if total_minutes <= n_windows:
+        return list(range(total_minutes))
+
+    rng = np.random.default_rng(seed)
+    edges = np.floor(np.linspace(0, total_minutes, n_windows + 1)).astype(int)
+    return [int(rng.integers(lo, hi)) for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def estimate_mean(values, population, confidence=PREVIEW_CONFIDENCE, bounds=(0.0, 100.0)):
+    """
+    Point estimate + confidence interval of the population mean from sampled
+    per-minute values. Interval is exact (zero width) when every minute was
+    sampled, unknown (None) with a single sample.
+    """
+    values = np.asarray([v for v in values if v is not None], dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return {"estimate": None, "ci_low": None, "ci_high": None, "sampled": 0, "population": population}
+
+    mean = float(np.mean(values))
+    if n >= population:
+        half = 0.0
+    elif n == 1:
+        half = None
+    else:
+        fpc = np.sqrt((population - n) / max(population - 1, 1))
+        se = np.std(values, ddof=1) / np.sqrt(n) * fpc
+        half = float(stats.t.ppf((1 + confidence) / 2, n - 1) * se)
+
+    low = high = None
+    if half is not None:
+        low, high = float(np.clip(mean - half, *bounds)), float(np.clip(mean + half, *bounds))
+
+    return {
+        "estimate": round(mean, 2),
+        "ci_low": round(low, 2) if low is not None else None,
+        "ci_high": round(high, 2) if high is not None else None,
+        "sampled": n,
+        "population": population
+    }
@@ -3,6 +3,10 @@ import numpy as np
 import librosa
 import soundfile as sf
 from config.settings import SAMPLE_RATE, SPEECH_THRESHOLD_DB,N_FFT,HOP_LENGTH
+from src.scoring import resolve_weights, clarity_score, audio_confidence_score, aggregate_audio
+
+# Hard cap on analysed audio (HF-safe)
+MAX_DURATION_SEC = 300
 
 
 class AudioAnalyzer:
@@ -12,20 +16,29 @@ class AudioAnalyzer:
     - Fast loading (soundfile)
     - No blocking pitch models
     - Debug-friendly logs
+    - Raw per-minute features kept in self.features (for the feature store)
     """
 
-    def __init__(self, audio_path: str, max_duration_sec: int = 300):
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-
-        print("[AUDIO] Loading audio with soundfile...")
-
-        with sf.SoundFile(audio_path) as f:
-            y = f.read(dtype="float32")
-            sr = f.samplerate
-
-        if y.ndim > 1:
-            y = y.mean(axis=1)
+    def __init__(self, audio_path: str = None, max_duration_sec: int = MAX_DURATION_SEC, sr: int = None,
+                 weights: dict = None):
+        self.max_duration_sec = max_duration_sec
+        self.weights = resolve_weights(weights)
+        self.features = []
+
+        # Streaming mode (live sessions): no file, samples arrive through feed()
+        if audio_path is None:
+            if not sr:
+                raise ValueError("Streaming AudioAnalyzer needs a sample rate")
+            self.y = np.zeros(0, dtype="float32")
+            self.sr = sr
+            self.duration = 0.0
+            self._pending = np.zeros(0, dtype="float32")
+            self._next_minute = 0
+            self._fed_samples = 0
+            print(f"[AUDIO] Streaming analyzer ready @ {sr} Hz")
+            return
+
+        y, sr = self.load_samples(audio_path)
 
         duration = len(y) / sr
         print(f"[AUDIO] Raw duration: {duration:.2f}s @ {sr} Hz")
@@ -43,13 +56,27 @@ class AudioAnalyzer:
         print(f"[AUDIO] Using native SR: {sr} Hz (NO resampling)")
         print("[AUDIO] Audio ready")
 
+    @staticmethod
+    def load_samples(audio_path):
+        """Mono float32 samples + native sample rate."""
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        print("[AUDIO] Loading audio with soundfile...")
+
+        with sf.SoundFile(audio_path) as f:
+            y = f.read(dtype="float32")
+            sr = f.samplerate
+
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+
+        return y, sr
+
     # --------------------------------------------------
-    # CLARITY (FAST, NO PYIN)
+    # RAW FEATURES (one pass per minute window)
     # --------------------------------------------------
-    def analyze_clarity(self, y_chunk):
-        if len(y_chunk) == 0:
-            return 0.0
-
+    def extract_features(self, y_chunk):
         duration = len(y_chunk) / self.sr
 
         non_silent = librosa.effects.split(
@@ -61,60 +88,78 @@ class AudioAnalyzer:
             (e - s) for s, e in non_silent
         ) / self.sr
 
-        pause_ratio = 1 - (non_silent_duration / duration)
-        pause_score = 1 - pause_ratio
-
         flatness = librosa.feature.spectral_flatness(y=y_chunk,
                                                      n_fft=N_FFT,
                                                      hop_length=HOP_LENGTH)[0]
-        noise_score = 1 - np.mean(flatness)
-
-        rms = librosa.feature.rms(y=y_chunk)[0]
-        energy_score = max(0.0, 1 - np.std(rms) / 0.05)
 
-        score = (
-            pause_score * 0.4 +
-            noise_score * 0.4 +
-            energy_score * 0.2
-        ) * 100
+        rms = librosa.feature.rms(y=y_chunk,
+                                  frame_length=N_FFT,
+                                  hop_length=HOP_LENGTH)[0]
 
-        return round(float(np.clip(score, 0, 100)), 2)
+        return {
+            "non_silent_ratio": float(non_silent_duration / duration),
+            "flatness_mean": float(np.mean(flatness)),
+            "rms_mean": float(np.mean(rms)),
+            "rms_std": float(np.std(rms)),
+            "rms_frames": len(rms)
+        }
 
     # --------------------------------------------------
-    # CONFIDENCE (FAST, NO PYIN)
+    # CLARITY (FAST, NO PYIN)
     # --------------------------------------------------
-    def analyze_confidence(self, y_chunk):
+    def analyze_clarity(self, y_chunk, features=None):
         if len(y_chunk) == 0:
             return 0.0
 
-        rms = librosa.feature.rms(y=y_chunk,
-                                  frame_length=N_FFT,
-                                  hop_length=HOP_LENGTH)[0]
+        f = features or self.extract_features(y_chunk)
+        score = clarity_score(
+            f["non_silent_ratio"], f["flatness_mean"], f["rms_std"], self.weights["clarity"]
+        )
+        return round(float(score), 2)
 
-        if len(rms) < 10:
+    # --------------------------------------------------
+    # CONFIDENCE (FAST, NO PYIN)
+    # --------------------------------------------------
+    def analyze_confidence(self, y_chunk, features=None):
+        if len(y_chunk) == 0:
             return 0.0
 
-        loudness_score = min(1.0, np.mean(rms) / 0.08)
-        stability_score = max(0.0, 1 - np.std(rms) / 0.05)
-
-        score = (
-            loudness_score * 0.6 +
-            stability_score * 0.4
-        ) * 100
-
-        return round(float(np.clip(score, 0, 100)), 2)
+        f = features or self.extract_features(y_chunk)
+        score = audio_confidence_score(
+            f["rms_mean"], f["rms_std"], f["rms_frames"], self.weights["audio_confidence"]
+        )
+        return round(float(score), 2)
 
     # --------------------------------------------------
-    # FINAL ANALYSIS
+    # PER-MINUTE ANALYSIS (incremental)
     # --------------------------------------------------
-    def analyze(self):
+    def score_minute(self, minute, y_chunk):
+        """Score one minute window; None when it is too short to judge."""
+        if len(y_chunk) < self.sr * 5:
+            print("[AUDIO] Skipped (too short)")
+            return None
+
+        features = self.extract_features(y_chunk)
+        result = {
+            "minute": minute,
+            "start_sec": minute * 60,
+            "end_sec": min((minute + 1) * 60, minute * 60 + len(y_chunk) / self.sr),
+            "clarity_score": self.analyze_clarity(y_chunk, features),
+            "confidence_score": self.analyze_confidence(y_chunk, features)
+        }
+        self.features.append({
+            "minute": minute,
+            "start_sec": result["start_sec"],
+            "end_sec": result["end_sec"],
+            **features
+        })
+        return result
+
+    def iter_minutes(self):
+        """Yield per-minute results as soon as each minute is scored."""
         samples_per_min = int(self.sr * 60)
         total_minutes = int(np.ceil(len(self.y) / samples_per_min))
 
-        per_minute = []
-        clarity_vals = []
-        confidence_vals = []
-
         print(f"[AUDIO] Total minutes: {total_minutes}")
 
         for minute in range(total_minutes):
@@ -122,30 +167,54 @@ class AudioAnalyzer:
 
             start = minute * samples_per_min
             end = (minute + 1) * samples_per_min
-            y_chunk = self.y[start:end]
+            result = self.score_minute(minute, self.y[start:end])
+            if result:
+                yield result
 
-            if len(y_chunk) < self.sr * 5:
-                print("[AUDIO] Skipped (too short)")
-                continue
+    # --------------------------------------------------
+    # STREAMING (live sessions)
+    # --------------------------------------------------
+    def feed(self, y_new=None, final=False):
+        """
+        Append new samples and return the minutes they complete.
+        Only the unscored tail (< 1 minute) is buffered, never the whole session.
+        With final=True the remaining tail is scored as the last minute.
+        """
+        if y_new is None:
+            y_new = np.zeros(0, dtype="float32")
+
+        if self.max_duration_sec:
+            room = int(self.sr * self.max_duration_sec) - self._fed_samples
+            y_new = y_new[:max(0, room)]
+
+        self._fed_samples += len(y_new)
+        self.duration = self._fed_samples / self.sr
+        self._pending = np.concatenate([self._pending, y_new.astype("float32", copy=False)])
 
-            clarity = self.analyze_clarity(y_chunk)
-            confidence = self.analyze_confidence(y_chunk)
+        samples_per_min = int(self.sr * 60)
+        completed = []
+
+        while len(self._pending) >= samples_per_min or (final and len(self._pending) > 0):
+            y_chunk = self._pending[:samples_per_min]
+            self._pending = self._pending[samples_per_min:]
 
-            per_minute.append({
-                "minute": minute,
-                "start_sec": minute * 60,
-                "end_sec": min((minute + 1) * 60, self.duration),
-                "clarity_score": clarity,
-                "confidence_score": confidence
-            })
+            print(f"[AUDIO] Streaming minute {self._next_minute + 1}")
+            result = self.score_minute(self._next_minute, y_chunk)
+            self._next_minute += 1
+            if result:
+                completed.append(result)
 
-            clarity_vals.append(clarity)
-            confidence_vals.append(confidence)
+        return completed
 
+    # --------------------------------------------------
+    # FINAL ANALYSIS
+    # --------------------------------------------------
+    def analyze(self):
+        per_minute = list(self.iter_minutes())
         return {
             "per_minute": per_minute,
-            "overall": {
-                "clarity_score": round(float(np.mean(clarity_vals)), 2) if clarity_vals else 0.0,
-                "confidence_score": round(float(np.mean(confidence_vals)), 2) if confidence_vals else 0.0
-            }
+            "overall": self._aggregate_overall(per_minute)
         }
+
+    def _aggregate_overall(self, per_minute):
+        return aggregate_audio(per_minute)
@@ -0,0 +1,141 @@
+"""
+Single-pass lexical engine for transcripts.
+
+One regex tokenization pass feeds a word-level Aho–Corasick automaton that
+matches inclusive pronouns, filler words and every curriculum keyword at
+once. Working on whole tokens gives word boundaries for free ("ai" does not
+match inside "maintain") and supports multi-word phrases ("gradient descent").
+"""
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+
+
+def _mark_class():
+    """Character-class body for combining marks (category M) in the BMP."""
+    ranges, start, prev = [], None, None
+    for cp in range(0x10000):
+        if unicodedata.category(chr(cp))[0] == "M":
+            if start is None:
+                start = cp
+            prev = cp
+        elif start is not None:
+            ranges.append((start, prev))
+            start = None
+    return "".join(f"\\u{a:04x}-\\u{b:04x}" if a != b else f"\\u{a:04x}" for a, b in ranges)
+
+
+# Unicode words: a letter/digit followed by letters, digits and combining marks
+# (Devanagari vowel signs / virama, decomposed accents), with inner apostrophes
+# ("let's"); or single punctuation marks
+_MARKS = _mark_class()
+_WORD = f"[^\\W_]+(?:[{_MARKS}]+[^\\W_]*)*"
+TOKEN_RE = re.compile(f"{_WORD}(?:'{_WORD})*|[^\\w\\s{_MARKS}]")
+
+INCLUSIVE_PRONOUNS = ("we", "us", "our", "let's", "lets")
+FILLER_WORDS = (
+    "um", "umm", "uh", "uhh", "er", "erm", "hmm",
+    "you know", "i mean", "basically", "actually", "kind of", "sort of"
+)
+
+PRONOUN = "pronoun"
+FILLER = "filler"
+KEYWORD = "keyword"
+
+
+def tokenize(text):
+    # NFC: decomposed accents (e + U+0301) match keywords typed precomposed
+    return TOKEN_RE.findall(unicodedata.normalize("NFC", text or "").lower())
+
+
+class PhraseAutomaton:
+    """Aho–Corasick automaton over tokens; patterns are token tuples."""
+
+    def __init__(self, patterns):
+        # patterns: list of (token_tuple, payload)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for tokens, payload in patterns:
+            if not tokens:
+                continue
+            node = 0
+            for tok in tokens:
+                nxt = self.goto[node].get(tok)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][tok] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(payload)
+
+        # BFS: failure links + inherited outputs (suffix matches)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and tok not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(tok, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def step(self, node, tok):
+        while node and tok not in self.goto[node]:
+            node = self.fail[node]
+        return self.goto[node].get(tok, 0)
+
+
+@lru_cache(maxsize=32)
+def get_automaton(keywords=()):
+    """Automaton for pronouns + fillers + `keywords` (a tuple), built once per keyword set."""
+    patterns = [((p,), (PRONOUN, p)) for p in INCLUSIVE_PRONOUNS]
+    patterns += [(tuple(tokenize(f)), (FILLER, f)) for f in FILLER_WORDS]
+    patterns += [(tuple(tokenize(k)), (KEYWORD, k)) for k in keywords]
+    return PhraseAutomaton(patterns)
+
+
+def scan(text, keywords=None):
+    """
+    One linear pass over `text`. Returns token / question / pronoun / filler
+    counts plus per-keyword match counts (keyed by the keywords as given).
+    """
+    keywords = tuple(dict.fromkeys(keywords or ()))
+    automaton = get_automaton(keywords)
+
+    stats = {
+        "token_count": 0,
+        "word_count": 0,
+        "question_count": 0,
+        "pronoun_count": 0,
+        "filler_count": 0,
+        "filler_matches": {},
+        "keyword_matches": {}
+    }
+    fillers = stats["filler_matches"]
+    matches = stats["keyword_matches"]
+
+    node = 0
+    for tok in tokenize(text):
+        stats["token_count"] += 1
+        if tok == "?":
+            stats["question_count"] += 1
+        elif tok[0].isalnum():
+            stats["word_count"] += 1
+
+        node = automaton.step(node, tok)
+        for kind, value in automaton.out[node]:
+            if kind == KEYWORD:
+                matches[value] = matches.get(value, 0) + 1
+            elif kind == PRONOUN:
+                stats["pronoun_count"] += 1
+            else:
+                stats["filler_count"] += 1
+                fillers[value] = fillers.get(value, 0) + 1
+
+    return stats
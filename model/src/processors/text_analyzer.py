@@ -1,32 +1,56 @@
-import nltk
-from sentence_transformers import SentenceTransformer, util
-import re
+import numpy as np
+from src.inference import get_sentence_model, sentence_model_key
+from src.processors.lexical import scan
+from src.processors.topic_catalog import get_topic_cache, get_topic_catalog
+from src.transcript_index import chunk_transcript, get_transcript_index
+
+TEXT_SCORE_KEYS = ("technical_depth", "interaction_index", "topic_relevance", "filler_words", "detected_topics")
 
 class TextAnalyzer:
-    def __init__(self, transcript):
+    def __init__(self, transcript, backend=None):
         """
         Initialize the TextAnalyzer with a text transcript.
-        Loads the sentence-transformer model.
+        Loads the sentence-transformer model (shared across instances,
+        fp32/int8/onnx per INFERENCE_BACKEND unless `backend` is given).
         """
         self.transcript = transcript
         
         # Load model (this might take a moment on first run)
         # Using a lightweight model for efficiency
         try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = get_sentence_model(backend=backend)
         except Exception as e:
             raise RuntimeError(f"Failed to load sentence-transformer model: {e}")
-            
-        # Ensure NLTK data is available (basic tokenizers)
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
-            
-        try:
-            nltk.data.find('tokenizers/punkt_tab')
-        except LookupError:
-            nltk.download('punkt_tab', quiet=True)
+
+        # Topic vectors are cached per embedding space (memory + disk)
+        self.model_key = sentence_model_key(backend=backend)
+        self.topic_cache = get_topic_cache(self.model, self.model_key)
+        self._transcript_embedding = None
+
+        # Last lexical scan, keyed by keyword tuple (one pass serves all counts)
+        self._lexical = None
+
+    def lexical_stats(self, keywords=None):
+        """
+        Single linear pass: tokens, questions, inclusive pronouns, fillers
+        and keyword matches (word-boundary Aho–Corasick, cached per keyword set).
+        """
+        # Pronoun / question / filler counts don't depend on keywords,
+        # so any cached scan serves callers that pass none
+        if keywords is None and self._lexical is not None:
+            return self._lexical[1]
+
+        key = tuple(keywords or ())
+        if self._lexical is None or self._lexical[0] != key:
+            self._lexical = (key, scan(self.transcript, key))
+        return self._lexical[1]
+
+    def transcript_embedding(self):
+        """Normalized transcript embedding (encoded once per analyzer)."""
+        if self._transcript_embedding is None:
+            vec = np.asarray(self.model.encode(self.transcript), dtype=np.float32)
+            self._transcript_embedding = vec / max(float(np.linalg.norm(vec)), 1e-12)
+        return self._transcript_embedding
 
     def analyze_technical_depth(self, topic):
         """
@@ -36,18 +60,29 @@ class TextAnalyzer:
         if not self.transcript or not topic:
             return 0.0
             
-        # Encode transcript and topic
-        embeddings = self.model.encode([self.transcript, topic])
+        # Cosine similarity of normalized vectors; the topic side comes from the cache
+        similarity = float(np.dot(self.transcript_embedding(), self.topic_cache.get(topic)))
         
-        # Compute cosine similarity
-        similarity = util.cos_sim(embeddings[0], embeddings[1])
-        
-        # Convert tensor to float and scale to 0-100
-        score = float(similarity[0][0]) * 100
+        # Scale to 0-100
+        score = similarity * 100
         
         # Ensure score is non-negative
         return max(0.0, round(score, 2))
 
+    def detect_topics(self, k=None):
+        """
+        Top-k curriculum topics for the transcript (one matrix multiply).
+        Empty when no catalogue is configured (CURRICULUM_TOPICS_PATH).
+        """
+        if not self.transcript:
+            return []
+
+        catalog = get_topic_catalog(self.model, self.model_key)
+        if catalog is None:
+            return []
+
+        return catalog.top_k(self.transcript_embedding(), k)
+
     def analyze_interaction(self):
         """
         Calculate Interaction Index based on questions and inclusive pronouns.
@@ -56,64 +91,95 @@ class TextAnalyzer:
         if not self.transcript:
             return 0.0
             
-        # Tokenize words
-        words = nltk.word_tokenize(self.transcript.lower())
-        total_words = len(words)
+        stats = self.lexical_stats()
+        total_words = stats["token_count"]
         
         if total_words == 0:
             return 0.0
             
-        # Count question marks (in original text or tokens)
-        question_count = self.transcript.count('?')
-        
-        # Count inclusive pronouns
-        inclusive_pronouns = {'we', 'us', 'our', "let's", 'lets'}
-        pronoun_count = sum(1 for word in words if word in inclusive_pronouns)
-        
         # Calculate index
         # Heuristic: 1 question or pronoun per 20 words is high interaction (5%)
         # Let's say 5% density = 100 score
-        density = (question_count + pronoun_count) / total_words
+        density = (stats["question_count"] + stats["pronoun_count"]) / total_words
         interaction_score = min(100, (density / 0.05) * 100)
         
         return round(interaction_score, 2)
 
+    def analyze_fillers(self):
+        """
+        Filler words ("um", "you know", ...) per 100 spoken words.
+        """
+        stats = self.lexical_stats()
+        words = stats["word_count"]
+
+        return {
+            "count": stats["filler_count"],
+            "per_100_words": round(stats["filler_count"] / words * 100, 2) if words else 0.0,
+            "matches": stats["filler_matches"]
+        }
+
     def check_topic_relevance(self, keywords):
         """
-        Check if keywords are present in the transcript.
+        Check if keywords are present in the transcript (whole words / phrases).
         Returns a dictionary with match counts and a relevance score.
         """
         if not self.transcript or not keywords:
             return {"matches": {}, "relevance_score": 0.0}
             
-        transcript_lower = self.transcript.lower()
-        matches = {}
-        total_matches = 0
-        
-        for keyword in keywords:
-            count = transcript_lower.count(keyword.lower())
-            if count > 0:
-                matches[keyword] = count
-                total_matches += count
+        matches = self.lexical_stats(keywords)["keyword_matches"]
                 
         # Relevance score: simple presence ratio or density
         # Let's use percentage of keywords found
-        if len(keywords) == 0:
-            relevance_score = 0.0
-        else:
-            relevance_score = (len(matches) / len(keywords)) * 100
+        relevance_score = (len(matches) / len(keywords)) * 100
             
         return {
             "matches": matches,
             "relevance_score": round(relevance_score, 2)
         }
 
+    def index_transcript(self, session_id, institution_id=None):
+        """
+        Embed overlapping transcript chunks and append them to the shared
+        transcript index (semantic search). Returns the number of chunks.
+        """
+        chunks = chunk_transcript(self.transcript)
+        if not chunks:
+            return 0
+
+        embeddings = self.model.encode([text for _, text in chunks], batch_size=32)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+        rows = [
+            {
+                "session_id": session_id,
+                "institution_id": institution_id,
+                "chunk": i,
+                "start_word": start,
+                "text": text
+            }
+            for i, (start, text) in enumerate(chunks)
+        ]
+
+        index = get_transcript_index(dim=embeddings.shape[1], model_key=self.model_key)
+        return index.add(embeddings, rows, institution_id=institution_id)
+
+    @staticmethod
+    def empty_scores():
+        """Same keys as analyze(), all None (no transcript, e.g. preview without ASR)."""
+        return dict.fromkeys(TEXT_SCORE_KEYS)
+
     def analyze(self, topic, keywords=None):
         """
         Perform full analysis.
         """
+        # One lexical pass shared by interaction, relevance and fillers
+        self.lexical_stats(keywords)
+
         return {
             "technical_depth": self.analyze_technical_depth(topic),
             "interaction_index": self.analyze_interaction(),
-            "topic_relevance": self.check_topic_relevance(keywords)
+            "topic_relevance": self.check_topic_relevance(keywords),
+            "filler_words": self.analyze_fillers(),
+            "detected_topics": self.detect_topics()
         }
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Topic embeddings for technical_depth and automatic topic detection.
+
+- TopicEmbeddingCache: normalized topic vectors, memoized in-process (LRU of
+  TOPIC_CACHE_MEMORY_ENTRIES) and persisted as .npy files (at most
+  TOPIC_CACHE_MAX_FILES per model), so "General" and course topics are encoded
+  once per model rather than on every session.
+- TopicCatalog: a curriculum of topics precomputed into one normalized
+  (n_topics x dim) float32 matrix; detection is a single matrix-vector
+  product followed by a top-k selection.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from config.settings import (
+    TOPIC_CACHE_DIR,
+    TOPIC_CACHE_MEMORY_ENTRIES,
+    TOPIC_CACHE_MAX_FILES,
+    CURRICULUM_TOPICS_PATH,
+    TOPIC_DETECTION_TOP_K,
+)
+
+
+def _digest(*parts):
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _save_atomic(path, array):
+    # Write-then-rename: TOPIC_CACHE_DIR is shared by the serving workers, so a
+    # reader must never see a half-written file (per-process tmp name, as two
+    # workers may encode the same topic at once)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+class TopicEmbeddingCache:
+    def __init__(self, model, model_key, cache_dir=TOPIC_CACHE_DIR,
+                 max_memory=TOPIC_CACHE_MEMORY_ENTRIES, max_files=TOPIC_CACHE_MAX_FILES):
+        self.model = model
+        self.model_key = model_key
+        self.cache_dir = os.path.abspath(os.path.join(cache_dir, _digest(model_key)[:12]))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_memory = max_memory
+        self.max_files = max_files
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, topic):
+        """Normalized embedding for `topic` (memory → disk → encode)."""
+        key = _digest(topic)
+        with self._lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                return vec
+
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            vec = self._load(path)
+            if vec is None:
+                print(f"[TOPIC] Encoding topic '{topic[:40]}' (cached afterwards)")
+                vec = _normalize(self.model.encode(topic))
+                _save_atomic(path, vec)
+                self._prune_disk()
+
+            self._memory[key] = vec
+            if len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+            return vec
+
+    @staticmethod
+    def _load(path):
+        # mtime doubles as the last-use time for disk eviction; another worker
+        # may prune the file between the check and the load
+        try:
+            vec = np.load(path)
+            os.utime(path)
+            return vec
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _prune_disk(self):
+        """Drop the least recently used topic files beyond max_files."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".npy") and not entry.name.startswith("matrix_"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        pass
+        if len(entries) <= self.max_files:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def matrix(self, texts):
+        """Normalized (n x dim) matrix for a list of texts, persisted as one file."""
+        path = os.path.join(self.cache_dir, f"matrix_{_digest(*texts)}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+
+        print(f"[TOPIC] Precomputing {len(texts)} curriculum topic embeddings...")
+        matrix = _normalize(self.model.encode(list(texts), batch_size=64))
+        _save_atomic(path, matrix)
+        return matrix
+
+
+class TopicCatalog:
+    def __init__(self, topics, cache):
+        """
+        topics: list of names or {"name": ..., "description": ...} dicts.
+        The description (if any) is what gets embedded.
+        """
+        self.names = []
+        texts = []
+        for t in topics:
+            if isinstance(t, dict):
+                name = t["name"]
+                texts.append(f"{name}: {t['description']}" if t.get("description") else name)
+            else:
+                name = str(t)
+                texts.append(name)
+            self.names.append(name)
+
+        self.matrix = cache.matrix(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+
+    @classmethod
+    def from_file(cls, path, cache):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), cache)
+
+    def top_k(self, embedding, k=None):
+        """[{"topic", "score"}] best matches for a normalized embedding, score 0-100."""
+        if not self.names:
+            return []
+
+        scores = self.matrix @ embedding
+        k = min(k or TOPIC_DETECTION_TOP_K, len(self.names))
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+
+        return [
+            {"topic": self.names[i], "score": max(0.0, round(float(scores[i]) * 100, 2))}
+            for i in idx
+        ]
+
+
+# --------------------------------------------------
+# Shared instances (one per model / backend)
+# --------------------------------------------------
+_CACHES = {}
+_CATALOGS = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_topic_cache(model, model_key):
+    with _SHARED_LOCK:
+        if model_key not in _CACHES:
+            _CACHES[model_key] = TopicEmbeddingCache(model, model_key)
+        return _CACHES[model_key]
+
+
+def get_topic_catalog(model, model_key, path=CURRICULUM_TOPICS_PATH):
+    """Curriculum catalogue from CURRICULUM_TOPICS_PATH, or None if not configured."""
+    if not path or not os.path.exists(path):
+        return None
+
+    cache = get_topic_cache(model, model_key)
+    key = (model_key, os.path.abspath(path), os.path.getmtime(path))
+    with _SHARED_LOCK:
+        if key not in _CATALOGS:
+            _CATALOGS[key] = TopicCatalog.from_file(path, cache)
+        return _CATALOGS[key]
@@ -5,7 +5,22 @@ import logging
 from collections import deque, Counter
 from transformers import pipeline
 from PIL import Image
-from config.settings import FRAME_EXTRACTION_RATE
+from config.settings import (
+    FRAME_EXTRACTION_RATE,
+    ADAPTIVE_SAMPLING,
+    SAMPLING_BUDGET_PER_MIN,
+    SAMPLING_MAX_GAP_SEC,
+    ACTIVITY_THUMB_SIZE,
+    ACTIVITY_LOW,
+    ACTIVITY_HIGH,
+)
+from src.scoring import (
+    resolve_weights,
+    engagement,
+    normalized_motion,
+    video_confidence_score,
+    aggregate_video,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +35,27 @@ class VideoAnalyzer:
     - dominant_emotion (mode)
     - confidence_score (signal availability)
 
+    Sampling:
+    - fixed: every FRAME_EXTRACTION_RATE-th frame
+    - adaptive: stride follows scene activity within a per-minute budget;
+      every sample is weighted by the frames it stands for
+
     Output:
     - per_minute metrics
     - overall aggregated metrics
+    - raw per-sample features in self.features (for the feature store)
     """
 
-    def __init__(self, video_path: str):
+    def __init__(self, video_path: str, adaptive_sampling: bool = None, weights: dict = None):
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
         self.video_path = video_path
+        self.adaptive_sampling = (
+            ADAPTIVE_SAMPLING if adaptive_sampling is None else adaptive_sampling
+        )
+        self.weights = resolve_weights(weights)
+        self.features = None
         logger.info("[VIDEO] Initializing VideoAnalyzer")
 
         # ---------------- Face Detection ----------------
@@ -61,28 +87,34 @@ class VideoAnalyzer:
 
         self.emotion_window = deque(maxlen=5)
 
+        # Carried between feed() calls in live sessions
+        self._stream = None
+
     # --------------------------------------------------
     # Engagement (face presence proxy)
     # --------------------------------------------------
-    def analyze_engagement(self, frame):
+    def face_area_ratio(self, frame):
+        """Share of the frame covered by the largest face (None if no face)."""
         if self.face_cascade is None:
-            return 0.0, False
+            return None
 
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = self.face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
 
         if len(faces) == 0:
-            return 0.0, False
+            return None
 
         h, w = frame.shape[:2]
         largest = max(faces, key=lambda r: r[2] * r[3])
-        area_ratio = (largest[2] * largest[3]) / (w * h)
+        return float((largest[2] * largest[3]) / (w * h))
 
-        # Adjusted logic:
-        # Base score 0.3 just for having a face
-        # Multiplier increased to 10.0 (so ~7% screen coverage gives 100%)
-        engagement = min(1.0, 0.3 + (area_ratio * 10.0))
-        return float(engagement), True
+    def analyze_engagement(self, frame):
+        area_ratio = self.face_area_ratio(frame)
+        if area_ratio is None:
+            return 0.0, False
+
+        # Base score for having a face + face size (see SCORING_WEIGHTS)
+        return float(engagement(area_ratio, True, self.weights["engagement"])), True
 
     # --------------------------------------------------
     # Emotion (optional)
@@ -102,52 +134,218 @@ class VideoAnalyzer:
     # Main Processing
     # --------------------------------------------------
     def process_video(self):
+        per_minute = [
+            event["data"] for event in self.iter_video()
+            if event["type"] == "minute"
+        ]
+
+        return {
+            "per_minute": per_minute,
+            "overall": self._aggregate_overall(per_minute)
+        }
+
+    def iter_video(self, progress_every: int = 10):
+        """
+        Incremental processing. Yields:
+        - {"type": "progress", "frame": n, "total_frames": N} every `progress_every` samples
+        - {"type": "minute", "data": {...}} whenever a minute is finalized
+        """
+        cap = cv2.VideoCapture(self.video_path)
+        state = self._new_stream_state(cap)
+
+        yield from self._consume(cap, state, progress_every)
+        cap.release()
+
+        last = self._flush_stream(state)
+        if last:
+            yield {"type": "minute", "data": last}
+
+    # --------------------------------------------------
+    # Streaming (live sessions)
+    # --------------------------------------------------
+    def feed(self, path: str = None, growing: bool = False):
+        """
+        Process only new frames and return the minutes they complete.
+        - chunk files: pass each new chunk as `path`; frame counters continue
+        - growing file: pass growing=True to resume after the frames already seen
+        Sampling state (prev_gray, stride, minute bucket, emotion window) persists.
+        """
+        cap = cv2.VideoCapture(path or self.video_path)
+
+        if self._stream is None:
+            self._stream = self._new_stream_state(cap)
+        elif growing:
+            cap = self._seek(cap, path or self.video_path, self._stream["frame_count"])
+
+        minutes = [
+            event["data"] for event in self._consume(cap, self._stream)
+            if event["type"] == "minute"
+        ]
+        cap.release()
+        return minutes
+
+    def flush(self):
+        """Finalize the in-progress minute of a live session (None if empty)."""
+        if self._stream is None:
+            return None
+        return self._flush_stream(self._stream)
+
+    # --------------------------------------------------
+    # Single windows (preview mode)
+    # --------------------------------------------------
+    def duration_minutes(self):
+        """Number of (possibly partial) minute windows in the video."""
         cap = cv2.VideoCapture(self.video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        cap.release()
+        return int(np.ceil(total_frames / int(fps * 60))) if total_frames else 0
+
+    def analyze_window(self, minute):
+        """
+        Score one minute window on its own, seeking straight to it.
+        The frame one stride before the window primes the motion reference,
+        so with fixed sampling the result matches the full run's minute.
+        """
+        cap = cv2.VideoCapture(self.video_path)
+        state = self._new_stream_state(cap)
+        state["current"] = self._new_minute_bucket(minute)
+
+        start = minute * state["frames_per_minute"]
+        prime = start - state["stride"]
+        if prime > 0:
+            cap = self._seek(cap, self.video_path, prime - 1)
+            if cap.grab():
+                success, frame = cap.retrieve()
+                if success:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    state["prev_gray"] = gray
+                    if self.adaptive_sampling:
+                        state["prev_thumb"] = cv2.resize(
+                            gray, ACTIVITY_THUMB_SIZE, interpolation=cv2.INTER_AREA
+                        )
+            state["frame_count"] = state["last_sampled"] = prime
+            state["next_sample"] = start
+
+        result = None
+        for event in self._consume(cap, state):
+            if event["type"] == "minute":
+                result = event["data"]
+                break
+        cap.release()
+
+        return result or self._flush_stream(state)
+
+    def _seek(self, cap, path, frame_index):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index:
+            return cap
+
+        # Container can't seek precisely → reopen and skip sequentially
+        cap.release()
+        cap = cv2.VideoCapture(path)
+        for _ in range(frame_index):
+            if not cap.grab():
+                break
+        return cap
+
+    # --------------------------------------------------
+    # Frame loop
+    # --------------------------------------------------
+    def _new_stream_state(self, cap):
         fps = cap.get(cv2.CAP_PROP_FPS) or 30
         frames_per_minute = int(fps * 60)
 
-        frame_count = 0
-        prev_gray = None
+        min_stride, max_stride = self._stride_bounds(fps, frames_per_minute)
+        stride = FRAME_EXTRACTION_RATE
+        if self.adaptive_sampling:
+            stride = int(np.clip(stride, min_stride, max_stride))
+
+        self.features = {
+            "minute": [],
+            "weight": [],
+            "face_area": [],
+            "face_found": [],
+            "motion_raw": [],      # NaN for the first sample (no previous frame)
+            "emotions": {}         # minute → dominant emotion
+        }
 
-        # Minute-level accumulators
-        per_minute = []
-        current = self._new_minute_bucket()
+        return {
+            "frames_per_minute": frames_per_minute,
+            "total_frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0),
+            "min_stride": min_stride,
+            "max_stride": max_stride,
+            "stride": stride,
+            "frame_count": 0,
+            "last_sampled": 0,
+            "next_sample": stride,
+            "prev_gray": None,
+            "prev_thumb": None,
+            "samples": 0,
+            "features": self.features,
+            # Minute-level accumulators
+            "current": self._new_minute_bucket()
+        }
 
+    def _consume(self, cap, state, progress_every: int = 10):
         while cap.isOpened():
-            success, frame = cap.read()
-            if not success:
+            # grab() advances without converting; only sampled frames are retrieved
+            if not cap.grab():
                 break
 
-            frame_count += 1
-            if frame_count % FRAME_EXTRACTION_RATE != 0:
+            state["frame_count"] += 1
+            frame_count = state["frame_count"]
+            if frame_count < state["next_sample"]:
                 continue
 
-            minute_idx = int(frame_count / frames_per_minute)
+            success, frame = cap.retrieve()
+            if not success:
+                break
+
+            # Time weight: number of frames this sample stands for
+            weight = frame_count - state["last_sampled"]
+            state["last_sampled"] = frame_count
+
+            minute_idx = int(frame_count / state["frames_per_minute"])
+            current = state["current"]
 
             # New minute → flush
             if minute_idx > current["minute"]:
-                per_minute.append(self._finalize_minute(current))
-                current = self._new_minute_bucket(minute_idx)
+                yield {"type": "minute", "data": self._finalize_minute(current)}
+                current = state["current"] = self._new_minute_bucket(minute_idx)
 
             current["frames"] += 1
+            current["weight"] += weight
 
             # ---------------- Engagement ----------------
-            engagement, face_found = self.analyze_engagement(frame)
-            current["engagement_sum"] += engagement
+            area_ratio = self.face_area_ratio(frame)
+            face_found = area_ratio is not None
+            current["engagement_sum"] += float(
+                engagement(area_ratio or 0.0, face_found, self.weights["engagement"])
+            ) * weight
             if face_found:
-                current["face_detected"] += 1
+                current["face_detected"] += weight
 
             # ---------------- Motion / Gesture ----------------
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            if prev_gray is not None:
-                diff = cv2.absdiff(prev_gray, gray)
+            motion_raw = float("nan")
+            if state["prev_gray"] is not None:
+                diff = cv2.absdiff(state["prev_gray"], gray)
                 _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
-                motion_ratio = cv2.countNonZero(thresh) / thresh.size
-                current["gesture_energy"] += motion_ratio
-                if motion_ratio > 0.001:
-                    current["motion_detected"] += 1
+                motion_raw = cv2.countNonZero(thresh) / thresh.size
+                motion_ratio = float(normalized_motion(motion_raw, weight))
+                current["gesture_energy"] += motion_ratio * weight
+                if motion_ratio > self.weights["video_confidence"]["motion_threshold"]:
+                    current["motion_detected"] += weight
 
-            prev_gray = gray
+            state["prev_gray"] = gray
+
+            features = state["features"]
+            features["minute"].append(minute_idx)
+            features["weight"].append(weight)
+            features["face_area"].append(area_ratio or 0.0)
+            features["face_found"].append(face_found)
+            features["motion_raw"].append(motion_raw)
 
             # ---------------- Emotion (Sparse) ----------------
             if self.enable_emotion and current["frames"] % 5 == 0:
@@ -156,15 +354,45 @@ class VideoAnalyzer:
                 smooth = Counter(self.emotion_window).most_common(1)[0][0]
                 current["emotion_counts"][smooth] += 1
 
-        cap.release()
+            # ---------------- Next sample ----------------
+            if self.adaptive_sampling:
+                thumb = cv2.resize(gray, ACTIVITY_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+                if state["prev_thumb"] is not None:
+                    activity = float(np.mean(cv2.absdiff(state["prev_thumb"], thumb))) / 255.0
+                    state["stride"] = self._next_stride(
+                        state["stride"], activity, state["min_stride"], state["max_stride"]
+                    )
+                state["prev_thumb"] = thumb
+
+            state["next_sample"] = frame_count + state["stride"]
+
+            state["samples"] += 1
+            if state["samples"] % progress_every == 0:
+                yield {"type": "progress", "frame": frame_count, "total_frames": state["total_frames"]}
+
+    def _flush_stream(self, state):
+        current = state["current"]
+        if current["frames"] == 0:
+            return None
 
-        if current["frames"] > 0:
-            per_minute.append(self._finalize_minute(current))
+        state["current"] = self._new_minute_bucket(current["minute"] + 1)
+        return self._finalize_minute(current)
 
-        return {
-            "per_minute": per_minute,
-            "overall": self._aggregate_overall(per_minute)
-        }
+    # --------------------------------------------------
+    # Adaptive sampling
+    # --------------------------------------------------
+    def _stride_bounds(self, fps, frames_per_minute):
+        # Densest stride allowed by the per-minute budget, sparsest by max gap
+        min_stride = max(1, int(np.ceil(frames_per_minute / SAMPLING_BUDGET_PER_MIN)))
+        max_stride = max(min_stride, int(fps * SAMPLING_MAX_GAP_SEC))
+        return min_stride, max_stride
+
+    def _next_stride(self, stride, activity, min_stride, max_stride):
+        if activity > ACTIVITY_HIGH:
+            return max(min_stride, stride // 2)
+        if activity < ACTIVITY_LOW:
+            return min(max_stride, stride * 2)
+        return stride
 
     # --------------------------------------------------
     # Helpers
@@ -173,6 +401,7 @@ class VideoAnalyzer:
         return {
             "minute": minute,
             "frames": 0,
+            "weight": 0,
             "engagement_sum": 0.0,
             "gesture_energy": 0.0,
             "face_detected": 0,
@@ -184,43 +413,28 @@ class VideoAnalyzer:
         if m["frames"] == 0:
             return None
 
+        w = m["weight"]
+
         dominant_emotion = (
             m["emotion_counts"].most_common(1)[0][0]
             if m["emotion_counts"]
             else "neutral"
         )
 
+        if self.features is not None:
+            self.features["emotions"][m["minute"]] = dominant_emotion
+
         return {
             "minute": m["minute"],
-            "engagement_score": round((m["engagement_sum"] / m["frames"]) * 100, 2),
-            "gesture_index": round((m["gesture_energy"] / m["frames"]) * 100, 2),
+            "engagement_score": round((m["engagement_sum"] / w) * 100, 2),
+            "gesture_index": round((m["gesture_energy"] / w) * 100, 2),
             "dominant_emotion": dominant_emotion,
-            "confidence_score": round(
-                (
-                    0.6 * (m["face_detected"] / m["frames"]) +
-                    0.4 * (m["motion_detected"] / m["frames"])
-                ) * 100,
-                2
-            )
+            "confidence_score": round(float(video_confidence_score(
+                m["face_detected"] / w,
+                m["motion_detected"] / w,
+                self.weights["video_confidence"]
+            )), 2)
         }
 
     def _aggregate_overall(self, per_minute):
-        if not per_minute:
-            return {
-                "engagement_score": 0.0,
-                "gesture_index": 0.0,
-                "dominant_emotion": "neutral",
-                "confidence_score": 0.0
-            }
-
-        engagement = [m["engagement_score"] for m in per_minute]
-        gesture = [m["gesture_index"] for m in per_minute]
-        confidence = [m["confidence_score"] for m in per_minute]
-        emotions = [m["dominant_emotion"] for m in per_minute]
-
-        return {
-            "engagement_score": round(float(np.mean(engagement)), 2),
-            "gesture_index": round(float(np.mean(gesture)), 2),
-            "confidence_score": round(float(np.mean(confidence)), 2),
-            "dominant_emotion": Counter(emotions).most_common(1)[0][0]
-        }
+        return aggregate_video(per_minute)
@@ -0,0 +1,113 @@
+"""
+Score formulas shared by the analyzers and the re-scoring path.
+
+Every function takes raw per-window features (scalars or NumPy arrays) and a
+weight group from SCORING_WEIGHTS, so a live analysis and a later rescore of
+stored features produce the same numbers for the same weights.
+"""
+import copy
+from collections import Counter
+import numpy as np
+from config.settings import SCORING_WEIGHTS, FRAME_EXTRACTION_RATE
+
+
+def _weight_value(group, key, value):
+    try:
+        number = float(value) if not isinstance(value, bool) else None
+    except (TypeError, ValueError):
+        number = None
+    if number is None or not np.isfinite(number):
+        raise ValueError(f"Weight '{group}.{key}' must be a finite number")
+    # *_ref values are divisors (reference levels): zero would divide by zero
+    if number < 0 or (key.endswith("_ref") and number == 0):
+        raise ValueError(f"Weight '{group}.{key}' must be {'> 0' if key.endswith('_ref') else '>= 0'}")
+    return number
+
+
+def resolve_weights(overrides=None):
+    """Default SCORING_WEIGHTS with a (partial) override dict merged in (ValueError if invalid)."""
+    weights = copy.deepcopy(SCORING_WEIGHTS)
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError("Weights must be an object of weight groups")
+    for group, values in (overrides or {}).items():
+        if group not in weights:
+            raise ValueError(f"Unknown scoring weight group: {group}")
+        if not isinstance(values, dict):
+            raise ValueError(f"Weights for '{group}' must be an object")
+        unknown = set(values) - set(weights[group])
+        if unknown:
+            raise ValueError(f"Unknown weights for '{group}': {sorted(unknown)}")
+        weights[group].update({k: _weight_value(group, k, v) for k, v in values.items()})
+    return weights
+
+
+# --------------------------------------------------
+# Audio (per minute window)
+# --------------------------------------------------
+def clarity_score(non_silent_ratio, flatness_mean, rms_std, w):
+    energy = np.maximum(0.0, 1 - np.asarray(rms_std) / w["energy_std_ref"])
+    score = (
+        np.asarray(non_silent_ratio) * w["pause"] +
+        (1 - np.asarray(flatness_mean)) * w["noise"] +
+        energy * w["energy"]
+    ) * 100
+    return np.clip(score, 0, 100)
+
+
+def audio_confidence_score(rms_mean, rms_std, rms_frames, w):
+    loudness = np.minimum(1.0, np.asarray(rms_mean) / w["loudness_ref"])
+    stability = np.maximum(0.0, 1 - np.asarray(rms_std) / w["stability_std_ref"])
+    score = (loudness * w["loudness"] + stability * w["stability"]) * 100
+    return np.where(np.asarray(rms_frames) < w["min_frames"], 0.0, score)
+
+
+# --------------------------------------------------
+# Video (per sampled frame, weighted by frames it stands for)
+# --------------------------------------------------
+def engagement(face_area, face_found, w):
+    value = np.minimum(1.0, w["base"] + np.asarray(face_area) * w["area_gain"])
+    return np.where(face_found, value, 0.0)
+
+
+def normalized_motion(motion_raw, weight):
+    # Normalise to the reference gap so dense/sparse samples compare
+    return np.minimum(1.0, np.asarray(motion_raw) * FRAME_EXTRACTION_RATE / np.asarray(weight))
+
+
+def video_confidence_score(face_share, motion_share, w):
+    return (w["face"] * np.asarray(face_share) + w["motion"] * np.asarray(motion_share)) * 100
+
+
+# --------------------------------------------------
+# Overall aggregation
+# --------------------------------------------------
+def aggregate_audio(per_minute):
+    clarity_vals = [m["clarity_score"] for m in per_minute]
+    confidence_vals = [m["confidence_score"] for m in per_minute]
+
+    return {
+        "clarity_score": round(float(np.mean(clarity_vals)), 2) if clarity_vals else 0.0,
+        "confidence_score": round(float(np.mean(confidence_vals)), 2) if confidence_vals else 0.0
+    }
+
+
+def aggregate_video(per_minute):
+    if not per_minute:
+        return {
+            "engagement_score": 0.0,
+            "gesture_index": 0.0,
+            "dominant_emotion": "neutral",
+            "confidence_score": 0.0
+        }
+
+    engagement_vals = [m["engagement_score"] for m in per_minute]
+    gesture = [m["gesture_index"] for m in per_minute]
+    confidence = [m["confidence_score"] for m in per_minute]
+    emotions = [m["dominant_emotion"] for m in per_minute]
+
+    return {
+        "engagement_score": round(float(np.mean(engagement_vals)), 2),
+        "gesture_index": round(float(np.mean(gesture)), 2),
+        "confidence_score": round(float(np.mean(confidence)), 2),
+        "dominant_emotion": Counter(emotions).most_common(1)[0][0]
+    }
@@ -0,0 +1,132 @@
+"""
+Pre-fork serving helpers.
+
+- preload_models(): load Whisper / MiniLM / topic embeddings in the master
+  process; forked workers then share the weight pages copy-on-write (tensor
+  storage is never written by inference, only Python object headers are)
+- JobLimiter: per-worker cap on concurrent analyses (extra requests are
+  rejected with 503 instead of oversubscribing the worker's torch threads)
+- memory_footprint(): RSS / PSS / private (USS) of a process from
+  /proc/<pid>/smaps_rollup. PSS counts shared pages divided by the number of
+  processes mapping them, so it is the honest per-worker footprint.
+"""
+import gc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from config.settings import SERVE_PRELOAD_WHISPER, SERVE_WORKER_CONCURRENCY
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class WorkerBusy(RuntimeError):
+    pass
+
+
+# --------------------------------------------------
+# Model preload (master, before fork)
+# --------------------------------------------------
+def preload_models(whisper_sizes=SERVE_PRELOAD_WHISPER):
+    from src.inference import get_whisper_model, get_sentence_model, sentence_model_key
+    from src.processors.topic_catalog import get_topic_cache, get_topic_catalog
+
+    start = time.time()
+    for size in whisper_sizes:
+        get_whisper_model(size=size)
+
+    model = get_sentence_model()
+    key = sentence_model_key()
+    get_topic_cache(model, key)
+    get_topic_catalog(model, key)
+
+    # No warm-up inference here: torch's OpenMP pool must not start before fork.
+    # Frozen objects are skipped by the cyclic GC, so collections in the
+    # workers don't write to (and un-share) the preloaded pages.
+    gc.collect()
+    gc.freeze()
+
+    print(f"[SERVE] Preloaded models in {time.time() - start:.1f}s "
+          f"(whisper: {', '.join(whisper_sizes) or 'none'}) | {format_footprint(memory_footprint())}")
+
+
+# --------------------------------------------------
+# Memory
+# --------------------------------------------------
+def memory_footprint(pid=None):
+    """MB figures for a process: rss, pss, shared, private (+ peak_rss for self)."""
+    footprint = {}
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    if os.path.exists(path):
+        fields = {}
+        with open(path, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024   # kB → MB
+        footprint = {
+            "rss": round(fields.get("Rss", 0.0), 1),
+            "pss": round(fields.get("Pss", 0.0), 1),
+            "shared": round(fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0), 1),
+            "private": round(fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0), 1),
+        }
+
+    if pid is None and resource:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        footprint["peak_rss"] = round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    return footprint
+
+
+def format_footprint(footprint):
+    return " ".join(f"{k}={v:.0f}MB" for k, v in footprint.items()) or "memory n/a"
+
+
+# --------------------------------------------------
+# Per-worker concurrency
+# --------------------------------------------------
+class JobLimiter:
+    """At most `limit` analyses at once in this worker; the rest get WorkerBusy."""
+
+    def __init__(self, limit=SERVE_WORKER_CONCURRENCY):
+        self.limit = max(1, limit)
+        self._slots = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_pss = 0.0
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise WorkerBusy(f"Worker {os.getpid()} is running {self.limit} analysis job(s)")
+
+        with self._lock:
+            self.active += 1
+        try:
+            yield
+        finally:
+            footprint = memory_footprint()
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.max_pss = max(self.max_pss, footprint.get("pss", 0.0))
+            self._slots.release()
+            print(f"[SERVE] Worker {os.getpid()} job done | {format_footprint(footprint)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "max_pss_after_job_mb": round(self.max_pss, 1)
+            }
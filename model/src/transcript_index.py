@@ -0,0 +1,270 @@
+"""
+Append-only, memory-mapped index of transcript chunk embeddings.
+
+One index directory per embedding model key under TRANSCRIPT_INDEX_DIR
+(vectors of different models / backends are not comparable), laid out as:
+- meta.json      dim, dtype, embedding model key, institution → code table
+- vectors.bin    N x dim normalized embeddings (float16 or float32), row-major
+- inst.bin       N int32 institution codes (filter column)
+- rows.jsonl     one JSON object per row (session_id, chunk, text, ...)
+- rows.off       N int64 byte offsets into rows.jsonl
+
+Opening maps the files (np.memmap) without reading them; search streams over
+the mapped rows in fixed-size blocks, so RAM stays flat as the index grows.
+"""
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from config.settings import (
+    TRANSCRIPT_INDEX_DIR,
+    TRANSCRIPT_INDEX_DTYPE,
+    TRANSCRIPT_CHUNK_WORDS,
+    TRANSCRIPT_CHUNK_OVERLAP,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process appends only
+    fcntl = None
+
+SEARCH_BLOCK_ROWS = 4096
+NO_INSTITUTION = -1
+
+
+def chunk_transcript(transcript, words=TRANSCRIPT_CHUNK_WORDS, overlap=TRANSCRIPT_CHUNK_OVERLAP):
+    """Overlapping word windows: [(start_word, text), ...]."""
+    tokens = (transcript or "").split()
+    if not tokens:
+        return []
+
+    step = max(1, words - overlap)
+    chunks = []
+    for start in range(0, len(tokens), step):
+        chunks.append((start, " ".join(tokens[start:start + words])))
+        if start + words >= len(tokens):
+            break
+    return chunks
+
+
+class TranscriptIndex:
+    def __init__(self, index_dir=TRANSCRIPT_INDEX_DIR, dim=None, dtype=TRANSCRIPT_INDEX_DTYPE, model_key=None):
+        self.index_dir = os.path.abspath(index_dir)
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        self._meta_path = os.path.join(self.index_dir, "meta.json")
+        self._vec_path = os.path.join(self.index_dir, "vectors.bin")
+        self._inst_path = os.path.join(self.index_dir, "inst.bin")
+        self._rows_path = os.path.join(self.index_dir, "rows.jsonl")
+        self._off_path = os.path.join(self.index_dir, "rows.off")
+        self._lock = threading.Lock()
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if dim and dim != self.meta["dim"]:
+                raise ValueError(f"Index dim {self.meta['dim']} != embedding dim {dim}")
+            if model_key and self.meta.get("model_key") not in (None, model_key):
+                raise ValueError(
+                    f"Index built with '{self.meta['model_key']}', not '{model_key}'"
+                )
+        else:
+            if not dim:
+                raise ValueError("A new transcript index needs the embedding dim")
+            self.meta = {
+                "dim": int(dim),
+                "dtype": np.dtype(dtype).name,
+                "model_key": model_key,
+                "institutions": {}
+            }
+            self._write_meta()
+
+        self.dim = self.meta["dim"]
+        self.dtype = np.dtype(self.meta["dtype"])
+
+    # --------------------------------------------------
+    # Size / mapping
+    # --------------------------------------------------
+    def __len__(self):
+        if not all(os.path.exists(p) for p in (self._vec_path, self._inst_path, self._off_path)):
+            return 0
+        # A crash mid-append can leave files uneven → trust the shortest
+        n_vec = os.path.getsize(self._vec_path) // (self.dim * self.dtype.itemsize)
+        n_inst = os.path.getsize(self._inst_path) // 4
+        n_off = os.path.getsize(self._off_path) // 8
+        return min(n_vec, n_inst, n_off)
+
+    def _map(self):
+        n = len(self)
+        if n == 0:
+            return n, None, None, None
+        vectors = np.memmap(self._vec_path, dtype=self.dtype, mode="r", shape=(n, self.dim))
+        inst = np.memmap(self._inst_path, dtype=np.int32, mode="r", shape=(n,))
+        offsets = np.memmap(self._off_path, dtype=np.int64, mode="r", shape=(n,))
+        return n, vectors, inst, offsets
+
+    def _repair(self):
+        # Drop the tail of an interrupted append so all columns line up again
+        n = len(self)
+        rows_end = 0
+        if n:
+            # rows.jsonl ends after the last row that has a vector
+            last = np.fromfile(self._off_path, dtype=np.int64, count=1, offset=(n - 1) * 8)[0]
+            with open(self._rows_path, "rb") as f:
+                f.seek(int(last))
+                f.readline()
+                rows_end = f.tell()
+
+        for path, size in (
+            (self._vec_path, n * self.dim * self.dtype.itemsize),
+            (self._inst_path, n * 4),
+            (self._off_path, n * 8),
+            (self._rows_path, rows_end),
+        ):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _reload_meta(self):
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self.meta["institutions"] = json.load(f)["institutions"]
+
+    def _write_meta(self):
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def _institution_code(self, institution_id, create=False):
+        if institution_id is None:
+            return NO_INSTITUTION
+        table = self.meta["institutions"]
+        key = str(institution_id)
+        if key not in table and create:
+            table[key] = len(table)
+            self._write_meta()
+        return table.get(key)
+
+    # --------------------------------------------------
+    # Append
+    # --------------------------------------------------
+    def add(self, embeddings, rows, institution_id=None):
+        """Append normalized embeddings (n x dim) with one row dict each."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.dim:
+            raise ValueError(f"Expected (n, {self.dim}) embeddings, got {embeddings.shape}")
+        if len(rows) != len(embeddings):
+            raise ValueError("One row per embedding is required")
+        if len(rows) == 0:
+            return 0
+
+        with self._lock, open(os.path.join(self.index_dir, ".lock"), "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            self._repair()
+
+            # Another worker may have registered institutions meanwhile
+            self._reload_meta()
+            code = self._institution_code(institution_id, create=True)
+
+            # Row table first, then offsets / filter column, vectors last:
+            # len() only counts rows whose vector is complete
+            offsets = []
+            with open(self._rows_path, "ab") as f:
+                for row in rows:
+                    offsets.append(f.tell())
+                    f.write((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+
+            with open(self._off_path, "ab") as f:
+                f.write(np.asarray(offsets, dtype=np.int64).tobytes())
+            with open(self._inst_path, "ab") as f:
+                f.write(np.full(len(rows), code, dtype=np.int32).tobytes())
+            with open(self._vec_path, "ab") as f:
+                f.write(embeddings.astype(self.dtype).tobytes())
+
+        return len(rows)
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+    def search(self, query_embedding, institution_id, k=10):
+        """
+        Top-k cosine matches restricted to one institution.
+        Returns [{"score", **row}] best first.
+        """
+        if institution_id is None or not str(institution_id).strip():
+            raise ValueError("institution_id is required")
+        n, vectors, inst, offsets = self._map()
+        code = self._institution_code(institution_id)
+        if code is None:
+            self._reload_meta()
+            code = self._institution_code(institution_id)
+        if n == 0 or code is None:
+            return []
+
+        q = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+        best_idx = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        # Reused float32 buffer: small enough to stay cache-friendly
+        buf = np.empty((min(n, SEARCH_BLOCK_ROWS), self.dim), dtype=np.float32)
+
+        for start in range(0, n, SEARCH_BLOCK_ROWS):
+            end = min(n, start + SEARCH_BLOCK_ROWS)
+            rows = np.flatnonzero(inst[start:end] == code)
+            if len(rows) == 0:
+                continue
+
+            block = buf[:len(rows)]
+            if len(rows) == end - start:
+                block[...] = vectors[start:end]
+            else:
+                block[...] = vectors[start + rows]
+            scores = block @ q
+
+            idx = rows + start
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                idx, scores = idx[top], scores[top]
+
+            best_idx = np.concatenate([best_idx, idx])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                top = np.argpartition(-best_scores, k - 1)[:k]
+                best_idx, best_scores = best_idx[top], best_scores[top]
+
+        order = np.argsort(-best_scores)
+        return [
+            {"score": round(float(best_scores[i]), 4), **self._row(offsets[best_idx[i]])}
+            for i in order
+        ]
+
+    def _row(self, offset):
+        with open(self._rows_path, "rb") as f:
+            f.seek(int(offset))
+            return json.loads(f.readline().decode("utf-8"))
+
+
+# --------------------------------------------------
+# Shared instances (one per embedding model / backend)
+# --------------------------------------------------
+_INDEXES = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def index_dir_for(model_key, root=TRANSCRIPT_INDEX_DIR):
+    """Directory of the index for one embedding space (a new backend starts a new index)."""
+    digest = hashlib.sha1(str(model_key).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(root, digest)
+
+
+def get_transcript_index(dim=None, model_key=None):
+    """Process-wide index for `model_key` under TRANSCRIPT_INDEX_DIR (created on first write)."""
+    with _INDEX_LOCK:
+        if model_key not in _INDEXES:
+            _INDEXES[model_key] = TranscriptIndex(index_dir_for(model_key), dim=dim, model_key=model_key)
+        return _INDEXES[model_key]
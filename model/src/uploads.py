@@ -0,0 +1,164 @@
+"""
+Streaming multipart/form-data receiver.
+
+The request body is fed chunk by chunk (as the server receives it) into
+python-multipart's push parser: the file part is written straight to a temp
+file and hashed (sha256) on the way, form fields are kept in memory. Memory
+stays at one network chunk regardless of upload size.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_FIELD_BYTES = 64 * 1024
+SAFE_SUFFIX_RE = re.compile(r"^\.[A-Za-z0-9]{1,8}$")
+
+
+class UploadError(ValueError):
+    """Malformed upload (400)."""
+
+
+class UploadTooLarge(UploadError):
+    """File part exceeds the size limit (413)."""
+
+
+class StreamingUpload:
+    """
+    Push parser for one multipart body with a single file field.
+
+        upload = StreamingUpload(content_type, "video", upload_dir, max_bytes)
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.finish()
+        upload.path, upload.sha256, upload.size, upload.fields
+
+    On any error call discard() to remove the partial file.
+    """
+
+    def __init__(self, content_type, file_field, upload_dir, max_bytes):
+        ctype, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if ctype != b"multipart/form-data" or not boundary:
+            raise UploadError("Expected multipart/form-data with a boundary")
+
+        os.makedirs(upload_dir, exist_ok=True)
+        self.file_field = file_field
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+
+        self.fields = {}
+        self.filename = None
+        self.path = None
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = None
+
+        # Current part
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = None
+        self._value = None
+
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    # --------------------------------------------------
+    # Feeding
+    # --------------------------------------------------
+    def write(self, chunk):
+        if chunk:
+            self._parser.write(chunk)
+
+    def finish(self):
+        self._parser.finalize()
+        if self._file:
+            raise UploadError("Upload ended inside the file part")
+        if not self.path:
+            raise UploadError(f"Missing '{self.file_field}' file in form data")
+
+    def discard(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+    # --------------------------------------------------
+    # Parser callbacks
+    # --------------------------------------------------
+    def _on_part_begin(self):
+        self._headers = {}
+        self._name = None
+        self._value = None
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+
+        if filename is None or self._name != self.file_field:
+            self._value = bytearray()
+            return
+        if self.path:
+            raise UploadError(f"More than one '{self.file_field}' file in form data")
+
+        self.filename = os.path.basename(filename.decode("utf-8", "replace"))
+        if not self.filename:
+            raise UploadError(f"Missing '{self.file_field}' file in form data")
+        suffix = os.path.splitext(self.filename)[1]
+        fd, self.path = tempfile.mkstemp(
+            suffix=suffix if SAFE_SUFFIX_RE.match(suffix) else ".mp4",
+            prefix="upload_", dir=self.upload_dir
+        )
+        self._file = os.fdopen(fd, "wb")
+
+    def _on_part_data(self, data, start, end):
+        chunk = data[start:end]
+        if self._file:
+            self.size += len(chunk)
+            if self.size > self.max_bytes:
+                raise UploadTooLarge(f"File exceeds {self.max_bytes // (1024 * 1024)} MB")
+            self._hash.update(chunk)
+            self._file.write(chunk)
+        elif self._value is not None:
+            if len(self._value) + len(chunk) > MAX_FIELD_BYTES:
+                raise UploadError(f"Form field '{self._name}' is too large")
+            self._value += chunk
+
+    def _on_part_end(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        elif self._value is not None and self._name:
+            self.fields[self._name] = self._value.decode("utf-8", "replace")
+        self._value = None
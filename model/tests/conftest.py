@@ -0,0 +1,120 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zlib
+
+import numpy as np
+import pytest
+
+# Tests import the service modules the way app.py does (`from src...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Caches / indexes / stores out of the working tree (settings are read at import)
+_STATE_DIR = tempfile.mkdtemp(prefix="shiksha-tests-")
+for _var, _name in (
+    ("TOPIC_CACHE_DIR", "topic_cache"),
+    ("TRANSCRIPT_INDEX_DIR", "transcript_index"),
+    ("FEATURE_STORE_DIR", "feature_store"),
+):
+    os.environ.setdefault(_var, os.path.join(_STATE_DIR, _name))
+
+SR = 16000
+TRANSCRIPT = (
+    "today we will learn about neural networks and gradient descent. "
+    "what happens when the learning rate is too large? let's try it together. "
+    "um, so our model overshoots the minimum."
+)
+
+
+# --------------------------------------------------
+# Models: weights can't be downloaded in CI, so the shared model caches in
+# src.inference are pre-filled with small deterministic stand-ins
+# --------------------------------------------------
+class FakeWhisper:
+    def __init__(self, text=TRANSCRIPT):
+        self.text = text
+        self.calls = []
+
+    def transcribe(self, audio, fp16=False, language=None, **kwargs):
+        self.calls.append({"samples": len(audio), "language": language})
+        return {"text": f" {self.text} "}
+
+
+class FakeSentenceModel:
+    """Hashed bag-of-words embeddings: texts sharing words have close vectors."""
+    dim = 384
+
+    def _embed(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vec[zlib.crc32(word.encode("utf-8")) % self.dim] += 1.0
+        return vec / max(float(np.linalg.norm(vec)), 1e-12)
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        if isinstance(texts, str):
+            return self._embed(texts)
+        return np.stack([self._embed(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    from config.settings import INFERENCE_BACKENDS, SENTENCE_MODEL_NAME, WHISPER_MODEL_LADDER
+    from src import inference
+
+    whisper_model, sentence_model = FakeWhisper(), FakeSentenceModel()
+    for backend in INFERENCE_BACKENDS:
+        for size in WHISPER_MODEL_LADDER:
+            monkeypatch.setitem(inference._WHISPER_MODELS, (size, backend), whisper_model)
+        monkeypatch.setitem(inference._SENTENCE_MODELS, (SENTENCE_MODEL_NAME, backend), sentence_model)
+    return whisper_model, sentence_model
+
+
+# --------------------------------------------------
+# Media: synthetic lecture (moving shape + voiced bursts), muxed with ffmpeg
+# --------------------------------------------------
+def write_lecture(path, seconds, fps=5, size=(160, 120), seed=0):
+    import cv2
+    import soundfile as sf
+
+    if not shutil.which("ffmpeg"):
+        pytest.skip("ffmpeg not installed")
+
+    rng = np.random.default_rng(seed)
+    width, height = size
+    silent = path + ".video.avi"
+    writer = cv2.VideoWriter(silent, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(int(seconds * fps)):
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        # Moves during odd half-minutes, still otherwise
+        x = 30 + (i % 90) if (i // (30 * fps)) % 2 else 30
+        cv2.circle(frame, (x, height // 2), 15, (200, 180, 160), -1)
+        writer.write(frame)
+    writer.release()
+
+    t = np.arange(int(seconds * SR)) / SR
+    envelope = (np.sin(2 * np.pi * 0.3 * t) > -0.2) * (0.2 + 0.1 * np.sin(2 * np.pi * 0.01 * t))
+    audio = envelope * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 0.01, len(t))
+    wav = path + ".audio.wav"
+    sf.write(wav, audio.astype(np.float32), SR)
+
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", silent, "-i", wav,
+         "-c:v", "copy", "-c:a", "pcm_s16le", "-shortest", path],
+        check=True
+    )
+    os.remove(silent)
+    os.remove(wav)
+    return path
+
+
+@pytest.fixture
+def make_lecture(tmp_path):
+    def make(seconds, name="lecture.avi", **kwargs):
+        return write_lecture(str(tmp_path / name), seconds, **kwargs)
+    return make
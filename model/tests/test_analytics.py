@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.analytics import _column, aggregate_sessions
+
+
+def _report(teacher, clarity, per_minute):
+    return {
+        "teacher_id": teacher,
+        "created_at": "2026-01-05T10:00:00Z",
+        "scores": {
+            "audio": {"overall": {"clarity_score": clarity}, "per_minute": per_minute},
+            "video": {"overall": {"engagement_score": 50.0}, "per_minute": []},
+            "text": {"technical_depth": 40.0},
+        },
+    }
+
+
+@pytest.mark.parametrize("value", [75, 75.5, "75", " 80.5 ", True, None, "abc", [1], {"a": 1}])
+def test_column_fast_and_slow_paths_coerce_alike(value):
+    fast = _column([{"v": value}], "v")[0]
+    # A row without the key forces the slow path for the whole column
+    slow = _column([{"v": value}, {}], "v")[0]
+    assert (math.isnan(fast) and math.isnan(slow)) or fast == slow
+
+
+def test_column_malformed_rows_are_nan():
+    col = _column([{"v": 1.0}, None, 3, "x", {"v": 2.0}], "v")
+    assert col[0] == 1.0 and col[4] == 2.0
+    assert np.isnan(col[1:4]).all()
+
+
+def test_aggregate_skips_malformed_rows():
+    good_minutes = [
+        {"minute": 0, "clarity_score": 60.0, "confidence_score": 50.0},
+        {"minute": 1, "clarity_score": 70.0, "confidence_score": 55.0},
+    ]
+    sessions = [
+        _report("t1", 60.0, good_minutes),
+        _report("t1", "70", [None, {"minute": 0, "clarity_score": "80"}, 5, "oops"]),
+        _report("t2", 80.0, None),
+        {"teacher_id": "t2", "scores": {"audio": None, "video": "bad"}},
+        {"teacher_id": "t3", "audioPerMinute": [None, {"minute": 0, "clarity_score": 90.0}]},
+        None,
+    ]
+    result = aggregate_sessions(sessions)
+
+    assert result["sessions"] == 6
+    assert result["summary"]["clarity_score"]["count"] == 3
+    assert result["summary"]["clarity_score"]["mean"] == 70.0
+    # minute 0: 60, 80, 90 → 76.67; minute 1: 70
+    assert result["minute_profile"]["clarity_score"] == [76.67, 70.0]
+    assert result["within_session"]["clarity_score"]["sessions"] == 1
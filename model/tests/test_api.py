@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+BOUNDARY = "shiksha-test"
+BODY = (
+    f"--{BOUNDARY}\r\n"
+    'Content-Disposition: form-data; name="video"; filename="lecture.mp4"\r\n'
+    "Content-Type: video/mp4\r\n\r\n"
+).encode("utf-8") + b"\x00" * 4096
+# Raw ASGI scope: the tests control exactly when the body stops arriving
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+    "method": "POST", "scheme": "http", "path": "/analyze", "raw_path": b"/analyze",
+    "query_string": b"", "root_path": "", "client": ("test", 1), "server": ("test", 80),
+    "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    import api
+
+    monkeypatch.setattr(api, "API_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(api, "UPLOAD_FLUSH_BYTES", 1)
+    return api
+
+
+def _abort_mid_write(api, monkeypatch):
+    """POST /analyze whose request task is cancelled while upload_pool is writing."""
+    write = api.StreamingUpload.write
+    started, finished = threading.Event(), threading.Event()
+
+    def slow_write(self, chunk):
+        started.set()
+        time.sleep(0.3)
+        try:
+            write(self, chunk)
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(api.StreamingUpload, "write", slow_write)
+
+    chunks = [{"type": "http.request", "body": BODY, "more_body": True}]
+
+    async def receive():
+        if chunks:
+            return chunks.pop()
+        await asyncio.Event().wait()       # the rest of the body never arrives
+
+    async def send(message):
+        pass
+
+    async def run():
+        task = asyncio.create_task(api.app(SCOPE, receive, send))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert finished.wait(5)
+
+
+def test_abort_mid_upload_leaves_no_file(api, tmp_path, monkeypatch):
+    _abort_mid_write(api, monkeypatch)
+
+    deadline = time.time() + 2
+    while list(tmp_path.iterdir()) and time.time() < deadline:
+        time.sleep(0.01)
+    assert list(tmp_path.iterdir()) == []
+    assert api.state["pending"] == 0
+
+
+
+def test_disconnect_mid_upload_returns_400(api, tmp_path):
+    messages = [{"type": "http.disconnect"}, {"type": "http.request", "body": BODY, "more_body": True}]
+    sent = []
+
+    async def receive():
+        return messages.pop()
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api.app(SCOPE, receive, send))
+    assert sent[0]["status"] == 400
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+TRANSCRIPT = (
+    "today we will learn about gradient descent. what happens when the learning rate "
+    "is too large? the model overshoots the minimum, so we lower it step by step."
+)
+
+
+def _report(session_id, transcript=TRANSCRIPT):
+    return {
+        "session_id": session_id,
+        "topic": "Machine Learning",
+        "transcript": transcript,
+        "scores": {
+            "audio": {"overall": {"clarity_score": 71.0}, "per_minute": [
+                {"minute": 0, "clarity_score": 71.0, "confidence_score": 64.0},
+            ]},
+            "video": {"overall": {}, "per_minute": []},
+            "text": {"technical_depth": 55.0},
+        },
+    }
+
+
+def test_coach_import_does_not_load_the_model_stack():
+    pytest.importorskip("google.generativeai")
+    code = "import sys, src.genai.coach; print(sorted({'torch', 'src.inference'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=MODEL_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+# --------------------------------------------------
+# ContextStore eviction
+# --------------------------------------------------
+def test_context_store_is_lru_bounded(fake_models):
+    from src.genai.context_store import ContextStore
+
+    store = ContextStore(idle_sec=60, max_sessions=2)
+    first = store.get(_report("s1"))
+    second = store.get(_report("s2"))
+    assert store.get(_report("s1")) is first         # reuse refreshes s1
+    store.get(_report("s3"))                          # evicts s2
+
+    assert len(store) == 2
+    assert store.get(_report("s1")) is first
+    assert store.get(_report("s2")) is not second
+
+
+def test_context_store_rebuilds_when_transcript_changes(fake_models):
+    from src.genai.context_store import ContextStore
+
+    store = ContextStore(idle_sec=60, max_sessions=4)
+    ctx = store.get(_report("s1"))
+    assert store.get(_report("s1", transcript="a different transcript")) is not ctx
+
+
+def test_idle_sessions_are_swept_without_further_calls(fake_models):
+    from src.genai.context_store import ContextStore
+
+    store = ContextStore(idle_sec=0.2, max_sessions=4)
+    store.get(_report("s1"))
+    store.get(_report("s2"))
+    assert len(store) == 2
+
+    deadline = time.time() + 3
+    while len(store) and time.time() < deadline:
+        time.sleep(0.05)
+    assert len(store) == 0
+    assert store._sweeper is None
+
+
+# --------------------------------------------------
+# chat_with_coach
+# --------------------------------------------------
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return type("Response", (), {"text": "Slow down after each new idea."})()
+
+
+@pytest.fixture
+def coach(fake_models):
+    pytest.importorskip("google.generativeai")
+    from src.genai.coach import ShikshaCoach
+
+    coach = ShikshaCoach()
+    coach.model = FakeLLM()
+    return coach
+
+
+def test_chat_with_coach_sends_summary_and_relevant_chunks(coach):
+    report = _report("chat-1")
+    answer = coach.chat_with_coach("was the learning rate explained well?", report)
+
+    assert answer == "Slow down after each new idea."
+    prompt = coach.model.prompts[-1]
+    assert '"clarity_score": 71.0' in prompt
+    assert "learning rate is too large" in prompt
+    assert "was the learning rate explained well?" in prompt
+
+    # Second turn reuses the embedded store
+    ctx = coach.context_store.get(report)
+    coach.chat_with_coach("and the pacing?", report)
+    assert len(coach.context_store) == 1 and coach.context_store.get(report) is ctx
+
+
+def test_chat_with_coach_passes_string_context_through(coach):
+    coach.chat_with_coach("any tips?", "Earlier feedback: use more examples.")
+    assert "Earlier feedback: use more examples." in coach.model.prompts[-1]
+    assert coach._context_store is None
+
+
+def test_chat_with_coach_without_llm(coach):
+    coach.model = None
+    assert "not connected" in coach.chat_with_coach("hello", _report("chat-2"))
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def client():
+    import flask_api
+    return flask_api.flask_app.test_client()
+
+
+def test_wsgi_app_does_not_load_gradio():
+    # serve.py imports flask_api in the gunicorn master; the UI stays out of it
+    code = "import sys, flask_api; print('gradio' in sys.modules)"
+    model_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=model_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
+SESSIONS = [
+    {"teacher_id": "t1", "created_at": "2026-01-05T10:00:00Z",
+     "scores": {"audio": {"overall": {"clarity_score": 60.0}}}},
+    {"teacher_id": "t2", "created_at": "2026-01-12T10:00:00Z",
+     "scores": {"audio": {"overall": {"clarity_score": 80.0}}}},
+]
+
+
+# --------------------------------------------------
+# /aggregate_reports
+# --------------------------------------------------
+@pytest.mark.parametrize("percentiles", [50, "50", {"q": 50}, [50, "90"], [True], [-1], [101], [float("nan")]])
+def test_aggregate_rejects_bad_percentiles(client, percentiles):
+    response = client.post("/aggregate_reports", json={"sessions": SESSIONS, "percentiles": percentiles})
+    assert response.status_code == 400
+    assert "percentiles" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("period", ["weekly", "-7", -7, 0, 1.5, True, [7]])
+def test_aggregate_rejects_bad_trend_period(client, period):
+    response = client.post("/aggregate_reports", json={"sessions": SESSIONS, "trend_period_days": period})
+    assert response.status_code == 400
+    assert "trend_period_days" in response.get_json()["error"]
+
+
+def test_aggregate_accepts_valid_options(client):
+    response = client.post("/aggregate_reports", json={
+        "sessions": SESSIONS, "percentiles": [0, 50.5, 100], "trend_period_days": "14"
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["trend"]["period_days"] == 14
+    assert body["summary"]["clarity_score"]["p50.5"] == 70.1
@@ -0,0 +1,89 @@
+import pytest
+
+from src.evaluation import harness
+from src.evaluation.harness import compare, violations
+
+
+def _run(transcript, clarity=70.0, engagement=60.0, depth=40.0):
+    audio = {"overall": {"clarity_score": clarity}} if clarity is not None else {}
+    return {"report": {
+        "transcript": transcript,
+        "scores": {
+            "audio": audio,
+            "video": {"overall": {"engagement_score": engagement, "gesture_index": 10.0}},
+            "text": {"technical_depth": depth},
+        }
+    }}
+
+
+REFERENCE = _run("we will learn about gradient descent today")
+
+
+def test_identical_run_passes():
+    deltas = compare(REFERENCE, _run("we will learn about gradient descent today"))
+    assert deltas["wer"] == 0.0
+    assert violations(deltas, {"clarity_score": 1.0, "wer": 0.1}) == {}
+
+
+def test_empty_transcript_is_full_wer_violation():
+    for empty in ("", None):
+        deltas = compare(REFERENCE, _run(empty))
+        assert deltas["wer"] == 1.0
+        assert "wer" in violations(deltas, {"wer": 0.15})
+
+
+def test_missing_declared_metric_is_violation():
+    deltas = compare(REFERENCE, _run("we will learn about gradient descent today", clarity=None))
+    assert deltas["clarity_score"] is None
+    found = violations(deltas, {"clarity_score": 8.0, "engagement_score": 8.0})
+    assert found == {"clarity_score": {"delta": None, "tolerance": 8.0}}
+
+
+def test_undeclared_missing_metric_is_ignored():
+    deltas = compare(REFERENCE, _run("we will learn about gradient descent today", depth=None))
+    assert violations(deltas, {"clarity_score": 8.0}) == {}
+
+
+# --------------------------------------------------
+# Failed isolated runs
+# --------------------------------------------------
+def test_crashing_run_is_recorded_with_stderr_tail(tmp_path):
+    pytest.importorskip("moviepy")
+    run = harness.run_isolated(str(tmp_path / "missing.mp4"), "General", kwargs={"no_such_option": True})
+    assert run["status"] == "failed" and run["report"] is None
+    assert run["error"] == "exit status 1"
+    assert "no_such_option" in run["stderr"]
+    assert len(run["stderr"].splitlines()) <= harness.STDERR_TAIL_LINES
+
+
+def test_hung_run_times_out(tmp_path):
+    run = harness.run_isolated(str(tmp_path / "missing.mp4"), "General", timeout=0.01)
+    assert run["status"] == "failed" and run["error"] == "timed out after 0.01 s"
+
+
+def _ok(wall_sec=10.0):
+    return {"status": "ok", **REFERENCE, "wall_sec": wall_sec, "peak_rss_mb": 100.0}
+
+
+def _failed(error="exit status 1"):
+    return {"status": "failed", "report": None, "error": error, "stderr": "Traceback ..."}
+
+
+def test_evaluate_continues_after_a_failed_mode(monkeypatch):
+    runs = iter([_ok(), _failed(), _ok(5.0)])
+    monkeypatch.setattr(harness, "run_isolated", lambda *args, **kwargs: next(runs))
+    modes = {"broken": {"tolerance": {}}, "fast": {"tolerance": {"clarity_score": 1.0}}}
+
+    broken, fast = harness.evaluate(["v.mp4"], modes)
+    assert broken["status"] == "failed" and broken["stderr"] == "Traceback ..."
+    assert broken["violations"] == {"run": {"delta": None, "tolerance": None}}
+    assert fast["status"] == "ok" and fast["speedup"] == 2.0 and fast["violations"] == {}
+
+
+def test_failed_reference_fails_its_modes_only(monkeypatch):
+    runs = iter([_failed("timed out after 1 s"), _ok(), _ok()])
+    monkeypatch.setattr(harness, "run_isolated", lambda *args, **kwargs: next(runs))
+
+    rows = harness.evaluate(["a.mp4", "b.mp4"], {"fast": {}})
+    assert [(r["video"], r["status"]) for r in rows] == [("a.mp4", "failed"), ("b.mp4", "ok")]
+    assert rows[0]["error"] == "timed out after 1 s" and "reference" in rows[0]["violations"]
@@ -0,0 +1,33 @@
+import unicodedata
+
+from src.processors.lexical import tokenize, scan
+
+
+def test_tokenize_keeps_devanagari_words_whole():
+    tokens = tokenize("आज हम न्यूरल नेटवर्क के बारे में सीखेंगे? क्या आप तैयार हैं?")
+    assert tokens == [
+        "आज", "हम", "न्यूरल", "नेटवर्क", "के", "बारे", "में", "सीखेंगे", "?",
+        "क्या", "आप", "तैयार", "हैं", "?"
+    ]
+
+
+def test_tokenize_accented_latin_precomposed_and_decomposed():
+    assert tokenize("Café naïve résumé") == ["café", "naïve", "résumé"]
+    assert tokenize(unicodedata.normalize("NFD", "Café déjà vu")) == ["café", "déjà", "vu"]
+
+
+def test_tokenize_ascii_unchanged():
+    assert tokenize("Let's see, um, OK? snake_case") == [
+        "let's", "see", ",", "um", ",", "ok", "?", "snake", "case"
+    ]
+
+
+def test_scan_counts_non_ascii_transcript():
+    stats = scan(
+        "हम न्यूरल नेटवर्क सीखेंगे? um क्या आप तैयार हैं? Le réseau de neurones.",
+        ["न्यूरल नेटवर्क", "तैयार", "réseau de neurones"]
+    )
+    assert stats["question_count"] == 2
+    assert stats["word_count"] == 13
+    assert stats["filler_count"] == 1
+    assert stats["keyword_matches"] == {"न्यूरल नेटवर्क": 1, "तैयार": 1, "réseau de neurones": 1}
@@ -0,0 +1,131 @@
+import glob
+import os
+import subprocess
+
+import pytest
+
+
+def _split(video_path, out_dir, seconds):
+    """Stream-copy the recording into consecutive chunk files, like a segmenting recorder."""
+    os.makedirs(out_dir, exist_ok=True)
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", video_path, "-c", "copy", "-f", "segment",
+         "-segment_time", str(seconds), "-reset_timestamps", "1", os.path.join(out_dir, "chunk_%03d.avi")],
+        check=True
+    )
+    return sorted(glob.glob(os.path.join(out_dir, "chunk_*.avi")))
+
+
+@pytest.fixture
+def lecture(fake_models, make_lecture, tmp_path, monkeypatch):
+    """150 s recording, its one-shot report and its 40 s chunks."""
+    from src import pipeline
+
+    monkeypatch.setattr(pipeline, "FEATURE_STORE_ENABLED", False)
+    video = make_lecture(150)
+    whole = pipeline.process_session(video, "General")
+    return whole, _split(video, str(tmp_path / "chunks"), 40)
+
+
+# --------------------------------------------------
+# Chunked vs whole recording
+# --------------------------------------------------
+def test_live_video_matches_whole_run(lecture):
+    from src.live import LiveSession
+
+    whole, chunks = lecture
+    live = LiveSession("live-video", "General")
+    for chunk in chunks:
+        live.feed(chunk)
+    report = live.finalize()
+
+    assert report["scores"]["video"]["per_minute"] == whole["scores"]["video"]["per_minute"]
+    assert report["scores"]["video"]["overall"] == whole["scores"]["video"]["overall"]
+
+
+def test_live_audio_matches_whole_run(lecture):
+    from src.live import LiveSession
+
+    whole, chunks = lecture
+    live = LiveSession("live-audio", "General")
+    streamed = [e["minute"] for chunk in chunks for e in live.feed(chunk) if e["stage"] == "audio"]
+    report = live.finalize()
+
+    # Minutes are emitted as soon as the chunk completing them arrives
+    assert [m["minute"] for m in streamed] == [0, 1]
+    per_minute = report["scores"]["audio"]["per_minute"]
+    expected = whole["scores"]["audio"]["per_minute"]
+    assert [(m["minute"], m["start_sec"], m["end_sec"]) for m in per_minute] == \
+        [(m["minute"], m["start_sec"], m["end_sec"]) for m in expected]
+    # Each chunk's audio is resampled on its own: boundaries move scores by ~0.01
+    for got, want in zip(per_minute, expected):
+        for key in ("clarity_score", "confidence_score"):
+            assert got[key] == pytest.approx(want[key], abs=0.1)
+
+
+def test_live_asr_waits_for_minimum_audio(lecture, fake_models):
+    from src.live import LiveSession
+
+    whole, chunks = lecture
+    whisper_model = fake_models[0]
+    live = LiveSession("live-asr", "General", language="English", asr_min_sec=60)
+
+    live.feed(chunks[0])                     # 40 s: below the minimum, buffered
+    assert live.asr_plan is None and live.transcript_parts == []
+    calls = len(whisper_model.calls)
+    live.feed(chunks[1])                     # 80 s buffered: one batch
+    assert live.asr_batches == 1 and len(whisper_model.calls) == calls + 1
+    assert whisper_model.calls[-1]["samples"] == 80 * 16000
+    for chunk in chunks[2:]:
+        live.feed(chunk)
+
+    report = live.finalize()                 # the trailing 30 s are transcribed too
+    asr = report["metadata"]["asr"]
+    assert asr["batches"] == 2 and asr["duration_sec"] == pytest.approx(150, abs=0.1)
+    assert asr["language"] == "en"
+    assert report["transcript"]
+
+
+# --------------------------------------------------
+# Routes
+# --------------------------------------------------
+@pytest.fixture
+def client(monkeypatch):
+    import flask_api
+
+    monkeypatch.setattr(flask_api, "live_sessions", {})
+    return flask_api.flask_app.test_client()
+
+
+def test_live_routes(client, lecture):
+    whole, chunks = lecture
+
+    response = client.post("/live/start", json={"topic_name": "General"})
+    assert response.status_code == 201
+    session_id = response.get_json()["session_id"]
+    assert client.post(f"/live/{session_id}/finalize").status_code == 400
+
+    minutes = []
+    for n, chunk in enumerate(chunks, 1):
+        with open(chunk, "rb") as f:
+            response = client.post(f"/live/{session_id}/chunk", data={"chunk": (f, os.path.basename(chunk))})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        minutes += [e["minute"]["minute"] for e in body["events"] if e["stage"] == "video"]
+        assert (body["snapshot"]["session_id"], body["snapshot"]["chunks"]) == (session_id, n)
+    assert minutes == [0, 1]
+
+    response = client.post(f"/live/{session_id}/finalize")
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["metadata"]["mode"] == "live" and report["metadata"]["chunks"] == len(chunks)
+    assert report["scores"]["video"]["per_minute"] == whole["scores"]["video"]["per_minute"]
+
+    # Closed: the session is gone from this worker
+    assert client.post(f"/live/{session_id}/finalize").status_code == 404
+
+
+def test_live_chunk_errors(client):
+    assert client.post("/live/unknown/chunk", data={}).status_code == 404
+    session_id = client.post("/live/start").get_json()["session_id"]
+    assert client.post(f"/live/{session_id}/chunk", data={}).status_code == 400
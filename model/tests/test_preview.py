@@ -0,0 +1,166 @@
+import json
+import os
+import uuid
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.preview import choose_windows, estimate_mean
+
+SR = 16000
+
+
+# --------------------------------------------------
+# Sampling / estimation
+# --------------------------------------------------
+def test_choose_windows_one_per_stratum():
+    windows = choose_windows(60, n_windows=6, seed=3)
+    assert len(windows) == 6
+    assert [w // 10 for w in windows] == list(range(6))
+    assert windows == choose_windows(60, n_windows=6, seed=3)
+    assert choose_windows(4, n_windows=6) == [0, 1, 2, 3]
+
+
+def test_estimate_mean_fpc_t_interval():
+    values, population = [62.0, 70.0, 55.0, 81.0, 66.0, 59.0], 40
+    est = estimate_mean(values, population, confidence=0.95)
+
+    n = len(values)
+    se = np.std(values, ddof=1) / np.sqrt(n) * np.sqrt((population - n) / (population - 1))
+    half = stats.t.ppf(0.975, n - 1) * se
+    assert est["estimate"] == round(np.mean(values), 2)
+    assert est["ci_low"] == pytest.approx(np.mean(values) - half, abs=0.01)
+    assert est["ci_high"] == pytest.approx(np.mean(values) + half, abs=0.01)
+    assert (est["sampled"], est["population"]) == (6, 40)
+
+
+def test_estimate_mean_edge_cases():
+    assert estimate_mean([70.0, 80.0], 2) == {
+        "estimate": 75.0, "ci_low": 75.0, "ci_high": 75.0, "sampled": 2, "population": 2
+    }
+    assert estimate_mean([70.0], 10)["ci_low"] is None
+    assert estimate_mean([None], 10)["estimate"] is None
+    assert estimate_mean([99.0, 100.0, 98.0], 30)["ci_high"] <= 100.0
+
+
+def test_stratified_interval_coverage():
+    # Scores drifting over a 60-minute session: the interval should stay conservative
+    rng = np.random.default_rng(0)
+    hits = 0
+    for rep in range(400):
+        minutes = np.clip(50 + 15 * np.sin(np.linspace(0, 3, 60) + rng.uniform(0, 6)) + rng.normal(0, 8, 60), 0, 100)
+        est = estimate_mean(minutes[choose_windows(60, seed=rep)], 60)
+        hits += est["ci_low"] <= minutes.mean() <= est["ci_high"]
+    assert hits / 400 >= 0.9
+
+
+# --------------------------------------------------
+# Pipeline (needs the model stack; audio decoding is replaced, no ffmpeg)
+# --------------------------------------------------
+@pytest.fixture
+def preview_report(tmp_path, monkeypatch):
+    for module in ("moviepy", "whisper", "torch", "transformers", "sentence_transformers"):
+        pytest.importorskip(module)
+    import cv2
+    import soundfile as sf
+    from src import pipeline
+
+    minutes = 10
+    video_path = str(tmp_path / "lecture.avi")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 2, (80, 60))
+    for i in range(minutes * 60 * 2):
+        frame = np.full((60, 80, 3), 40, dtype=np.uint8)
+        cv2.circle(frame, (10 + (i * (1 + i // 240)) % 60, 30), 8, (200, 180, 160), -1)
+        writer.write(frame)
+    writer.release()
+
+    rng = np.random.default_rng(0)
+    t = np.arange(minutes * 60 * SR) / SR
+    audio = (0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(t) > 0) + rng.normal(0, 0.01, len(t))).astype(np.float32)
+
+    def fake_extract(path, start_sec=0, end_sec=None):
+        if start_sec >= len(audio) / SR:
+            return None
+        out = os.path.join(str(tmp_path), f"{uuid.uuid4().hex}.wav")
+        sf.write(out, audio[int(start_sec * SR): int(end_sec * SR) if end_sec else None], SR)
+        return out
+
+    monkeypatch.setattr(pipeline, "extract_audio", fake_extract)
+    monkeypatch.setattr(pipeline, "FEATURE_STORE_ENABLED", False)
+
+    events = list(pipeline.iter_preview(video_path, "General", asr="skip"))
+    assert events[-1]["event"] == "complete", events[-1].get("message")
+    return events[-1]["report"]
+
+
+def test_preview_estimates_from_sampled_windows(preview_report):
+    meta = preview_report["metadata"]
+    video = preview_report["scores"]["video"]
+    assert meta["total_minutes"]["video"] == 10
+    assert meta["sampled_minutes"]["video"] == choose_windows(10, seed=1)
+    assert [m["minute"] for m in video["per_minute"]] == meta["sampled_minutes"]["video"]
+
+    est = video["estimates"]["gesture_index"]
+    assert est == estimate_mean([m["gesture_index"] for m in video["per_minute"]], 10)
+    assert (est["sampled"], est["population"]) == (6, 10)
+    assert est["ci_low"] < est["estimate"] < est["ci_high"]
+
+
+def test_preview_audio_is_the_capped_span_exactly(preview_report):
+    from src.processors.audio_analyzer import MAX_DURATION_SEC
+
+    audio = preview_report["scores"]["audio"]
+    assert [m["minute"] for m in audio["per_minute"]] == list(range(MAX_DURATION_SEC // 60))
+    est = audio["estimates"]["clarity_score"]
+    assert est["ci_low"] == est["estimate"] == est["ci_high"] == audio["overall"]["clarity_score"]
+
+
+def test_preview_without_asr_has_text_keys(preview_report):
+    text = preview_report["scores"]["text"]
+    assert isinstance(text, dict)
+    assert text["technical_depth"] is None and text["interaction_index"] is None
+
+
+def test_preview_report_through_consumers(preview_report):
+    pytest.importorskip("gradio")
+    import app
+    from src.genai.context_store import summarize_report, _minute_lines
+
+    summary_md, scores_md, feedback_md = app._render_report(preview_report)
+    assert "Technical Depth" in scores_md
+
+    summary = json.loads(summarize_report(preview_report))
+    assert summary["audio_overall"] == preview_report["scores"]["audio"]["overall"]
+    assert _minute_lines(preview_report["scores"])
+
+
+def test_preview_windows_past_the_audio_end(tmp_path, monkeypatch):
+    for module in ("moviepy", "whisper", "torch", "transformers", "sentence_transformers"):
+        pytest.importorskip(module)
+    import cv2
+    import soundfile as sf
+    from src import pipeline
+
+    video_path = str(tmp_path / "short.avi")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 5, (160, 120))
+    for i in range(2 * 60 * 5):
+        writer.write(np.full((120, 160, 3), 40 + i % 50, dtype=np.uint8))
+    writer.release()
+
+    audio = np.random.default_rng(1).normal(0, 0.1, 60 * SR).astype(np.float32)
+
+    # Audio track shorter than the video: windows from minute 1 on have no audio
+    def fake_extract(path, start_sec=0, end_sec=None):
+        if start_sec >= len(audio) / SR:
+            return None
+        out = os.path.join(str(tmp_path), f"{uuid.uuid4().hex}.wav")
+        sf.write(out, audio[int(start_sec * SR): int(end_sec * SR) if end_sec else None], SR)
+        return out
+
+    monkeypatch.setattr(pipeline, "extract_audio", fake_extract)
+    monkeypatch.setattr(pipeline, "FEATURE_STORE_ENABLED", False)
+
+    events = list(pipeline.iter_preview(video_path, "General", asr="skip"))
+    assert events[-1]["event"] == "complete", events[-1].get("message")
+    assert [m["minute"] for m in events[-1]["report"]["scores"]["audio"]["per_minute"]] == [0]
@@ -0,0 +1,61 @@
+import pytest
+
+from src.scoring import resolve_weights
+
+
+@pytest.mark.parametrize("overrides", [
+    {"clarity": {"energy_std_ref": 0}},
+    {"audio_confidence": {"loudness_ref": -0.1}},
+    {"clarity": {"pause": float("nan")}},
+    {"clarity": {"pause": float("inf")}},
+    {"clarity": {"pause": -1}},
+    {"clarity": {"pause": "heavy"}},
+    {"clarity": {"pause": True}},
+    {"clarity": {"pitch": 0.5}},
+    {"posture": {"base": 0.5}},
+    {"clarity": 0.5},
+    ["clarity"],
+])
+def test_resolve_weights_rejects_invalid(overrides):
+    with pytest.raises(ValueError):
+        resolve_weights(overrides)
+
+
+def test_resolve_weights_merges_partial_override():
+    weights = resolve_weights({"clarity": {"pause": "0.5", "energy_std_ref": 0.1}})
+    assert weights["clarity"]["pause"] == 0.5 and weights["clarity"]["energy_std_ref"] == 0.1
+    assert weights["clarity"]["noise"] == resolve_weights()["clarity"]["noise"]
+
+
+# --------------------------------------------------
+# Parity: rescoring stored features with default weights reproduces the run
+# --------------------------------------------------
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_rescore_matches_original_run(fake_models, make_lecture, monkeypatch, adaptive):
+    from src import pipeline
+    from src.feature_store import rescore
+    from src.processors import video_analyzer
+
+    monkeypatch.setattr(pipeline, "FEATURE_STORE_ENABLED", True)
+    monkeypatch.setattr(video_analyzer, "ADAPTIVE_SAMPLING", adaptive)
+    report = pipeline.process_session(make_lecture(150), "General")
+    feature_id = report["metadata"]["feature_id"]
+
+    result = rescore([feature_id])
+    assert result["errors"] == {}
+    rescored = result["results"][feature_id]
+    for stream in ("audio", "video"):
+        assert rescored[stream]["overall"] == report["scores"][stream]["overall"]
+        assert rescored[stream]["per_minute"] == report["scores"][stream]["per_minute"]
+    assert len(rescored["audio"]["per_minute"]) == 3
+    assert len(rescored["video"]["per_minute"]) == 3
+
+
+def test_rescore_endpoint_rejects_bad_reference(fake_models):
+    import flask_api
+
+    response = flask_api.flask_app.test_client().post(
+        "/rescore", json={"feature_ids": ["x"], "weights": {"clarity": {"energy_std_ref": 0}}}
+    )
+    assert response.status_code == 400
+    assert "energy_std_ref" in response.get_json()["details"]
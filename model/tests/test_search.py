@@ -0,0 +1,49 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def app_module(fake_models, monkeypatch):
+    import app
+    from src import transcript_index
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(transcript_index, "_INDEXES", {})
+    return app
+
+
+def _run_gradio_session(app, video_path, **inputs):
+    outputs = list(app.analyze_session_with_status(video_path, **inputs))
+    report = outputs[-1][3]
+    assert report, outputs[-1][0]
+    return report
+
+
+def _search(app, query, institution_id):
+    response = app.flask_app.test_client().post(
+        "/search_transcripts", json={"query": query, "institution_id": institution_id}
+    )
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["results"]
+
+
+def test_gradio_session_is_searchable(app_module, fake_models, make_lecture):
+    institution = f"inst-{uuid.uuid4().hex[:8]}"
+    report = _run_gradio_session(
+        app_module, make_lecture(20),
+        topic_name="Machine Learning", language="English", institution_id=institution
+    )
+
+    assert report["metadata"]["indexed_chunks"] >= 1
+    assert report["metadata"]["asr"]["language"] == "en"
+    assert fake_models[0].calls[-1]["language"] == "en"
+
+    results = _search(app_module, "gradient descent learning rate", institution)
+    assert results and results[0]["session_id"] == report["session_id"]
+    assert _search(app_module, "gradient descent learning rate", "other-institution") == []
+
+
+def test_gradio_session_without_institution_is_not_indexed(app_module, make_lecture):
+    report = _run_gradio_session(app_module, make_lecture(10), topic_name="General", institution_id="  ")
+    assert report["metadata"]["indexed_chunks"] == 0
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from src.processors.topic_catalog import TopicEmbeddingCache
+
+
+class CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, **kwargs):
+        self.encoded.append(text)
+        return np.full(4, len(text) + 1, dtype=np.float32)
+
+
+def _topic_files(cache):
+    return sorted(f for f in os.listdir(cache.cache_dir) if f.endswith(".npy"))
+
+
+def test_memory_is_lru_bounded(tmp_path):
+    model = CountingModel()
+    cache = TopicEmbeddingCache(model, "m", cache_dir=str(tmp_path), max_memory=2)
+
+    cache.get("algebra")
+    cache.get("biology")
+    cache.get("algebra")              # refreshes algebra
+    cache.get("chemistry")            # evicts biology, the least recently used
+    assert len(cache._memory) == 2
+
+    # With the disk copies gone, only the evicted topic has to be re-encoded
+    for name in _topic_files(cache):
+        os.remove(os.path.join(cache.cache_dir, name))
+    cache.get("algebra")
+    cache.get("chemistry")
+    assert model.encoded == ["algebra", "biology", "chemistry"]
+    cache.get("biology")
+    assert model.encoded[-1] == "biology"
+
+
+def test_disk_keeps_most_recently_used_files(tmp_path):
+    model = CountingModel()
+    cache = TopicEmbeddingCache(model, "m", cache_dir=str(tmp_path), max_memory=0, max_files=2)
+    cache.matrix(["x", "y"])
+
+    cache.get("algebra")
+    cache.get("biology")
+    paths = {f: os.path.join(cache.cache_dir, f) for f in _topic_files(cache) if not f.startswith("matrix_")}
+    for i, path in enumerate(sorted(paths.values())):
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.get("algebra")              # disk hit: becomes the most recent file
+    cache.get("chemistry")            # third topic file: evicts biology
+
+    assert len([f for f in _topic_files(cache) if not f.startswith("matrix_")]) == 2
+    assert any(f.startswith("matrix_") for f in _topic_files(cache))
+    cache.get("algebra")
+    assert model.encoded.count("algebra") == 1
+    cache.get("biology")
+    assert model.encoded.count("biology") == 2
@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+
+from src.transcript_index import TranscriptIndex, get_transcript_index, index_dir_for
+from src import transcript_index
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    v = np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _rows(session, n):
+    return [{"session_id": session, "chunk": i, "text": f"{session} chunk {i}"} for i in range(n)]
+
+
+def test_repair_truncates_torn_append(tmp_path):
+    index = TranscriptIndex(str(tmp_path), dim=DIM, dtype="float32", model_key="m:fp32")
+    index.add(_vectors(3), _rows("s1", 3), institution_id="i1")
+    clean_size = os.path.getsize(index._rows_path)
+
+    # Crash after the row table and part of the offsets were written, before any vector
+    with open(index._rows_path, "ab") as f:
+        f.write(b'{"session_id": "torn", "chunk": 0}\n{"session_id": "to')
+    with open(index._off_path, "ab") as f:
+        f.write(np.asarray([clean_size], dtype=np.int64).tobytes())
+
+    index._repair()
+    assert len(index) == 3
+    assert os.path.getsize(index._rows_path) == clean_size
+    assert os.path.getsize(index._off_path) == 3 * 8
+
+    index.add(_vectors(2, seed=1), _rows("s2", 2), institution_id="i1")
+    results = index.search(_vectors(2, seed=1)[1], "i1", k=5)
+    assert len(results) == 5
+    assert results[0]["session_id"] == "s2" and results[0]["chunk"] == 1
+    assert "torn" not in {r["session_id"] for r in results}
+
+
+def test_backend_switch_starts_separate_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_index, "_INDEXES", {})
+    monkeypatch.setattr(transcript_index, "index_dir_for",
+                        lambda key: index_dir_for(key, root=str(tmp_path)))
+
+    fp32 = get_transcript_index(dim=DIM, model_key="all-MiniLM-L6-v2:fp32")
+    fp32.add(_vectors(2), _rows("old", 2), institution_id="i1")
+
+    int8 = get_transcript_index(dim=DIM, model_key="all-MiniLM-L6-v2:int8")
+    assert int8.index_dir != fp32.index_dir
+    assert int8.add(_vectors(1, seed=2), _rows("new", 1), institution_id="i1") == 1
+    assert [r["session_id"] for r in int8.search(_vectors(1, seed=2)[0], "i1")] == ["new"]
+    assert len(fp32.search(_vectors(1)[0], "i1")) == 2